@@ -0,0 +1,91 @@
+"""Rows per second: POST /expenses/ one row at a time vs /expenses/bulk.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_bulk
+    python -m benchmarks.bench_bulk --rows 1000000 --single-rows 5000
+
+The bulk path targets at least 40k rows/s for a JSON array on the default
+store; the script exits non-zero when it falls below --target.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+
+CATEGORIES = [
+    {"id": 1, "name": "Food"},
+    {"id": 2, "name": "Transport"},
+    {"id": 3, "name": "Health"},
+]
+
+
+def make_rows(count: int) -> list:
+    return [
+        {
+            "title": f"card transaction {i}",
+            "amount": round(1 + (i % 500) * 0.37, 2),
+            "category": CATEGORIES[i % len(CATEGORIES)],
+        }
+        for i in range(count)
+    ]
+
+
+def rate(count: int, elapsed: float) -> float:
+    return count / elapsed if elapsed else float("inf")
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--single-rows", type=int, default=2_000)
+    parser.add_argument("--target", type=float, default=40_000)
+    args = parser.parse_args()
+
+    client = TestClient(main.app)
+
+    rows = make_rows(args.single_rows)
+    main.expenses_db.clear()
+    start = time.perf_counter()
+    for row in rows:
+        client.post("/expenses/", json=row)
+    single = rate(len(rows), time.perf_counter() - start)
+
+    rows = make_rows(args.rows)
+    array_body = json.dumps(rows).encode()
+    ndjson_body = "\n".join(json.dumps(row) for row in rows).encode()
+
+    main.expenses_db.clear()
+    start = time.perf_counter()
+    client.post(
+        "/expenses/bulk",
+        content=array_body,
+        headers={"content-type": "application/json"},
+    )
+    array = rate(len(rows), time.perf_counter() - start)
+
+    main.expenses_db.clear()
+    start = time.perf_counter()
+    client.post(
+        "/expenses/bulk",
+        content=ndjson_body,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    ndjson = rate(len(rows), time.perf_counter() - start)
+
+    print(f"{'path':>22} | {'rows/s':>12}")
+    print(f"{'POST /expenses/':>22} | {single:>12,.0f}")
+    print(f"{'bulk JSON array':>22} | {array:>12,.0f}")
+    print(f"{'bulk NDJSON':>22} | {ndjson:>12,.0f}")
+    if array < args.target:
+        print(f"bulk JSON array below target of {args.target:,.0f} rows/s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,117 @@
+"""Memory and latency of the list-of-dicts layout vs ColumnarExpenseStore.
+
+Run from the project directory (needs numpy; 10M rows of the list layout
+need several GB of RAM):
+
+    python -m benchmarks.bench_columnar
+    python -m benchmarks.bench_columnar --sizes 100000 1000000
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from columnar import ColumnarExpenseStore
+from schemas import Category
+
+CATEGORIES = [
+    Category(id=1, name="Food"),
+    Category(id=2, name="Transport"),
+    Category(id=3, name="Health"),
+]
+TITLES = [f"merchant {i}" for i in range(1_000)]
+
+
+def rows(size: int):
+    rng = random.Random(42)
+    for i in range(size):
+        yield {
+            "title": rng.choice(TITLES),
+            "amount": round(rng.uniform(1, 500), 2),
+            "category": rng.choice(CATEGORIES),
+        }
+
+
+def build_list(size: int) -> list:
+    return [{"id": i + 1, **row} for i, row in enumerate(rows(size))]
+
+
+def build_columnar(size: int) -> ColumnarExpenseStore:
+    store = ColumnarExpenseStore()
+    for row in rows(size):
+        store.add(row)
+    return store
+
+
+def traced(build, size: int):
+    gc.collect()
+    tracemalloc.start()
+    store = build(size)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return store, current
+
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def list_summary(db: list, category=None) -> float:
+    if category:
+        return sum(
+            [
+                item["amount"]
+                for item in db
+                if item["category"].name == category
+            ]
+        )
+    return sum([item["amount"] for item in db])
+
+
+def list_filter(db: list, category: str) -> list:
+    return [item for item in db if item["category"].name == category]
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000_000, 10_000_000]
+    )
+    args = parser.parse_args()
+
+    header = (
+        f"{'rows':>11} | {'layout':>8} | {'MiB':>8} | {'B/row':>6} | "
+        f"{'summary ms':>10} | {'cat sum ms':>10} | {'filter ms':>9}"
+    )
+    print(header)
+    for size in args.sizes:
+        db, used = traced(build_list, size)
+        print(
+            f"{size:>11,} | {'list':>8} | {used / 2**20:>8.1f} | "
+            f"{used / size:>6.0f} | "
+            f"{timed(lambda: list_summary(db)):>10.2f} | "
+            f"{timed(lambda: list_summary(db, 'Food')):>10.2f} | "
+            f"{timed(lambda: list_filter(db, 'Food')):>9.2f}"
+        )
+        del db
+
+        store, used = traced(build_columnar, size)
+        print(
+            f"{size:>11,} | {'columnar':>8} | {used / 2**20:>8.1f} | "
+            f"{used / size:>6.0f} | "
+            f"{timed(lambda: store.summary()):>10.2f} | "
+            f"{timed(lambda: store.summary('Food')):>10.2f} | "
+            f"{timed(lambda: store.by_category('Food')):>9.2f}"
+        )
+        del store
+
+
+if __name__ == "__main__":
+    main_cli()
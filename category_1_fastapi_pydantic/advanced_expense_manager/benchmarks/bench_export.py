@@ -0,0 +1,66 @@
+"""Peak memory of /export/ serialization as the store grows.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_export
+    python -m benchmarks.bench_export --sizes 10000 100000 --format csv
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import main
+from export import iter_export
+from schemas import Category, ExportFormat
+
+
+def prefill(size: int) -> None:
+    main.expenses_db.clear()
+    category = Category(id=1, name="Food")
+    for i in range(size):
+        main.expenses_db.add(
+            {"title": f"expense {i}", "amount": i + 0.5, "category": category}
+        )
+
+
+def measure(export_format: ExportFormat, chunk_size: int) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    sent = 0
+    for chunk in iter_export(
+        main.expenses_db.scan(), export_format, chunk_size
+    ):
+        sent += len(chunk)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sent, peak, elapsed
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--format",
+        type=ExportFormat,
+        default=ExportFormat.json,
+        choices=list(ExportFormat),
+    )
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} | {'bytes out':>12} | {'peak KiB':>9} | {'s':>6}")
+    for size in args.sizes:
+        prefill(size)
+        sent, peak, elapsed = measure(args.format, args.chunk_size)
+        print(
+            f"{size:>10,} | {sent:>12,} | {peak / 1024:>9.0f} | "
+            f"{elapsed:>6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main_cli()
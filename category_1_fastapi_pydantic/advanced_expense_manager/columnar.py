@@ -0,0 +1,314 @@
+import math
+import secrets
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from schemas import Category
+
+INITIAL_CAPACITY = 1024
+
+
+class ColumnarExpenseStore:
+    """NumPy-backed expense store with one array per column.
+
+    Rows are appended in id order, so ``_ids`` is always sorted and an id
+    is found with a binary search. Categories are stored as small-int codes
+    into a category dictionary and titles as indexes into a string pool.
+    Deletes only clear the ``_alive`` flag; tombstones are compacted away
+    once they make up half of the rows.
+
+    Exposes the same interface as ``ExpenseStore`` and hands out plain
+    dicts, so the handlers and the export pipeline work with either.
+    """
+
+    _COLUMNS = (
+        "_ids",
+        "_amounts",
+        "_category_codes",
+        "_title_codes",
+        "_alive",
+    )
+
+    def __init__(self, start_id: int = 1, capacity: int = INITIAL_CAPACITY):
+        self._start_id = start_id
+        self._next_id = start_id
+        self._size = 0
+        self._live = 0
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._amounts = np.empty(capacity, dtype=np.float64)
+        self._category_codes = np.empty(capacity, dtype=np.int16)
+        self._title_codes = np.empty(capacity, dtype=np.int32)
+        self._alive = np.zeros(capacity, dtype=np.bool_)
+        self._categories: List[Category] = []
+        self._category_lookup: Dict[Tuple, int] = {}
+        self._titles: List[str] = []
+        self._title_lookup: Dict[str, int] = {}
+        # Bumped on every write; the random epoch keeps versions handed out
+        # before a restart from matching.
+        self._epoch = secrets.token_hex(4)
+        self._version = 0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __iter__(self) -> Iterator[dict]:
+        return self.scan()
+
+    def next_id(self) -> int:
+        expense_id = self._next_id
+        self._next_id += 1
+        return expense_id
+
+    def version(self) -> str:
+        """Token that changes whenever any expense is written."""
+        return f"{self._epoch}.{self._version}"
+
+    def all(self) -> list:
+        return list(self.scan())
+
+    def get(self, expense_id: int) -> Optional[dict]:
+        row = self._row(expense_id)
+        if row is None:
+            return None
+        return self._materialize(row)
+
+    def scan(self, batch_size: int = 4096) -> Iterator[dict]:
+        """Yield live expenses in id order, one batch of rows at a time.
+
+        Each batch is located by id rather than row position, so the scan
+        stays correct if rows are compacted between batches.
+        """
+        stop_id = self._next_id
+        next_id = self._start_id
+        while next_id < stop_id:
+            start = int(np.searchsorted(self._ids[: self._size], next_id))
+            stop = min(start + batch_size, self._size)
+            if start >= stop:
+                return
+            rows = np.flatnonzero(self._alive[start:stop]) + start
+            rows = rows[self._ids[rows] < stop_id]
+            batch = self._materialize_rows(rows)
+            next_id = int(self._ids[stop - 1]) + 1
+            yield from batch
+
+    def by_category(self, category: str) -> list:
+        mask = self._category_mask(category)
+        return self._materialize_rows(np.flatnonzero(mask))
+
+    def add(self, data: dict) -> dict:
+        if self._size == len(self._ids):
+            self._grow()
+        row = self._size
+        self._ids[row] = self.next_id()
+        self._amounts[row] = data["amount"]
+        self._category_codes[row] = self._category_code(data["category"])
+        self._title_codes[row] = self._title_code(data["title"])
+        self._alive[row] = True
+        self._size += 1
+        self._live += 1
+        self._version += 1
+        return self._materialize(row)
+
+    def add_many(self, rows: List[dict]) -> range:
+        """Append ``rows`` under one contiguous block of ids."""
+        ids = range(self._next_id, self._next_id + len(rows))
+        self._next_id += len(rows)
+        self._append(np.arange(ids.start, ids.stop), rows)
+        return ids
+
+    def update(self, expense_id: int, data: dict) -> Optional[dict]:
+        row = self._row(expense_id)
+        if row is None:
+            return None
+        if "amount" in data:
+            self._amounts[row] = data["amount"]
+        if "category" in data:
+            self._category_codes[row] = self._category_code(data["category"])
+        if "title" in data:
+            self._title_codes[row] = self._title_code(data["title"])
+        self._version += 1
+        return self._materialize(row)
+
+    def delete(self, expense_id: int) -> bool:
+        row = self._row(expense_id)
+        if row is None:
+            return False
+        self._alive[row] = False
+        self._live -= 1
+        self._version += 1
+        if self._size >= INITIAL_CAPACITY and self._live * 2 < self._size:
+            self._compact()
+        return True
+
+    def clear(self) -> None:
+        self._size = 0
+        self._live = 0
+        self._alive[:] = False
+        self._version += 1
+
+    def load(self, expenses: List[dict], next_id: int) -> None:
+        """Replace the contents with ``expenses``, given in id order."""
+        self.clear()
+        self._append(
+            np.array([expense["id"] for expense in expenses], dtype=np.int64),
+            expenses,
+        )
+        self._next_id = max(self._next_id, next_id)
+
+    def summary(self, category: Optional[str] = None) -> dict:
+        if category is None:
+            mask = self._alive[: self._size]
+        else:
+            mask = self._category_mask(category)
+        amounts = self._amounts[: self._size][mask]
+        if not amounts.size:
+            return {"total": 0.0, "count": 0, "min": None, "max": None}
+        return {
+            "total": float(amounts.sum()),
+            "count": int(amounts.size),
+            "min": float(amounts.min()),
+            "max": float(amounts.max()),
+        }
+
+    def recompute_summary(self, category: Optional[str] = None) -> dict:
+        amounts = [
+            item["amount"]
+            for item in self.scan()
+            if category is None or item["category"].name == category
+        ]
+        return {
+            "total": math.fsum(amounts),
+            "count": len(amounts),
+            "min": min(amounts, default=None),
+            "max": max(amounts, default=None),
+        }
+
+    def check_consistency(self) -> List[str]:
+        """Compare the vectorized summaries against a row-by-row recompute.
+
+        Returns a description of every mismatch; an empty list means the
+        columns are consistent.
+        """
+        errors = []
+        names = {category.name for category in self._categories}
+        for category in [None, *sorted(names)]:
+            vectorized = self.summary(category)
+            expected = self.recompute_summary(category)
+            for key, value in expected.items():
+                if key == "total":
+                    matches = math.isclose(
+                        vectorized[key], value, rel_tol=1e-9, abs_tol=1e-6
+                    )
+                else:
+                    matches = vectorized[key] == value
+                if not matches:
+                    errors.append(
+                        f"{category or 'overall'}.{key}: "
+                        f"vectorized={vectorized[key]} expected={value}"
+                    )
+        return errors
+
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays, excluding the string pool."""
+        return sum(getattr(self, name).nbytes for name in self._COLUMNS)
+
+    def _row(self, expense_id: int) -> Optional[int]:
+        row = int(np.searchsorted(self._ids[: self._size], expense_id))
+        if (
+            row < self._size
+            and self._ids[row] == expense_id
+            and self._alive[row]
+        ):
+            return row
+        return None
+
+    def _materialize(self, row: int) -> dict:
+        return {
+            "title": self._titles[self._title_codes[row]],
+            "amount": float(self._amounts[row]),
+            "category": self._categories[self._category_codes[row]],
+            "id": int(self._ids[row]),
+        }
+
+    def _materialize_rows(self, rows: np.ndarray) -> list:
+        titles = self._titles
+        categories = self._categories
+        return [
+            {
+                "title": titles[title_code],
+                "amount": amount,
+                "category": categories[category_code],
+                "id": expense_id,
+            }
+            for expense_id, title_code, amount, category_code in zip(
+                self._ids[rows].tolist(),
+                self._title_codes[rows].tolist(),
+                self._amounts[rows].tolist(),
+                self._category_codes[rows].tolist(),
+            )
+        ]
+
+    def _category_mask(self, name: str) -> np.ndarray:
+        size = self._size
+        codes = self._category_codes[:size]
+        mask = np.zeros(size, dtype=np.bool_)
+        for code, category in enumerate(self._categories):
+            if category.name == name:
+                mask |= codes == code
+        return mask & self._alive[:size]
+
+    def _category_code(self, category: Category) -> int:
+        key = (category.id, category.name, category.description)
+        code = self._category_lookup.get(key)
+        if code is None:
+            code = len(self._categories)
+            if code > np.iinfo(np.int16).max:
+                raise ValueError("Too many distinct categories")
+            self._categories.append(category)
+            self._category_lookup[key] = code
+        return code
+
+    def _title_code(self, title: str) -> int:
+        code = self._title_lookup.get(title)
+        if code is None:
+            code = len(self._titles)
+            self._titles.append(title)
+            self._title_lookup[title] = code
+        return code
+
+    def _append(self, ids: np.ndarray, rows: List[dict]) -> None:
+        count = len(rows)
+        while self._size + count > len(self._ids):
+            self._grow()
+        start, stop = self._size, self._size + count
+        self._ids[start:stop] = ids
+        self._amounts[start:stop] = [data["amount"] for data in rows]
+        self._category_codes[start:stop] = [
+            self._category_code(data["category"]) for data in rows
+        ]
+        self._title_codes[start:stop] = [
+            self._title_code(data["title"]) for data in rows
+        ]
+        self._alive[start:stop] = True
+        self._size = stop
+        self._live += count
+        self._version += 1
+
+    def _grow(self) -> None:
+        capacity = max(len(self._ids) * 2, INITIAL_CAPACITY)
+        for name in self._COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            setattr(self, name, grown)
+
+    def _compact(self) -> None:
+        keep = np.flatnonzero(self._alive[: self._size])
+        capacity = max(len(keep) * 2, INITIAL_CAPACITY)
+        for name in self._COLUMNS:
+            column = getattr(self, name)
+            compacted = np.zeros(capacity, dtype=column.dtype)
+            compacted[: len(keep)] = column[keep]
+            setattr(self, name, compacted)
+        self._size = len(keep)
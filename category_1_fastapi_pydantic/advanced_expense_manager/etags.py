@@ -0,0 +1,33 @@
+from typing import Optional
+
+from fastapi import Response, status
+
+
+def etag(version: str) -> str:
+    """Strong ETag for a store version token."""
+    return f'"{version}"'
+
+
+def not_modified(if_none_match: Optional[str], tag: str) -> bool:
+    """Whether ``If-None-Match`` says the client already has ``tag``.
+
+    Uses the weak comparison RFC 9110 prescribes for this header, so a
+    ``W/`` prefix added by a proxy still matches.
+    """
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return tag in (
+        listed.removeprefix("W/") for listed in _listed(if_none_match)
+    )
+
+
+def not_modified_response(tag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": tag}
+    )
+
+
+def _listed(header: str) -> list:
+    return [tag.strip() for tag in header.split(",")]
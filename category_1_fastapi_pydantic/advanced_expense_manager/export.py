@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+import textwrap
+from itertools import islice
+from typing import Iterable, Iterator
+
+from schemas import ExportFormat
+from serializers import EXPENSE
+
+MEDIA_TYPES = {
+    ExportFormat.json: "application/json",
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+CSV_COLUMNS = [
+    "id",
+    "title",
+    "amount",
+    "category_id",
+    "category_name",
+    "category_description",
+]
+
+
+def _chunks(rows: Iterable[dict], chunk_size: int) -> Iterator[list]:
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        yield chunk
+
+
+def _serialize(item: dict) -> dict:
+    return EXPENSE.dump_python(item, mode="json")
+
+
+def iter_json(rows: Iterable[dict], chunk_size: int) -> Iterator[str]:
+    # Matches json.dumps(list_of_rows, indent=2) byte for byte.
+    first = True
+    for chunk in _chunks(rows, chunk_size):
+        body = ",\n".join(
+            textwrap.indent(json.dumps(_serialize(item), indent=2), "  ")
+            for item in chunk
+        )
+        yield ("[\n" if first else ",\n") + body
+        first = False
+    yield "[]" if first else "\n]"
+
+
+def iter_ndjson(rows: Iterable[dict], chunk_size: int) -> Iterator[str]:
+    for chunk in _chunks(rows, chunk_size):
+        yield "".join(json.dumps(_serialize(item)) + "\n" for item in chunk)
+
+
+def iter_csv(rows: Iterable[dict], chunk_size: int) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for chunk in _chunks(rows, chunk_size):
+        for item in chunk:
+            category = item["category"]
+            writer.writerow(
+                [
+                    item["id"],
+                    item["title"],
+                    item["amount"],
+                    category.id,
+                    category.name,
+                    category.description,
+                ]
+            )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+SERIALIZERS = {
+    ExportFormat.json: iter_json,
+    ExportFormat.ndjson: iter_ndjson,
+    ExportFormat.csv: iter_csv,
+}
+
+
+def iter_export(
+    rows: Iterable[dict], export_format: ExportFormat, chunk_size: int
+) -> Iterator[str]:
+    return SERIALIZERS[export_format](rows, chunk_size)
@@ -0,0 +1,115 @@
+import json
+from typing import Any, AsyncIterator, List, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+
+from schemas import BulkRowError, ExpenseCreate
+
+# Built once at import so every batch reuses the compiled validator.
+EXPENSE_LIST_ADAPTER = TypeAdapter(List[ExpenseCreate])
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl")
+
+BatchResult = Tuple[List[ExpenseCreate], List[BulkRowError]]
+
+
+class MalformedBatch(ValueError):
+    pass
+
+
+def validate_rows(rows: List[Tuple[int, Any]]) -> BatchResult:
+    """Validate ``(row_number, raw_row)`` pairs in one adapter call.
+
+    Rows that fail are reported by row number and left out; the rest are
+    returned validated.
+    """
+    try:
+        return (
+            EXPENSE_LIST_ADAPTER.validate_python([raw for _, raw in rows]),
+            [],
+        )
+    except ValidationError as exc:
+        failed = _group_errors(exc)
+    errors = [
+        BulkRowError(row=rows[index][0], errors=row_errors)
+        for index, row_errors in failed.items()
+    ]
+    valid = EXPENSE_LIST_ADAPTER.validate_python(
+        [raw for index, (_, raw) in enumerate(rows) if index not in failed]
+    )
+    return valid, errors
+
+
+def validate_json_array(payload: bytes) -> BatchResult:
+    """Validate a JSON array body, straight from bytes when it is clean."""
+    try:
+        return EXPENSE_LIST_ADAPTER.validate_json(payload), []
+    except ValidationError:
+        pass
+    try:
+        raw_rows = json.loads(payload)
+    except ValueError as exc:
+        raise MalformedBatch(f"Invalid JSON: {exc}") from exc
+    if not isinstance(raw_rows, list):
+        raise MalformedBatch("Expected a JSON array of expenses")
+    return validate_rows(list(enumerate(raw_rows)))
+
+
+async def validate_ndjson_stream(
+    chunks: AsyncIterator[bytes], batch_size: int
+) -> BatchResult:
+    """Parse and validate an NDJSON body as it arrives.
+
+    Lines are validated ``batch_size`` at a time, so parsing overlaps with
+    the upload and only one batch of raw rows is held at once.
+    """
+    valid: List[ExpenseCreate] = []
+    errors: List[BulkRowError] = []
+    pending: List[Tuple[int, Any]] = []
+    row = 0
+    buffer = b""
+
+    def flush() -> None:
+        batch_valid, batch_errors = validate_rows(pending)
+        valid.extend(batch_valid)
+        errors.extend(batch_errors)
+        pending.clear()
+
+    def parse(line: bytes) -> None:
+        nonlocal row
+        if not line.strip():
+            return
+        try:
+            pending.append((row, json.loads(line)))
+        except ValueError as exc:
+            errors.append(
+                BulkRowError(
+                    row=row, errors=[{"type": "json_invalid", "msg": str(exc)}]
+                )
+            )
+        row += 1
+        if len(pending) >= batch_size:
+            flush()
+
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            parse(line)
+    parse(buffer)
+    if pending:
+        flush()
+    errors.sort(key=lambda error: error.row)
+    return valid, errors
+
+
+def _group_errors(exc: ValidationError) -> dict:
+    failed: dict = {}
+    for error in exc.errors(include_url=False, include_input=False):
+        if not error["loc"]:
+            raise MalformedBatch(error["msg"])
+        index, *loc = error["loc"]
+        error["loc"] = loc
+        error.pop("ctx", None)
+        failed.setdefault(index, []).append(error)
+    return failed
@@ -0,0 +1,366 @@
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+FSYNC_POLICIES = ("always", "group", "interval", "off")
+SNAPSHOT_FILE = "snapshot.ndjson"
+SEGMENT_PREFIX = "journal-"
+SEGMENT_SUFFIX = ".log"
+
+
+class Journal:
+    """Append-only write log with periodic snapshots for an in-memory store.
+
+    Every write appends one JSON line to the current log segment, holding
+    either the full new state of a record (``put``) or a deleted id
+    (``del``). Replaying such lines is idempotent, so a snapshot can be
+    written in the background while writes go on: it remembers the segment
+    that was opened when it started, and recovery replays that segment and
+    every later one over it. Segments older than the latest snapshot are
+    removed.
+
+    ``fsync`` chooses when appended lines are forced to disk:
+
+    - ``always``: every write fsyncs the log before it is acknowledged.
+    - ``group``: writers wait for the next group commit, which fsyncs all
+      lines appended since the previous one with a single call.
+    - ``interval``: group commits run every ``commit_interval`` seconds
+      and writers do not wait for them, so a crash can lose that window.
+    - ``off``: lines are handed to the OS and never fsynced.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        key: str,
+        encode: Callable[[Any], dict],
+        decode: Callable[[dict], Any],
+        fsync: str = "group",
+        commit_interval: float = 0.01,
+        snapshot_interval: float = 60.0,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(
+                f"fsync must be one of {', '.join(FSYNC_POLICIES)}"
+            )
+        self.directory = directory
+        self.key = key
+        self.encode = encode
+        self.decode = decode
+        self.fsync = fsync
+        self.commit_interval = commit_interval
+        self.snapshot_interval = snapshot_interval
+        self._segment = 0
+        self._file = None
+        self._next_id = 0
+        self._appended = 0
+        self._unsynced = False
+        self._waiters: List[asyncio.Future] = []
+        self._pending: Optional[asyncio.Event] = None
+        self._sync_lock: Optional[asyncio.Lock] = None
+
+    def put(self, record) -> None:
+        encoded = self.encode(record)
+        self._next_id = max(self._next_id, encoded[self.key] + 1)
+        self._append({"put": encoded})
+
+    def put_many(self, records: list) -> None:
+        if not records:
+            return
+        encoded = [self.encode(record) for record in records]
+        self._next_id = max(self._next_id, encoded[-1][self.key] + 1)
+        self._file.writelines(_dump({"put": record}) for record in encoded)
+        self._appended += len(records)
+        self._unsynced = True
+
+    def delete(self, record_id: int) -> None:
+        self._next_id = max(self._next_id, record_id + 1)
+        self._append({"del": record_id})
+
+    def clear(self) -> None:
+        self._append({"clear": True})
+
+    async def commit(self) -> None:
+        """Return once the lines appended so far are as durable as the
+        fsync policy promises."""
+        if not self._unsynced or self.fsync in ("interval", "off"):
+            return
+        if self.fsync == "always":
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = False
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._pending.set()
+        await waiter
+
+    def recover(self) -> Tuple[list, int]:
+        """Load the latest snapshot and replay the log segments after it.
+
+        Returns the live records in id order and the next id to hand out.
+        """
+        records: Dict[int, dict] = {}
+        first_segment = 0
+        snapshot = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot):
+            lines = _read(snapshot)
+            header = next(lines)
+            first_segment = header["segment"]
+            self._next_id = header["next_id"]
+            key = self.key
+            records.update((record[key], record) for record in lines)
+        for segment in self._segments():
+            self._segment = max(self._segment, segment)
+            path = self._segment_path(segment)
+            if os.path.getsize(path) == 0:
+                os.remove(path)
+            elif segment >= first_segment:
+                self._replay(path, records)
+        return [self.decode(records[key]) for key in sorted(records)], (
+            self._next_id
+        )
+
+    async def snapshot(self, store) -> None:
+        """Write a snapshot of ``store`` and drop the log it supersedes.
+
+        The store is read in chunks between which the event loop keeps
+        serving requests; their writes land in the new segment.
+        """
+        async with self._sync_lock:
+            self._open_segment(self._segment + 1)
+        segment, next_id = self._segment, self._next_id
+        self._appended = 0
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        with open(path + ".tmp", "wb") as file:
+            file.write(_dump({"segment": segment, "next_id": next_id}))
+            lines = []
+            for record in store.scan():
+                lines.append(_dump(self.encode(record)))
+                if len(lines) == 10_000:
+                    file.writelines(lines)
+                    lines.clear()
+                    await asyncio.sleep(0)
+            file.writelines(lines)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(path + ".tmp", path)
+        self._fsync_directory()
+        for old in self._segments():
+            if old < segment:
+                os.remove(self._segment_path(old))
+
+    @asynccontextmanager
+    async def attach(self, store) -> AsyncIterator["Journal"]:
+        """Recover ``store`` from disk, then log to a fresh segment and run
+        the group commit and snapshot tasks until the context exits."""
+        os.makedirs(self.directory, exist_ok=True)
+        records, next_id = self.recover()
+        store.load(records, next_id)
+        self._pending = asyncio.Event()
+        self._sync_lock = asyncio.Lock()
+        # Never append to an old segment: its last line may be torn.
+        self._open_segment(self._segment + 1)
+        tasks = [
+            asyncio.create_task(self._commit_loop()),
+            asyncio.create_task(self._snapshot_loop(store)),
+        ]
+        try:
+            yield self
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._sync()
+            self._file.close()
+            self._file = None
+
+    async def _commit_loop(self) -> None:
+        while True:
+            if self.fsync == "group":
+                await self._pending.wait()
+            else:
+                await asyncio.sleep(self.commit_interval)
+            await self._sync()
+
+    async def _snapshot_loop(self, store) -> None:
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            if self._appended:
+                await self.snapshot(store)
+
+    async def _sync(self) -> None:
+        # Writers that call commit() while the fsync below runs in a thread
+        # are left for the next round, which picks them all up at once.
+        async with self._sync_lock:
+            self._pending.clear()
+            waiters, self._waiters = self._waiters, []
+            try:
+                if self._unsynced:
+                    self._file.flush()
+                    self._unsynced = False
+                    if self.fsync != "off":
+                        await asyncio.to_thread(os.fsync, self._file.fileno())
+            except OSError as exc:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(exc)
+                raise
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    def _append(self, line: dict) -> None:
+        self._file.write(_dump(line))
+        self._appended += 1
+        self._unsynced = True
+
+    def _open_segment(self, segment: int) -> None:
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+        self._segment = segment
+        self._file = open(self._segment_path(segment), "ab")
+        self._unsynced = False
+        self._fsync_directory()
+
+    def _replay(self, path: str, records: Dict[int, dict]) -> None:
+        for entry in _read(path):
+            if "put" in entry:
+                record = entry["put"]
+                record_id = record[self.key]
+                records[record_id] = record
+            elif "del" in entry:
+                record_id = entry["del"]
+                records.pop(record_id, None)
+            else:
+                records.clear()
+                continue
+            self._next_id = max(self._next_id, record_id + 1)
+
+    def _segments(self) -> List[int]:
+        return sorted(
+            int(name[len(SEGMENT_PREFIX) : -len(SEGMENT_SUFFIX)])
+            for name in os.listdir(self.directory)
+            if name.startswith(SEGMENT_PREFIX)
+            and name.endswith(SEGMENT_SUFFIX)
+        )
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(
+            self.directory, f"{SEGMENT_PREFIX}{segment:08d}{SEGMENT_SUFFIX}"
+        )
+
+    def _fsync_directory(self) -> None:
+        descriptor = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+
+class JournaledStore:
+    """Wraps a store so that every successful write is logged to a
+    ``Journal``. Reads go straight to the wrapped store."""
+
+    def __init__(self, store, journal: Journal):
+        self.store = store
+        self.journal = journal
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def __iter__(self):
+        return iter(self.store)
+
+    def __contains__(self, record_id: int) -> bool:
+        return record_id in self.store
+
+    def __getattr__(self, name: str):
+        return getattr(self.store, name)
+
+    def add(self, data: dict) -> dict:
+        record = self.store.add(data)
+        self.journal.put(record)
+        return record
+
+    def add_many(self, rows: List[dict]) -> range:
+        ids = self.store.add_many(rows)
+        key = self.journal.key
+        self.journal.put_many(
+            [{**data, key: record_id} for record_id, data in zip(ids, rows)]
+        )
+        return ids
+
+    def update(self, record_id: int, data: dict, **options) -> Optional[dict]:
+        record = self.store.update(record_id, data, **options)
+        if record is not None:
+            self.journal.put(record)
+        return record
+
+    def add_with_version(self, data: dict) -> Tuple[dict, str]:
+        record, version = self.store.add_with_version(data)
+        self.journal.put(record)
+        return record, version
+
+    def update_with_version(
+        self, record_id: int, data: dict, **options
+    ) -> Tuple[Optional[dict], Optional[str]]:
+        record, version = self.store.update_with_version(
+            record_id, data, **options
+        )
+        if record is not None:
+            self.journal.put(record)
+        return record, version
+
+    def delete(self, record_id: int, **options) -> bool:
+        deleted = self.store.delete(record_id, **options)
+        if deleted:
+            self.journal.delete(record_id)
+        return deleted
+
+    def clear(self) -> None:
+        self.store.clear()
+        self.journal.clear()
+
+
+def _read(path: str, batch_size: int = 10_000) -> Iterator[dict]:
+    """Yield the JSON lines of ``path``, parsing a batch per decoder call."""
+    with open(path, "rb") as file:
+        number = 1
+        while True:
+            lines = list(islice(file, batch_size))
+            if not lines:
+                return
+            if not lines[-1].endswith(b"\n"):
+                # Torn write from a crash; it was never acknowledged.
+                lines.pop()
+            try:
+                yield from json.loads(b"[" + b",".join(lines) + b"]")
+            except ValueError:
+                for offset, line in enumerate(lines):
+                    try:
+                        json.loads(line)
+                    except ValueError:
+                        raise ValueError(
+                            f"Corrupt journal line {path}:{number + offset}"
+                        )
+                raise
+            number += len(lines)
+
+
+def _dump(value: dict) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode() + b"\n"
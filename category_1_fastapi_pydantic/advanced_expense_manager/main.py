@@ -1,20 +1,103 @@
-from fastapi import FastAPI, status, Body, Query
-from schemas import ExpenseResponse, ExpenseCreate
-from typing import Annotated, List, Optional
+from fastapi import (
+    FastAPI,
+    status,
+    Body,
+    Header,
+    Query,
+    Request,
+    Response,
+    HTTPException,
+)
+from schemas import (
+    BulkResult,
+    ExpenseResponse,
+    ExpenseCreate,
+    ExportFormat,
+    Summary,
+)
+from store import ExpenseStore, decode_expense, encode_expense
+from serializers import EXPENSE, EXPENSE_LIST, json_response
+from etags import etag, not_modified, not_modified_response
+from journal import Journal, JournaledStore
+from sqlite_store import SQLiteExpenseStore
+from export import MEDIA_TYPES, iter_export
+from ingest import (
+    NDJSON_MEDIA_TYPES,
+    MalformedBatch,
+    validate_json_array,
+    validate_ndjson_stream,
+)
+from fastapi.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from typing import Annotated, Callable, List, Optional, TypeVar
 from fastapi.responses import StreamingResponse
-import json
+import os
+
+# "dict" keeps running aggregates per write; "columnar" stores NumPy columns
+# and computes summaries with vectorized operations (requires numpy);
+# "sqlite" shares expenses between uvicorn workers through EXPENSE_DB_PATH.
+EXPENSE_STORE = os.getenv("EXPENSE_STORE", "dict")
+
+if EXPENSE_STORE == "columnar":
+    from columnar import ColumnarExpenseStore
+
+    expenses_db = ColumnarExpenseStore()
+elif EXPENSE_STORE == "sqlite":
+    expenses_db = SQLiteExpenseStore(
+        os.getenv("EXPENSE_DB_PATH", "expenses.db")
+    )
+else:
+    expenses_db = ExpenseStore()
+
+# Directory for the write log and snapshots of the in-memory stores; unset
+# means expenses are lost on restart.
+EXPENSE_JOURNAL_DIR = os.getenv("EXPENSE_JOURNAL_DIR")
+
+journal = None
+if EXPENSE_JOURNAL_DIR and EXPENSE_STORE != "sqlite":
+    journal = Journal(
+        EXPENSE_JOURNAL_DIR,
+        key="id",
+        encode=encode_expense,
+        decode=decode_expense,
+        fsync=os.getenv("EXPENSE_JOURNAL_FSYNC", "group"),
+        snapshot_interval=float(os.getenv("EXPENSE_SNAPSHOT_INTERVAL", "60")),
+    )
+    expenses_db = JournaledStore(expenses_db, journal)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if journal is None:
+        yield
+        return
+    async with journal.attach(expenses_db.store):
+        yield
 
 
-app = FastAPI()
+async def commit():
+    """Wait until the writes made so far are durable, if journaling."""
+    if journal is not None:
+        await journal.commit()
 
 
-expenses_db = []
+T = TypeVar("T")
 
 
-def generate_unique_expense_id(db: list) -> int:
-    if not db:
-        return 1
-    return max(db, key=lambda x: x["id"])["id"] + 1
+async def run_store(method: Callable[..., T], *args, **kwargs) -> T:
+    """Call a store method without blocking the event loop on SQLite.
+
+    A SQLite call can wait up to ``busy_timeout`` for another worker's
+    write lock, so it runs in the threadpool and only holds up its own
+    request. The in-memory stores answer in microseconds and are not
+    thread-safe, so they are called inline.
+    """
+    if EXPENSE_STORE == "sqlite":
+        return await run_in_threadpool(method, *args, **kwargs)
+    return method(*args, **kwargs)
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 @app.get(
@@ -24,13 +107,23 @@ def generate_unique_expense_id(db: list) -> int:
 )
 async def list_expenses(
     category: Annotated[Optional[str], Query()] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
+    # Expenses have no per-item endpoints, so reads are tagged with the
+    # version of the whole store, which changes on every write.
+    tag = etag(await run_store(expenses_db.version))
+    if not_modified(if_none_match, tag):
+        return not_modified_response(tag)
     if category:
-        return [
-            item for item in expenses_db if item["category"].name == category
-        ]
+        return json_response(
+            EXPENSE_LIST,
+            await run_store(expenses_db.by_category, category),
+            headers={"ETag": tag},
+        )
 
-    return expenses_db
+    return json_response(
+        EXPENSE_LIST, await run_store(expenses_db.all), headers={"ETag": tag}
+    )
 
 
 @app.post(
@@ -39,31 +132,89 @@ async def list_expenses(
     status_code=status.HTTP_201_CREATED,
 )
 async def add_expense(expense: Annotated[ExpenseCreate, Body()]):
-    new_expense = {
-        "id": generate_unique_expense_id(expenses_db),
-        "title": expense.title,
-        "amount": expense.amount,
-        "category": expense.category,
-    }
-    expenses_db.append(new_expense)
-    return ExpenseResponse(**new_expense)
+    new_expense = await run_store(
+        expenses_db.add,
+        {
+            "title": expense.title,
+            "amount": expense.amount,
+            "category": expense.category,
+        },
+    )
+    await commit()
+    return json_response(EXPENSE, new_expense, status.HTTP_201_CREATED)
 
 
-@app.get("/summary/", status_code=status.HTTP_200_OK)
+@app.post(
+    "/expenses/bulk",
+    response_model=BulkResult,
+    status_code=status.HTTP_200_OK,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {
+                            "$ref": "#/components/schemas/ExpenseCreate"
+                        },
+                    }
+                },
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def add_expenses_bulk(
+    request: Request,
+    batch_size: Annotated[
+        int,
+        Query(ge=1, le=100_000, description="NDJSON rows validated at once"),
+    ] = 10_000,
+):
+    content_type = request.headers.get("content-type", "")
+    try:
+        if content_type.startswith(NDJSON_MEDIA_TYPES):
+            valid, errors = await validate_ndjson_stream(
+                request.stream(), batch_size
+            )
+        else:
+            valid, errors = validate_json_array(await request.body())
+    except MalformedBatch as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        )
+    ids = await run_store(
+        expenses_db.add_many,
+        [
+            {
+                "title": expense.title,
+                "amount": expense.amount,
+                "category": expense.category,
+            }
+            for expense in valid
+        ],
+    )
+    await commit()
+    return BulkResult(
+        created=len(ids),
+        first_id=ids[0] if ids else None,
+        last_id=ids[-1] if ids else None,
+        errors=errors,
+    )
+
+
+@app.get("/summary/", response_model=Summary, status_code=status.HTTP_200_OK)
 async def get_expenses_summary(
+    response: Response,
     category: Annotated[Optional[str], Query] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
-    if category:
-        total_expenses = sum(
-            [
-                item["amount"]
-                for item in expenses_db
-                if item["category"].name == category
-            ]
-        )
-        return total_expenses
-    total_expenses = sum([item["amount"] for item in expenses_db])
-    return {"total": total_expenses}
+    tag = etag(await run_store(expenses_db.version))
+    if not_modified(if_none_match, tag):
+        return not_modified_response(tag)
+    response.headers["ETag"] = tag
+    return await run_store(expenses_db.summary, category or None)
 
 
 @app.get(
@@ -71,13 +222,22 @@ async def get_expenses_summary(
     response_model=List[ExpenseResponse],
     status_code=status.HTTP_200_OK,
 )
-async def export_expenses():
-    expenses_json = json.dumps(
-        [ExpenseResponse(**item).model_dump() for item in expenses_db],
-        indent=2,
-    )
+async def export_expenses(
+    export_format: Annotated[
+        ExportFormat, Query(alias="format")
+    ] = ExportFormat.json,
+    chunk_size: Annotated[
+        int,
+        Query(ge=1, le=10_000, description="Rows serialized per chunk"),
+    ] = 500,
+):
+    # A plain iterator: Starlette pulls it from the threadpool, so SQLite
+    # reads stay off the event loop here too.
     return StreamingResponse(
-        content=iter([expenses_json]),
-        media_type="application/json",
-        headers={"Content-Disposition": "attachment; filename=expenses.json"},
+        content=iter_export(expenses_db.scan(), export_format, chunk_size),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": "attachment; "
+            f"filename=expenses.{export_format.value}"
+        },
     )
@@ -5,7 +5,14 @@ from pydantic import (
     model_validator,
     validator,
 )
-from typing import Optional
+from typing import List, Optional
+from enum import Enum
+
+
+class ExportFormat(str, Enum):
+    json = "json"
+    ndjson = "ndjson"
+    csv = "csv"
 
 
 class Category(BaseModel):
@@ -53,5 +60,22 @@ class ExpenseResponse(ExpensesBase):
     id: int = Field(..., description="Unique identifier for the expense")
 
 
-# class Summary(BaseModel):
-#     pass
+class Summary(BaseModel):
+    total: float = Field(..., description="Sum of expense amounts")
+    count: int = Field(..., description="Number of expenses")
+    min: Optional[float] = Field(None, description="Smallest expense amount")
+    max: Optional[float] = Field(None, description="Largest expense amount")
+
+
+class BulkRowError(BaseModel):
+    row: int = Field(..., description="Zero-based position in the batch")
+    errors: List[dict] = Field(..., description="Validation errors")
+
+
+class BulkResult(BaseModel):
+    created: int = Field(..., description="Number of expenses stored")
+    first_id: Optional[int] = Field(None, description="First assigned id")
+    last_id: Optional[int] = Field(None, description="Last assigned id")
+    errors: List[BulkRowError] = Field(
+        default_factory=list, description="Rows that failed validation"
+    )
@@ -0,0 +1,345 @@
+import math
+import sqlite3
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from schemas import Category
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS expenses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    amount REAL NOT NULL,
+    category_id INTEGER NOT NULL,
+    category_name TEXT NOT NULL,
+    category_description TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_expenses_category_amount
+    ON expenses (category_name, amount);
+CREATE INDEX IF NOT EXISTS ix_expenses_amount ON expenses (amount);
+
+CREATE TABLE IF NOT EXISTS expense_totals (
+    category_name TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    total REAL NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS expenses_after_insert
+AFTER INSERT ON expenses BEGIN
+    INSERT INTO expense_totals (category_name, count, total)
+    VALUES (NEW.category_name, 1, NEW.amount)
+    ON CONFLICT (category_name) DO UPDATE
+    SET count = count + 1, total = total + excluded.total;
+END;
+
+CREATE TRIGGER IF NOT EXISTS expenses_after_delete
+AFTER DELETE ON expenses BEGIN
+    UPDATE expense_totals
+    SET count = count - 1, total = total - OLD.amount
+    WHERE category_name = OLD.category_name;
+END;
+
+CREATE TRIGGER IF NOT EXISTS expenses_after_update
+AFTER UPDATE OF amount, category_name ON expenses BEGIN
+    UPDATE expense_totals
+    SET count = count - 1, total = total - OLD.amount
+    WHERE category_name = OLD.category_name;
+    INSERT INTO expense_totals (category_name, count, total)
+    VALUES (NEW.category_name, 1, NEW.amount)
+    ON CONFLICT (category_name) DO UPDATE
+    SET count = count + 1, total = total + excluded.total;
+END;
+
+CREATE TABLE IF NOT EXISTS expense_versions (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    epoch TEXT NOT NULL,
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO expense_versions (id, epoch, version)
+VALUES (1, lower(hex(randomblob(4))), 0);
+
+CREATE TRIGGER IF NOT EXISTS expenses_version_after_insert
+AFTER INSERT ON expenses BEGIN
+    UPDATE expense_versions SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS expenses_version_after_update
+AFTER UPDATE ON expenses BEGIN
+    UPDATE expense_versions SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS expenses_version_after_delete
+AFTER DELETE ON expenses BEGIN
+    UPDATE expense_versions SET version = version + 1;
+END;
+"""
+
+COLUMNS = "id, title, amount, category_id, category_name, category_description"
+INSERT = (
+    "INSERT INTO expenses (id, title, amount, category_id, category_name, "
+    "category_description) VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
+class SQLiteExpenseStore:
+    """Expense store shared by every worker process through one SQLite file.
+
+    The database runs in WAL mode, so readers never block on the writer
+    and each other. Ids come from ``AUTOINCREMENT`` inside the write lock,
+    so they are unique across workers. Triggers keep per-category count
+    and total in ``expense_totals``, and min/max are index lookups, so
+    summaries do not scan the expenses. Another trigger bumps a shared
+    version counter on every write. Each thread gets its own connection.
+
+    Exposes the same interface as ``ExpenseStore``.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        self._path = path
+        self._busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._categories: Dict[Tuple, Category] = {}
+        self._connection().executescript(SCHEMA)
+
+    def __len__(self) -> int:
+        return int(
+            self._connection()
+            .execute("SELECT TOTAL(count) FROM expense_totals")
+            .fetchone()[0]
+        )
+
+    def __iter__(self) -> Iterator[dict]:
+        return self.scan()
+
+    def version(self) -> str:
+        """Token that changes whenever any expense is written, by any
+        worker."""
+        return (
+            self._connection()
+            .execute("SELECT epoch || '.' || version FROM expense_versions")
+            .fetchone()[0]
+        )
+
+    def all(self) -> list:
+        return list(self.scan())
+
+    def get(self, expense_id: int) -> Optional[dict]:
+        row = (
+            self._connection()
+            .execute(
+                f"SELECT {COLUMNS} FROM expenses WHERE id = ?", (expense_id,)
+            )
+            .fetchone()
+        )
+        return self._to_expense(row) if row else None
+
+    def scan(self, batch_size: int = 1000) -> Iterator[dict]:
+        """Yield expenses in id order, one keyset-paginated batch at a time."""
+        after = 0
+        while True:
+            rows = (
+                self._connection()
+                .execute(
+                    f"SELECT {COLUMNS} FROM expenses WHERE id > ? "
+                    "ORDER BY id LIMIT ?",
+                    (after, batch_size),
+                )
+                .fetchall()
+            )
+            if not rows:
+                return
+            after = rows[-1][0]
+            yield from (self._to_expense(row) for row in rows)
+
+    def by_category(self, category: str) -> list:
+        rows = self._connection().execute(
+            f"SELECT {COLUMNS} FROM expenses WHERE category_name = ? "
+            "ORDER BY id",
+            (category,),
+        )
+        return [self._to_expense(row) for row in rows]
+
+    def add(self, data: dict) -> dict:
+        category = data["category"]
+        rows = self._connection().execute(
+            f"{INSERT} RETURNING {COLUMNS}",
+            (
+                None,
+                data["title"],
+                data["amount"],
+                category.id,
+                category.name,
+                category.description,
+            ),
+        )
+        # Drain RETURNING rows so the statement, and its commit, completes.
+        return self._to_expense(rows.fetchall()[0])
+
+    def add_many(self, rows: List[dict]) -> range:
+        """Insert ``rows`` in one transaction under a contiguous id block."""
+        connection = self._connection()
+        # BEGIN IMMEDIATE takes the write lock up front, so no other worker
+        # can allocate ids between reading the sequence and inserting.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            last = connection.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'expenses'"
+            ).fetchone()
+            first_id = (last[0] if last else 0) + 1
+            ids = range(first_id, first_id + len(rows))
+            connection.executemany(
+                INSERT,
+                (
+                    (
+                        expense_id,
+                        data["title"],
+                        data["amount"],
+                        data["category"].id,
+                        data["category"].name,
+                        data["category"].description,
+                    )
+                    for expense_id, data in zip(ids, rows)
+                ),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return ids
+
+    def update(self, expense_id: int, data: dict) -> Optional[dict]:
+        values = {}
+        if "title" in data:
+            values["title"] = data["title"]
+        if "amount" in data:
+            values["amount"] = data["amount"]
+        if "category" in data:
+            values["category_id"] = data["category"].id
+            values["category_name"] = data["category"].name
+            values["category_description"] = data["category"].description
+        if not values:
+            return self.get(expense_id)
+        assignments = ", ".join(f"{key} = :{key}" for key in values)
+        rows = self._connection().execute(
+            f"UPDATE expenses SET {assignments} WHERE id = :id "
+            f"RETURNING {COLUMNS}",
+            {**values, "id": expense_id},
+        )
+        updated = rows.fetchall()
+        return self._to_expense(updated[0]) if updated else None
+
+    def delete(self, expense_id: int) -> bool:
+        cursor = self._connection().execute(
+            "DELETE FROM expenses WHERE id = ?", (expense_id,)
+        )
+        return cursor.rowcount > 0
+
+    def clear(self) -> None:
+        self._connection().executescript(
+            "DELETE FROM expenses; DELETE FROM expense_totals;"
+        )
+
+    def summary(self, category: Optional[str] = None) -> dict:
+        # One statement is one read transaction, so the four fields come
+        # from the same snapshot even while other workers write.
+        if category is None:
+            query = (
+                "SELECT (SELECT TOTAL(count) FROM expense_totals), "
+                "(SELECT TOTAL(total) FROM expense_totals), "
+                "(SELECT MIN(amount) FROM expenses), "
+                "(SELECT MAX(amount) FROM expenses)"
+            )
+        else:
+            query = (
+                "SELECT (SELECT count FROM expense_totals "
+                "WHERE category_name = :name), "
+                "(SELECT total FROM expense_totals "
+                "WHERE category_name = :name), "
+                "(SELECT MIN(amount) FROM expenses "
+                "WHERE category_name = :name), "
+                "(SELECT MAX(amount) FROM expenses "
+                "WHERE category_name = :name)"
+            )
+        count, total, minimum, maximum = (
+            self._connection().execute(query, {"name": category}).fetchone()
+        )
+        if not count:
+            return {"total": 0.0, "count": 0, "min": None, "max": None}
+        return {
+            "total": total,
+            "count": int(count),
+            "min": minimum,
+            "max": maximum,
+        }
+
+    def recompute_summary(self, category: Optional[str] = None) -> dict:
+        amounts = [
+            item["amount"]
+            for item in self.scan()
+            if category is None or item["category"].name == category
+        ]
+        return {
+            "total": math.fsum(amounts),
+            "count": len(amounts),
+            "min": min(amounts, default=None),
+            "max": max(amounts, default=None),
+        }
+
+    def check_consistency(self) -> List[str]:
+        """Compare the trigger-maintained totals against a full recompute.
+
+        Returns a description of every mismatch; an empty list means the
+        running values are consistent.
+        """
+        errors = []
+        names = [
+            name
+            for (name,) in self._connection().execute(
+                "SELECT category_name FROM expense_totals WHERE count > 0"
+            )
+        ]
+        for category in [None, *names]:
+            running = self.summary(category)
+            expected = self.recompute_summary(category)
+            for key, value in expected.items():
+                if key == "total":
+                    matches = math.isclose(
+                        running[key], value, rel_tol=1e-9, abs_tol=1e-6
+                    )
+                else:
+                    matches = running[key] == value
+                if not matches:
+                    errors.append(
+                        f"{category or 'overall'}.{key}: "
+                        f"running={running[key]} expected={value}"
+                    )
+        return errors
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit: every statement is its own atomic transaction.
+            connection = sqlite3.connect(
+                self._path, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA busy_timeout={self._busy_timeout_ms}")
+            self._local.connection = connection
+        return connection
+
+    def _to_expense(self, row: tuple) -> dict:
+        expense_id, title, amount, *category_key = row
+        category = self._categories.get(tuple(category_key))
+        if category is None:
+            category_id, name, description = category_key
+            category = Category(
+                id=category_id, name=name, description=description
+            )
+            self._categories[tuple(category_key)] = category
+        return {
+            "title": title,
+            "amount": amount,
+            "category": category,
+            "id": expense_id,
+        }
@@ -0,0 +1,298 @@
+import heapq
+import math
+import secrets
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from schemas import Category
+
+
+class Aggregate:
+    """Running count, total, min and max over a group of expenses.
+
+    Min and max are served from heaps with lazy deletion: entries whose
+    expense was removed or changed amount are dropped when they reach the
+    top, so reads stay O(1) amortized and writes O(log n).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self._amounts: Dict[int, float] = {}
+        self._min_heap: List[Tuple[float, int]] = []
+        self._max_heap: List[Tuple[float, int]] = []
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._amounts)
+
+    def add(self, expense_id: int, amount: float) -> None:
+        self._amounts[expense_id] = amount
+        self.count += 1
+        self.total += amount
+        heapq.heappush(self._min_heap, (amount, expense_id))
+        heapq.heappush(self._max_heap, (-amount, expense_id))
+
+    def add_many(self, items: List[Tuple[int, float]]) -> None:
+        if len(items) < len(self._min_heap):
+            for expense_id, amount in items:
+                self.add(expense_id, amount)
+            return
+        # Large batches: append and re-heapify once instead of pushing.
+        for expense_id, amount in items:
+            self._amounts[expense_id] = amount
+            self.total += amount
+        self.count += len(items)
+        self._min_heap.extend(
+            (amount, expense_id) for expense_id, amount in items
+        )
+        self._max_heap.extend(
+            (-amount, expense_id) for expense_id, amount in items
+        )
+        heapq.heapify(self._min_heap)
+        heapq.heapify(self._max_heap)
+
+    def remove(self, expense_id: int) -> None:
+        amount = self._amounts.pop(expense_id)
+        self.count -= 1
+        self.total -= amount
+        if not self._amounts:
+            self.total = 0.0
+            self._min_heap.clear()
+            self._max_heap.clear()
+        elif len(self._min_heap) > 2 * len(self._amounts) + 64:
+            self._compact()
+
+    @property
+    def min(self) -> Optional[float]:
+        return self._peek(self._min_heap, 1)
+
+    @property
+    def max(self) -> Optional[float]:
+        return self._peek(self._max_heap, -1)
+
+    def summary(self) -> dict:
+        return {
+            "total": self.total,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    def _peek(self, heap: list, sign: int) -> Optional[float]:
+        while heap:
+            amount, expense_id = heap[0]
+            if self._amounts.get(expense_id) == sign * amount:
+                return sign * amount
+            heapq.heappop(heap)
+        return None
+
+    def _compact(self) -> None:
+        self._min_heap = [
+            (amount, expense_id)
+            for expense_id, amount in self._amounts.items()
+        ]
+        self._max_heap = [
+            (-amount, expense_id)
+            for expense_id, amount in self._amounts.items()
+        ]
+        heapq.heapify(self._min_heap)
+        heapq.heapify(self._max_heap)
+
+
+class ExpenseStore:
+    """In-memory expense store keyed by ``id``.
+
+    Keeps an overall ``Aggregate`` and one per category name, updated on
+    every write, so summaries never walk the stored expenses.
+    """
+
+    def __init__(self, start_id: int = 1):
+        self._expenses: Dict[int, dict] = {}
+        self._start_id = start_id
+        self._next_id = start_id
+        self._overall = Aggregate()
+        self._by_category: Dict[str, Aggregate] = {}
+        # Bumped on every write; the random epoch keeps versions handed out
+        # before a restart from matching.
+        self._epoch = secrets.token_hex(4)
+        self._version = 0
+
+    def __len__(self) -> int:
+        return len(self._expenses)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._expenses.values())
+
+    def next_id(self) -> int:
+        expense_id = self._next_id
+        self._next_id += 1
+        return expense_id
+
+    def version(self) -> str:
+        """Token that changes whenever any expense is written."""
+        return f"{self._epoch}.{self._version}"
+
+    def all(self) -> list:
+        return list(self._expenses.values())
+
+    def get(self, expense_id: int) -> Optional[dict]:
+        return self._expenses.get(expense_id)
+
+    def scan(self) -> Iterator[dict]:
+        """Yield expenses in id order without holding a copy of the store.
+
+        Walks the id range allocated so far, so it is safe to resume
+        between writes: deleted ids are skipped and later inserts are left
+        out of the scan.
+        """
+        for expense_id in range(self._start_id, self._next_id):
+            expense = self._expenses.get(expense_id)
+            if expense is not None:
+                yield expense
+
+    def by_category(self, category: str) -> list:
+        aggregate = self._by_category.get(category)
+        if aggregate is None:
+            return []
+        return [self._expenses[expense_id] for expense_id in sorted(aggregate)]
+
+    def add(self, data: dict) -> dict:
+        expense = {**data, "id": self.next_id()}
+        self._expenses[expense["id"]] = expense
+        self._track(expense)
+        self._version += 1
+        return expense
+
+    def add_many(self, rows: List[dict]) -> range:
+        """Insert ``rows`` under one contiguous block of ids."""
+        ids = range(self._next_id, self._next_id + len(rows))
+        self._next_id += len(rows)
+        self._insert_many(
+            [{**data, "id": expense_id} for expense_id, data in zip(ids, rows)]
+        )
+        return ids
+
+    def update(self, expense_id: int, data: dict) -> Optional[dict]:
+        expense = self._expenses.get(expense_id)
+        if expense is None:
+            return None
+        self._untrack(expense)
+        expense.update(data)
+        self._track(expense)
+        self._version += 1
+        return expense
+
+    def delete(self, expense_id: int) -> bool:
+        expense = self._expenses.pop(expense_id, None)
+        if expense is None:
+            return False
+        self._untrack(expense)
+        self._version += 1
+        return True
+
+    def clear(self) -> None:
+        self._expenses.clear()
+        self._overall = Aggregate()
+        self._by_category.clear()
+        self._version += 1
+
+    def load(self, expenses: List[dict], next_id: int) -> None:
+        """Replace the contents with ``expenses``, given in id order."""
+        self.clear()
+        self._insert_many(expenses)
+        self._next_id = max(self._next_id, next_id)
+
+    def summary(self, category: Optional[str] = None) -> dict:
+        if category is None:
+            return self._overall.summary()
+        aggregate = self._by_category.get(category)
+        if aggregate is None:
+            return Aggregate().summary()
+        return aggregate.summary()
+
+    def recompute_summary(self, category: Optional[str] = None) -> dict:
+        amounts = [
+            item["amount"]
+            for item in self._expenses.values()
+            if category is None or item["category"].name == category
+        ]
+        return {
+            "total": math.fsum(amounts),
+            "count": len(amounts),
+            "min": min(amounts, default=None),
+            "max": max(amounts, default=None),
+        }
+
+    def check_consistency(self) -> List[str]:
+        """Compare running aggregates against a full recompute.
+
+        Returns a description of every mismatch; an empty list means the
+        running values are consistent.
+        """
+        errors = []
+        categories = [None, *self._by_category]
+        for category in categories:
+            running = self.summary(category)
+            expected = self.recompute_summary(category)
+            for key, value in expected.items():
+                if key == "total":
+                    matches = math.isclose(
+                        running[key], value, rel_tol=1e-9, abs_tol=1e-6
+                    )
+                else:
+                    matches = running[key] == value
+                if not matches:
+                    errors.append(
+                        f"{category or 'overall'}.{key}: "
+                        f"running={running[key]} expected={value}"
+                    )
+        return errors
+
+    def _insert_many(self, expenses: List[dict]) -> None:
+        self._version += 1
+        overall: List[Tuple[int, float]] = []
+        by_category: Dict[str, List[Tuple[int, float]]] = {}
+        for expense in expenses:
+            self._expenses[expense["id"]] = expense
+            item = (expense["id"], expense["amount"])
+            overall.append(item)
+            by_category.setdefault(expense["category"].name, []).append(item)
+        self._overall.add_many(overall)
+        for name, items in by_category.items():
+            if name not in self._by_category:
+                self._by_category[name] = Aggregate()
+            self._by_category[name].add_many(items)
+
+    def _track(self, expense: dict) -> None:
+        self._overall.add(expense["id"], expense["amount"])
+        name = expense["category"].name
+        if name not in self._by_category:
+            self._by_category[name] = Aggregate()
+        self._by_category[name].add(expense["id"], expense["amount"])
+
+    def _untrack(self, expense: dict) -> None:
+        self._overall.remove(expense["id"])
+        name = expense["category"].name
+        self._by_category[name].remove(expense["id"])
+        if not self._by_category[name].count:
+            del self._by_category[name]
+
+
+def encode_expense(expense: dict) -> dict:
+    return {**expense, "category": expense["category"].model_dump()}
+
+
+def decode_expense(record: dict) -> dict:
+    category = record["category"]
+    record["category"] = _category(
+        category["id"], category["name"], category["description"]
+    )
+    return record
+
+
+@lru_cache(maxsize=1024)
+def _category(
+    category_id: int, name: str, description: Optional[str]
+) -> Category:
+    # Share one Category per distinct value instead of one per expense.
+    return Category(id=category_id, name=name, description=description)
@@ -0,0 +1,64 @@
+"""The columnar store answers /summary/ the same as the dict store,
+including after its columns are compacted."""
+
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from store import ExpenseStore
+
+columnar = pytest.importorskip("columnar")
+
+CATEGORY_NAMES = ["Food", "Transport", "Health"]
+
+
+def payload(rng, i):
+    name = rng.choice(CATEGORY_NAMES)
+    return {
+        "title": f"expense {i}",
+        "amount": round(rng.uniform(0.01, 500), 2),
+        "category": {"id": CATEGORY_NAMES.index(name) + 1, "name": name},
+    }
+
+
+def summaries(client):
+    return [
+        client.get("/summary/", params={"category": name}).json()
+        for name in [None, *CATEGORY_NAMES, "Travel"]
+    ]
+
+
+def run(monkeypatch, store, seed):
+    """Write through the routes where there is one, else the store, and
+    return every summary."""
+    monkeypatch.setattr(main, "expenses_db", store)
+    client = TestClient(main.app)
+    rng = random.Random(seed)
+    for i in range(50):
+        client.post("/expenses/", json=payload(rng, i))
+    client.post("/expenses/bulk", json=[payload(rng, i) for i in range(2000)])
+    ids = [expense["id"] for expense in store.scan()]
+    for expense_id in rng.sample(ids, 300):
+        store.update(expense_id, {"amount": round(rng.uniform(1, 900), 2)})
+    rng.shuffle(ids)
+    for expense_id in ids[:1500]:
+        store.delete(expense_id)
+    client.post("/expenses/bulk", json=[payload(rng, i) for i in range(100)])
+    return summaries(client)
+
+
+def test_summaries_match_dict_store(monkeypatch):
+    columns = columnar.ColumnarExpenseStore()
+    expected = run(monkeypatch, ExpenseStore(), 0)
+    # Same seed, same ids: both stores see identical writes.
+    actual = run(monkeypatch, columns, 0)
+
+    # 2050 rows down to 550 live ones is past the compaction threshold.
+    assert columns._size < 2050
+    for got, want in zip(actual, expected):
+        assert got["count"] == want["count"]
+        assert got["min"] == want["min"]
+        assert got["max"] == want["max"]
+        assert got["total"] == pytest.approx(want["total"], rel=1e-9)
@@ -0,0 +1,132 @@
+"""Every store's summaries agree with a recompute from the stored rows
+after any mix of writes."""
+
+import random
+
+import pytest
+
+from schemas import Category
+from sqlite_store import SQLiteExpenseStore
+from store import ExpenseStore
+
+CATEGORIES = [
+    Category(id=1, name="Food"),
+    Category(id=2, name="Transport"),
+    Category(id=3, name="Health", description="Doctor and pharmacy"),
+]
+
+
+def columnar_store(tmp_path):
+    columnar = pytest.importorskip("columnar")
+    return columnar.ColumnarExpenseStore()
+
+
+@pytest.fixture(
+    params=[
+        lambda tmp_path: ExpenseStore(),
+        columnar_store,
+        lambda tmp_path: SQLiteExpenseStore(str(tmp_path / "expenses.db")),
+    ],
+    ids=["dict", "columnar", "sqlite"],
+)
+def store(request, tmp_path):
+    return request.param(tmp_path)
+
+
+def expense(rng, i):
+    return {
+        "title": f"expense {i % 50}",
+        "amount": round(rng.uniform(0.01, 500), 2),
+        "category": rng.choice(CATEGORIES),
+    }
+
+
+def test_consistent_after_mixed_writes(store):
+    rng = random.Random(0)
+    ids = [store.add(expense(rng, i))["id"] for i in range(300)]
+    ids.extend(store.add_many([expense(rng, i) for i in range(1500)]))
+    assert store.check_consistency() == []
+
+    for expense_id in rng.sample(ids, 400):
+        change = expense(rng, expense_id)
+        del change[rng.choice(["title", "amount", "category"])]
+        store.update(expense_id, change)
+    assert store.check_consistency() == []
+
+    # Enough deletes to compact the columns and the min/max heaps.
+    rng.shuffle(ids)
+    for expense_id in ids[:1200]:
+        assert store.delete(expense_id)
+    assert not store.delete(ids[0])
+    assert len(store) == 600
+    assert store.check_consistency() == []
+
+    ids.extend(store.add_many([expense(rng, i) for i in range(200)]))
+    for expense_id in ids[1200:1500]:
+        store.delete(expense_id)
+    assert store.check_consistency() == []
+
+
+def test_consistent_after_emptying_a_category(store):
+    rng = random.Random(1)
+    ids = store.add_many([expense(rng, i) for i in range(60)])
+    for item in store.by_category("Health"):
+        store.delete(item["id"])
+    assert store.summary("Health")["count"] == 0
+    assert store.check_consistency() == []
+
+    for expense_id in ids:
+        store.delete(expense_id)
+    assert store.summary() == {
+        "total": 0.0,
+        "count": 0,
+        "min": None,
+        "max": None,
+    }
+    assert store.check_consistency() == []
+
+
+def test_drift_is_reported():
+    store = ExpenseStore()
+    store.add({"title": "lunch", "amount": 12.5, "category": CATEGORIES[0]})
+    store._overall.total += 1
+    assert store.check_consistency() == [
+        "overall.total: running=13.5 expected=12.5"
+    ]
+
+
+class WriteAfterEachRead:
+    """Connection whose every statement is followed by another worker's
+    write, as can happen between two autocommit reads."""
+
+    def __init__(self, connection, write):
+        self._connection = connection
+        self._write = write
+
+    def execute(self, *args):
+        cursor = self._connection.execute(*args)
+        self._write()
+        return cursor
+
+
+@pytest.mark.parametrize("category", [None, "Food"])
+def test_sqlite_summary_is_one_snapshot(tmp_path, monkeypatch, category):
+    path = str(tmp_path / "expenses.db")
+    store, other = SQLiteExpenseStore(path), SQLiteExpenseStore(path)
+    store.add({"title": "lunch", "amount": 10.0, "category": CATEGORIES[0]})
+    store.add({"title": "dinner", "amount": 20.0, "category": CATEGORIES[0]})
+    before = store.summary(category)
+
+    amounts = iter([1.0, 1000.0, 0.5, 500.0])
+    connection = WriteAfterEachRead(
+        store._connection(),
+        lambda: other.add(
+            {
+                "title": "meanwhile",
+                "amount": next(amounts),
+                "category": CATEGORIES[0],
+            }
+        ),
+    )
+    monkeypatch.setattr(store, "_connection", lambda: connection)
+    assert store.summary(category) == before
@@ -0,0 +1,39 @@
+"""Expense reads answer 304 to a current If-None-Match until any expense
+is written."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from store import ExpenseStore
+
+EXPENSE = {
+    "title": "lunch",
+    "amount": 12.5,
+    "category": {"id": 1, "name": "Food"},
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "expenses_db", ExpenseStore())
+    client = TestClient(main.app)
+    client.post("/expenses/", json=EXPENSE)
+    return client
+
+
+@pytest.mark.parametrize(
+    "path", ["/expenses/", "/expenses/?category=Food", "/summary/"]
+)
+def test_not_modified_until_a_write(client, path):
+    tag = client.get(path).headers["ETag"]
+    for if_none_match in (tag, f"W/{tag}", f'"other", {tag}'):
+        response = client.get(path, headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    assert client.get(path, headers={"If-None-Match": '"other"'}).json()
+    client.post("/expenses/bulk", json=[EXPENSE])
+    response = client.get(path, headers={"If-None-Match": tag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != tag
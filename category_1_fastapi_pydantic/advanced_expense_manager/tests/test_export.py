@@ -0,0 +1,188 @@
+"""/export/ streams every stored expense in id order, in each format, as
+the same bytes the old all-at-once export produced."""
+
+import csv
+import io
+import json
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from export import CSV_COLUMNS, iter_export
+from schemas import Category, ExpenseResponse, ExportFormat
+from sqlite_store import SQLiteExpenseStore
+from store import ExpenseStore
+
+CATEGORIES = [
+    Category(id=1, name="Food"),
+    Category(id=2, name="Transport"),
+    Category(id=3, name="Health", description="Doctor, and pharmacy"),
+]
+# More rows than one batch of any store's scan (the columnar store reads
+# 4096 rows at a time, SQLite 1000).
+ROWS = 5000
+
+
+def columnar_store(tmp_path):
+    columnar = pytest.importorskip("columnar")
+    return columnar.ColumnarExpenseStore()
+
+
+@pytest.fixture(
+    params=[
+        lambda tmp_path: ExpenseStore(),
+        columnar_store,
+        lambda tmp_path: SQLiteExpenseStore(str(tmp_path / "expenses.db")),
+    ],
+    ids=["dict", "columnar", "sqlite"],
+)
+def store(request, tmp_path):
+    return request.param(tmp_path)
+
+
+def fill(store, count=ROWS, seed=0):
+    rng = random.Random(seed)
+    ids = list(
+        store.add_many(
+            [
+                {
+                    "title": f'expense "{i}"',
+                    "amount": round(rng.uniform(0.01, 500), 2),
+                    "category": rng.choice(CATEGORIES),
+                }
+                for i in range(count)
+            ]
+        )
+    )
+    # Gaps in the ids, including across scan batches.
+    for expense_id in ids[::7]:
+        store.delete(expense_id)
+    return [expense_id for i, expense_id in enumerate(ids) if i % 7]
+
+
+@pytest.fixture
+def client(store, monkeypatch):
+    monkeypatch.setattr(
+        main,
+        "EXPENSE_STORE",
+        "sqlite" if isinstance(store, SQLiteExpenseStore) else "dict",
+    )
+    monkeypatch.setattr(main, "expenses_db", store)
+    return TestClient(main.app)
+
+
+def export(client, export_format, chunk_size=500):
+    return client.get(
+        "/export/",
+        params={"format": export_format, "chunk_size": chunk_size},
+    )
+
+
+def old_json_body(store):
+    """The body /export/ sent before it streamed."""
+    return json.dumps(
+        [ExpenseResponse(**item).model_dump() for item in store],
+        indent=2,
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 500, 10_000])
+def test_json_is_the_old_body(store, client, chunk_size):
+    fill(store)
+    response = export(client, "json", chunk_size)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["content-disposition"] == (
+        "attachment; filename=expenses.json"
+    )
+    assert response.text == old_json_body(store)
+
+
+def test_ndjson(store, client):
+    ids = fill(store)
+    response = export(client, "ndjson", 300)
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == (
+        "attachment; filename=expenses.ndjson"
+    )
+    assert response.text.endswith("\n")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == ids
+    assert rows == [
+        ExpenseResponse(**item).model_dump(mode="json") for item in store
+    ]
+
+
+def test_csv(store, client):
+    ids = fill(store)
+    response = export(client, "csv", 300)
+
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == (
+        "attachment; filename=expenses.csv"
+    )
+    header, *rows = csv.reader(io.StringIO(response.text))
+    assert header == CSV_COLUMNS
+    assert [int(row[0]) for row in rows] == ids
+    expected = [
+        [
+            str(item["id"]),
+            item["title"],
+            str(item["amount"]),
+            str(item["category"].id),
+            item["category"].name,
+            item["category"].description or "",
+        ]
+        for item in store
+    ]
+    assert rows == expected
+
+
+@pytest.mark.parametrize(
+    "export_format,body",
+    [("json", "[]"), ("ndjson", ""), ("csv", ",".join(CSV_COLUMNS) + "\r\n")],
+)
+def test_empty_store(client, export_format, body):
+    response = export(client, export_format)
+    assert response.status_code == 200
+    assert response.text == body
+
+
+@pytest.mark.parametrize("export_format", list(ExportFormat))
+def test_writes_between_chunks(store, export_format):
+    ids = fill(store)
+    chunks = iter_export(store.scan(), export_format, 100)
+    body = [next(chunks)]
+    # Writes landing while the export is being sent: behind the scan,
+    # ahead of it (enough to compact the columnar store's arrays), and a
+    # new expense at the end.
+    deleted = {ids[0]} | {
+        expense_id for i, expense_id in enumerate(ids[1000:]) if i % 5
+    }
+    for expense_id in deleted:
+        store.delete(expense_id)
+    store.update(ids[-1], {"title": "renamed"})
+    added = store.add(
+        {"title": "new", "amount": 1.0, "category": CATEGORIES[0]}
+    )["id"]
+    body.extend(chunks)
+
+    exported = exported_ids("".join(body), export_format)
+    assert exported == sorted(set(exported))
+    # Every expense live throughout is sent; one deleted meanwhile may
+    # still be, if it was read before the delete. The new one may or may
+    # not be, depending on the store.
+    kept = [i for i in ids if i not in deleted]
+    assert set(kept) <= set(exported) <= {*ids, added}
+
+
+def exported_ids(body, export_format):
+    if export_format == ExportFormat.json:
+        return [row["id"] for row in json.loads(body)]
+    if export_format == ExportFormat.ndjson:
+        return [json.loads(line)["id"] for line in body.splitlines()]
+    return [int(row[0]) for row in list(csv.reader(io.StringIO(body)))[1:]]
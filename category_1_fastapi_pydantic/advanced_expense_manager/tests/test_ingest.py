@@ -0,0 +1,95 @@
+"""POST /expenses/bulk stores the valid rows and reports the others by
+row number, for JSON arrays and NDJSON bodies."""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from store import ExpenseStore
+
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "expenses_db", ExpenseStore())
+    return TestClient(main.app)
+
+
+def row(amount=10.0, name="Food"):
+    return {
+        "title": "lunch",
+        "amount": amount,
+        "category": {"id": 1, "name": name},
+    }
+
+
+def error_rows(result):
+    return [error["row"] for error in result["errors"]]
+
+
+def test_json_array_reports_bad_rows(client):
+    rows = [row(), row(amount=0), row(name="Travel"), row(amount=3)]
+    result = client.post("/expenses/bulk", json=rows).json()
+
+    assert result["created"] == 2
+    assert (result["first_id"], result["last_id"]) == (1, 2)
+    assert error_rows(result) == [1, 2]
+    [amount_error] = result["errors"][0]["errors"]
+    assert amount_error["loc"] == ["amount"]
+    assert [e["amount"] for e in client.get("/expenses/").json()] == [10, 3]
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 10_000])
+def test_ndjson_reports_bad_lines(client, batch_size):
+    lines = [
+        json.dumps(row()),
+        "{not json",
+        "",
+        json.dumps(row(amount=-1)),
+        json.dumps(row(amount=2)),
+        json.dumps(row(amount=4)),
+    ]
+    response = client.post(
+        "/expenses/bulk",
+        params={"batch_size": batch_size},
+        content="\n".join(lines) + "\n",
+        headers=NDJSON,
+    )
+
+    result = response.json()
+    assert result["created"] == 3
+    # Blank lines are not rows, so the numbers skip them.
+    assert error_rows(result) == [1, 2]
+    assert result["errors"][0]["errors"][0]["type"] == "json_invalid"
+    assert client.get("/summary/").json()["total"] == 16
+
+
+@pytest.mark.parametrize(
+    "body", [b'{"title": "lunch"}', b"[1, 2", b'"expenses"']
+)
+def test_json_body_that_is_not_an_array(client, body):
+    response = client.post(
+        "/expenses/bulk",
+        content=body,
+        headers={"Content-Type": "application/json"},
+    )
+    assert response.status_code == 422
+    assert client.get("/summary/").json()["count"] == 0
+
+
+@pytest.mark.parametrize(
+    "body,headers",
+    [(b"[]", {"Content-Type": "application/json"}), (b"\n\n", NDJSON)],
+)
+def test_empty_batch(client, body, headers):
+    response = client.post("/expenses/bulk", content=body, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {
+        "created": 0,
+        "first_id": None,
+        "last_id": None,
+        "errors": [],
+    }
@@ -0,0 +1,65 @@
+"""Restarting from the write log and a snapshot rebuilds the expenses and
+their running aggregates. journal.py itself is covered by the
+simple_task_manager suite; this checks the expense codec and bulk
+writes."""
+
+import asyncio
+
+from journal import Journal, JournaledStore
+from schemas import Category
+from store import ExpenseStore, decode_expense, encode_expense
+
+FOOD = Category(id=1, name="Food")
+HEALTH = Category(id=3, name="Health", description="Doctor and pharmacy")
+
+
+def run(directory, writes):
+    journal = Journal(
+        str(directory),
+        key="id",
+        encode=encode_expense,
+        decode=decode_expense,
+        snapshot_interval=3600,
+    )
+    store = ExpenseStore()
+
+    async def session():
+        async with journal.attach(store):
+            await writes(JournaledStore(store, journal), journal)
+
+    asyncio.run(session())
+    return store
+
+
+async def no_writes(store, journal):
+    pass
+
+
+def expense(title, amount, category=FOOD):
+    return {"title": title, "amount": amount, "category": category}
+
+
+def test_expenses_and_summaries_survive_restart(tmp_path):
+    async def writes(store, journal):
+        store.add(expense("lunch", 12.5))
+        store.add_many(
+            [expense(f"pill {i}", i + 1.0, HEALTH) for i in range(5)]
+        )
+        await journal.snapshot(store)
+        store.update(1, {"amount": 20.0})
+        store.delete(4)
+        store.add_many([expense("dinner", 30.0)])
+        await journal.commit()
+
+    written = run(tmp_path, writes)
+    recovered = run(tmp_path, no_writes)
+    assert recovered.all() == written.all()
+    assert recovered.summary() == written.summary()
+    assert recovered.summary("Health") == {
+        "total": 12.0,
+        "count": 4,
+        "min": 1.0,
+        "max": 5.0,
+    }
+    assert recovered.check_consistency() == []
+    assert recovered.get(2)["category"] == HEALTH
@@ -0,0 +1,138 @@
+"""Routes that dump stored records through a TypeAdapter send the same
+body, and document the same OpenAPI schema, as the response_model path
+they bypass."""
+
+from typing import List, Optional
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+import main
+from schemas import Category, ExpenseResponse
+from sqlite_store import SQLiteExpenseStore
+from store import ExpenseStore
+
+EXPENSES = [
+    {"title": "Lunch", "amount": 12.0, "category": {"id": 1, "name": "Food"}},
+    {
+        "title": 'Café "crème" ☕',
+        "amount": 0.1,
+        "category": {"id": 1, "name": "Food", "description": None},
+    },
+    {
+        "title": "Taxi",
+        "amount": 123456789.125,
+        "category": {"id": 2, "name": "Transport", "description": "Ride"},
+    },
+    {
+        "title": "Pharmacy",
+        "amount": 1e-7,
+        "category": {"id": 3, "name": "Health", "description": "Ünïcode"},
+    },
+]
+EXPENSE_LIST = TypeAdapter(List[ExpenseResponse])
+
+
+def columnar_store(tmp_path):
+    columnar = pytest.importorskip("columnar")
+    return columnar.ColumnarExpenseStore()
+
+
+@pytest.fixture(
+    params=[
+        lambda tmp_path: ExpenseStore(),
+        columnar_store,
+        lambda tmp_path: SQLiteExpenseStore(str(tmp_path / "expenses.db")),
+    ],
+    ids=["dict", "columnar", "sqlite"],
+)
+def store(request, tmp_path):
+    return request.param(tmp_path)
+
+
+def reference_app(store):
+    """The same routes returning stored records for FastAPI to validate
+    and serialize against ``response_model``, as before the fast path."""
+    app = FastAPI()
+
+    @app.get("/expenses/", response_model=List[ExpenseResponse])
+    def list_expenses(category: Optional[str] = None):
+        return store.by_category(category) if category else store.all()
+
+    @app.get("/expenses/{expense_id}", response_model=ExpenseResponse)
+    def get_expense(expense_id: int):
+        return next(item for item in store.all() if item["id"] == expense_id)
+
+    return app
+
+
+@pytest.fixture
+def clients(store, monkeypatch):
+    monkeypatch.setattr(main, "expenses_db", store)
+    return TestClient(main.app), TestClient(reference_app(store))
+
+
+def test_bodies_match_the_response_model_path(clients):
+    client, reference = clients
+    for expense in EXPENSES:
+        response = client.post("/expenses/", json=expense)
+        assert response.status_code == 201
+        expense_id = response.json()["id"]
+        expected = reference.get(f"/expenses/{expense_id}")
+        assert response.content == expected.content
+        ExpenseResponse.model_validate_json(response.content)
+
+    for params in ({}, {"category": "Food"}, {"category": "Travel"}):
+        response = client.get("/expenses/", params=params)
+        expected = reference.get("/expenses/", params=params)
+        assert response.headers["content-type"] == "application/json"
+        assert response.content == expected.content
+        EXPENSE_LIST.validate_json(response.content)
+    assert len(response.json()) == 0
+
+
+def array_of(name, title):
+    return {
+        "type": "array",
+        "items": {"$ref": f"#/components/schemas/{name}"},
+        "title": title,
+    }
+
+
+def responses(status_code, schema):
+    return {
+        status_code: {
+            "description": "Successful Response",
+            "content": {"application/json": {"schema": schema}},
+        },
+        "422": {
+            "description": "Validation Error",
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "$ref": "#/components/schemas/HTTPValidationError"
+                    }
+                }
+            },
+        },
+    }
+
+
+def test_openapi_schema_is_unchanged():
+    schema = main.app.openapi()
+    routes = schema["paths"]["/expenses/"]
+    # As generated before the routes returned a Response.
+    assert routes["get"]["responses"] == responses(
+        "200",
+        array_of("ExpenseResponse", "Response List Expenses Expenses  Get"),
+    )
+    assert routes["post"]["responses"] == responses(
+        "201", {"$ref": "#/components/schemas/ExpenseResponse"}
+    )
+    expected = reference_app(ExpenseStore()).openapi()["components"]
+    for name in (ExpenseResponse.__name__, Category.__name__):
+        assert schema["components"]["schemas"][name] == (
+            expected["schemas"][name]
+        )
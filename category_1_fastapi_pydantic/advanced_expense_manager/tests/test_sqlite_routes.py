@@ -0,0 +1,49 @@
+"""With EXPENSE_STORE=sqlite, a write waiting for another worker's lock
+does not stop the app from serving other requests."""
+
+import sqlite3
+
+import anyio
+import httpx
+
+import main
+from sqlite_store import SQLiteExpenseStore
+
+
+def test_write_waiting_on_lock_does_not_block_reads(tmp_path, monkeypatch):
+    path = str(tmp_path / "expenses.db")
+    monkeypatch.setattr(main, "EXPENSE_STORE", "sqlite")
+    monkeypatch.setattr(
+        main, "expenses_db", SQLiteExpenseStore(path, busy_timeout_ms=5000)
+    )
+    # Another worker holding the write lock.
+    other_worker = sqlite3.connect(path, isolation_level=None)
+    other_worker.execute("BEGIN IMMEDIATE")
+    rows = [
+        {"title": "bus", "amount": 2.5, "category": {"id": 2, "name": name}}
+        for name in ("Transport", "Food")
+    ]
+    responses = {}
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+
+            async def import_rows():
+                responses["bulk"] = await client.post(
+                    "/expenses/bulk", json=rows
+                )
+
+            async with anyio.create_task_group() as group:
+                group.start_soon(import_rows)
+                await anyio.sleep(0.2)
+                responses["summary"] = await client.get("/summary/")
+                assert "bulk" not in responses
+                other_worker.execute("COMMIT")
+
+    anyio.run(scenario)
+    other_worker.close()
+    assert responses["summary"].json()["count"] == 0
+    assert responses["bulk"].json()["created"] == 2
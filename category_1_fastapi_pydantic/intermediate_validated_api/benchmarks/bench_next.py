@@ -0,0 +1,84 @@
+"""Latency of the top-K "next tasks" query against sorting the whole store.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_next
+    python -m benchmarks.bench_next --sizes 10000 100000 --k 20
+
+Each store is churned with priority and status updates first, so the heaps
+carry stale entries as they would in a running app. ``top`` should stay
+flat as the store grows while the full sort grows with it.
+"""
+
+import argparse
+import random
+import time
+
+from schemas import TaskStatus
+from store import PRIORITIES, TaskStore
+
+STATUSES = list(TaskStatus)
+
+
+def build(size: int) -> TaskStore:
+    rng = random.Random(size)
+    store = TaskStore()
+    for i in range(size):
+        store.add(
+            {
+                "title": f"task {i}",
+                "priority": rng.choice(PRIORITIES),
+                "description": None,
+                "status": rng.choice(STATUSES),
+            }
+        )
+    for _ in range(size // 2):
+        store.update(
+            rng.randrange(1, size + 1),
+            {
+                "priority": rng.choice(PRIORITIES),
+                "status": rng.choice(STATUSES),
+            },
+        )
+    return store
+
+
+def full_sort(store: TaskStore, k: int, status: TaskStatus) -> list:
+    return sorted(
+        store.filter(status=status),
+        key=lambda task: (-task.priority, task.task_id),
+    )[:k]
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--k", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'store size':>12} | {'top':>10} | {'full sort':>10}   (ms/query)")
+    for size in args.sizes:
+        store = build(size)
+        assert store.top(args.k, TaskStatus.pending) == full_sort(
+            store, args.k, TaskStatus.pending
+        )
+        timings = []
+        for query in (
+            store.top,
+            lambda k, status: full_sort(store, k, status),
+        ):
+            start = time.perf_counter()
+            for _ in range(args.queries):
+                query(args.k, TaskStatus.pending)
+            timings.append((time.perf_counter() - start) / args.queries)
+        print(
+            f"{size:>12,} | "
+            + " | ".join(f"{seconds * 1e3:>10.3f}" for seconds in timings)
+        )
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,80 @@
+"""Search latency as the store grows, for rare, common and prefix terms.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_search
+    python -m benchmarks.bench_search --sizes 10000 100000 --queries 200
+
+Every store holds the same 50 tasks mentioning "kubernetes" plus filler
+tasks, so the rare query's posting list stays fixed while the store grows;
+its latency should stay flat. The common and prefix queries match a fixed
+share of the store and grow with their posting lists.
+"""
+
+import argparse
+import random
+import time
+
+from schemas import TaskStatus
+from store import TaskStore
+
+WORDS = [
+    "alpha", "billing", "cache", "deploy", "deployment", "docs", "export",
+    "fix", "invoice", "login", "metrics", "queue", "release", "report",
+    "review", "search", "service", "signup", "upgrade", "worker",
+]  # fmt: skip
+QUERIES = {
+    "rare": "kubernetes",
+    "common": "deploy review",
+    "prefix": "deploy* rev*",
+}
+
+
+def build(size: int) -> TaskStore:
+    rng = random.Random(size)
+    store = TaskStore()
+    for i in range(size):
+        words = rng.sample(WORDS, 6)
+        if i % (size // 50) == 0:
+            words.append("kubernetes")
+        store.add(
+            {
+                "title": " ".join(words[:3]),
+                "priority": 2 + i % 4,
+                "description": " ".join(words[3:]) + " task description",
+                "status": TaskStatus.pending,
+            }
+        )
+    return store
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'store size':>12} | "
+        + " | ".join(f"{name:>10}" for name in QUERIES)
+        + "   (ms/query)"
+    )
+    for size in args.sizes:
+        store = build(size)
+        timings = []
+        for query in QUERIES.values():
+            start = time.perf_counter()
+            for _ in range(args.queries):
+                store.search(query, args.limit)
+            timings.append((time.perf_counter() - start) / args.queries)
+        print(
+            f"{size:>12,} | "
+            + " | ".join(f"{seconds * 1e3:>10.3f}" for seconds in timings)
+        )
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,103 @@
+"""Per-row cost of serializing task responses, before and after the fast path.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_serialize
+    python -m benchmarks.bench_serialize --rows 100 1000 --repeat 200
+
+"before" reproduces the old handlers: build a ``TaskResponse`` for every
+row, then validate and dump the result against ``response_model``
+as FastAPI does. "after" dumps the stored records once through the cached
+``TypeAdapter`` in ``serializers.py``.
+"""
+
+import argparse
+import time
+from typing import Callable
+
+from pydantic import TypeAdapter
+
+from schemas import TaskPage, TaskResponse, TaskStatus
+from serializers import TASK, TASK_PAGE
+from store import Task
+
+PAGE_EXCLUDE = {"items": {"__all__": {"description"}}}
+PAGE_MODEL = TypeAdapter(TaskPage)
+TASK_MODEL = TypeAdapter(TaskResponse)
+
+
+def make_records(count: int) -> list:
+    return [
+        Task(
+            title=f"task {i}",
+            priority=2 + i % 4,
+            description="benchmark description",
+            status=TaskStatus.pending,
+            task_id=i + 1,
+        )
+        for i in range(count)
+    ]
+
+
+def page_before(records: list) -> bytes:
+    page = TaskPage(
+        items=[
+            TaskResponse.model_validate(item, from_attributes=True)
+            for item in records
+        ],
+        next_cursor=None,
+    )
+    return PAGE_MODEL.dump_json(
+        PAGE_MODEL.validate_python(page), exclude=PAGE_EXCLUDE
+    )
+
+
+def page_after(records: list) -> bytes:
+    return TASK_PAGE.dump_json(
+        {"items": records, "next_cursor": None}, exclude=PAGE_EXCLUDE
+    )
+
+
+def task_before(record: Task) -> bytes:
+    return TASK_MODEL.dump_json(
+        TASK_MODEL.validate_python(
+            TaskResponse.model_validate(record, from_attributes=True)
+        ),
+        exclude={"description"},
+    )
+
+
+def task_after(record: Task) -> bytes:
+    return TASK.dump_json(record, exclude={"description"})
+
+
+def per_row_us(run: Callable[[], bytes], rows: int, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        run()
+    return (time.perf_counter() - start) / repeat / rows * 1e6
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1_000])
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    record = make_records(1)[0]
+    assert task_before(record) == task_after(record)
+    print(f"{'response':>16} | {'before':>8} | {'after':>8}   (us/row)")
+    before = per_row_us(lambda: task_before(record), 1, args.repeat * 100)
+    after = per_row_us(lambda: task_after(record), 1, args.repeat * 100)
+    print(f"{'GET /tasks/{id}':>16} | {before:>8.2f} | {after:>8.2f}")
+    for rows in args.rows:
+        records = make_records(rows)
+        assert page_before(records) == page_after(records)
+        before = per_row_us(lambda: page_before(records), rows, args.repeat)
+        after = per_row_us(lambda: page_after(records), rows, args.repeat)
+        label = f"page of {rows}"
+        print(f"{label:>16} | {before:>8.2f} | {after:>8.2f}")
+
+
+if __name__ == "__main__":
+    main_cli()
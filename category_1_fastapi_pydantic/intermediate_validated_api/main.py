@@ -1,63 +1,214 @@
-from fastapi import FastAPI, status, Body, Query, HTTPException, Response
-from typing import Annotated, Optional, List
-from schemas import TaskCreate, TaskResponse, TaskStatus, TaskUpdate
+from fastapi import (
+    FastAPI,
+    status,
+    Body,
+    Depends,
+    Header,
+    Query,
+    HTTPException,
+    Response,
+)
+from fastapi.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from typing import Annotated, Callable, List, Optional, TypeVar
+import os
+from schemas import TaskCreate, TaskPage, TaskResponse, TaskStatus, TaskUpdate
+from store import TaskStore, VersionMismatch, decode_task, encode_task
+from serializers import TASK, TASK_LIST, TASK_PAGE, json_response
+from etags import (
+    etag,
+    if_match_version,
+    not_modified,
+    not_modified_response,
+    precondition_failed,
+)
+from journal import Journal, JournaledStore
+from sqlite_store import SQLiteTaskStore
+from pagination import (
+    DEFAULT_PAGE_SIZE,
+    PageSize,
+    cursor_param,
+    encode_cursor,
+)
+
+# "memory" keeps tasks in this process only; "sqlite" shares them between
+# uvicorn workers through the SQLite file at TASK_DB_PATH.
+TASK_STORE = os.getenv("TASK_STORE", "memory")
+# Directory for the write log and snapshots of the "memory" store; unset
+# means tasks are lost on restart.
+TASK_JOURNAL_DIR = os.getenv("TASK_JOURNAL_DIR")
+
+journal = None
+if TASK_STORE == "sqlite":
+    tasks_db = SQLiteTaskStore(os.getenv("TASK_DB_PATH", "tasks.db"))
+else:
+    tasks_db = TaskStore()
+    if TASK_JOURNAL_DIR:
+        journal = Journal(
+            TASK_JOURNAL_DIR,
+            key="task_id",
+            encode=encode_task,
+            decode=decode_task,
+            fsync=os.getenv("TASK_JOURNAL_FSYNC", "group"),
+            snapshot_interval=float(os.getenv("TASK_SNAPSHOT_INTERVAL", "60")),
+        )
+        tasks_db = JournaledStore(tasks_db, journal)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if journal is None:
+        yield
+        return
+    async with journal.attach(tasks_db.store):
+        yield
+
+
+async def commit():
+    """Wait until the writes made so far are durable, if journaling."""
+    if journal is not None:
+        await journal.commit()
+
+
+T = TypeVar("T")
 
-app = FastAPI()
 
+async def run_store(method: Callable[..., T], *args, **kwargs) -> T:
+    """Call a store method without blocking the event loop on SQLite.
 
-tasks_db = []
+    A SQLite call can wait up to ``busy_timeout`` for another worker's
+    write lock, so it runs in the threadpool and only holds up its own
+    request. The in-memory stores answer in microseconds and are not
+    thread-safe, so they are called inline.
+    """
+    if TASK_STORE == "sqlite":
+        return await run_in_threadpool(method, *args, **kwargs)
+    return method(*args, **kwargs)
 
 
-def generate_unique_task_id(db: list) -> int:
-    if not db:
-        return 1
-    return max(db, key=lambda x: x["task_id"])["task_id"] + 1
+app = FastAPI(lifespan=lifespan)
 
 
 @app.get(
     "/tasks/",
     status_code=status.HTTP_200_OK,
-    response_model=List[TaskResponse],
-    response_model_exclude={
-        "description",
-    },
+    response_model=TaskPage,
 )
 async def list_tasks(
+    after: Annotated[int, Depends(cursor_param)],
     status: Annotated[Optional[TaskStatus], Query] = None,
     priority: Annotated[
         Optional[int],
         Query(ge=1, le=5, description="This is priority for task."),
     ] = None,
+    limit: PageSize = DEFAULT_PAGE_SIZE,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    # The collection ETag changes on any write, so one tag covers every
+    # page and filter of the listing.
+    tag = etag(await run_store(tasks_db.version))
+    if not_modified(if_none_match, tag):
+        return not_modified_response(tag)
+    items, last_id = await run_store(
+        tasks_db.page,
+        after=after,
+        limit=limit,
+        status=status,
+        priority=priority,
+    )
+    return json_response(
+        TASK_PAGE,
+        {
+            "items": items,
+            "next_cursor": (
+                encode_cursor(last_id) if last_id is not None else None
+            ),
+        },
+        exclude={"items": {"__all__": {"description"}}},
+        headers={"ETag": tag},
+    )
+
+
+@app.get(
+    "/tasks/search",
+    response_model=List[TaskResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def search_tasks(
+    q: Annotated[
+        str,
+        Query(
+            min_length=1,
+            max_length=200,
+            description="Words to find in title or description; "
+            "end a word with * to match it as a prefix.",
+        ),
+    ],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    tag = etag(await run_store(tasks_db.version))
+    if not_modified(if_none_match, tag):
+        return not_modified_response(tag)
+    return json_response(
+        TASK_LIST,
+        await run_store(tasks_db.search, q, limit),
+        headers={"ETag": tag},
+    )
+
+
+@app.get(
+    "/tasks/next",
+    response_model=List[TaskResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def next_tasks(
+    k: Annotated[
+        int,
+        Query(
+            ge=1,
+            le=100,
+            description="Number of tasks to return, highest priority "
+            "first and oldest first among equal priorities.",
+        ),
+    ] = 20,
+    status: Annotated[Optional[TaskStatus], Query()] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
-    status_db = []
-    priority_db = []
-    if status:
-        status_db = [item for item in tasks_db if item["status"] == status]
-    if priority:
-        priority_db = [
-            item for item in tasks_db if item["priority"] == priority
-        ]
-    if (not priority) and (not status):
-        return [TaskResponse(**item) for item in tasks_db]
-    return status_db + priority_db
+    tag = etag(await run_store(tasks_db.version))
+    if not_modified(if_none_match, tag):
+        return not_modified_response(tag)
+    return json_response(
+        TASK_LIST,
+        await run_store(tasks_db.top, k, status),
+        headers={"ETag": tag},
+    )
 
 
 @app.get(
     "/tasks/{task_id}",
     response_model=TaskResponse,
-    response_model_exclude=["description"],  # type: ignore
     status_code=status.HTTP_200_OK,
 )
-async def get_task(task_id: int):
+async def get_task(
+    task_id: int,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
     if task_id <= 0:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Task ID must be positive integer",
         )
 
-    for task in tasks_db:
-        if task["task_id"] == task_id:
-            return TaskResponse(**task)
+    version = await run_store(tasks_db.record_version, task_id)
+    if version is not None:
+        tag = etag(version)
+        if not_modified(if_none_match, tag):
+            return not_modified_response(tag)
+        task = await run_store(tasks_db.get, task_id)
+        return json_response(
+            TASK, task, exclude={"description"}, headers={"ETag": tag}
+        )
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND, detail="Item not found !"
     )
@@ -67,41 +218,51 @@ async def get_task(task_id: int):
     "/tasks/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED
 )
 async def add_task(task: Annotated[TaskCreate, Body()]):
-    task_id = generate_unique_task_id(tasks_db)
-    new_task = {
-        "task_id": task_id,
-        "title": task.title,
-        "priority": task.priority,
-        "description": task.description,
-        "status": task.status,
-    }
-    tasks_db.append(new_task)
-    return new_task
-
-
-@app.patch(
-    "/tasks/{task_id}",
-    response_model=TaskResponse,
-    response_model_exclude_unset=True,
-    # response_model_exclude_none=True,
-)
-async def update_task(task_id: int, task: Annotated[TaskUpdate, Body()]):
+    # The tag comes from the write itself: read separately, it could be
+    # the version of another worker's later write.
+    new_task, version = await run_store(
+        tasks_db.add_with_version,
+        {
+            "title": task.title,
+            "priority": task.priority,
+            "description": task.description,
+            "status": task.status,
+        },
+    )
+    await commit()
+    tag = etag(version)
+    return json_response(
+        TASK, new_task, status.HTTP_201_CREATED, headers={"ETag": tag}
+    )
+
+
+@app.patch("/tasks/{task_id}", response_model=TaskResponse)
+async def update_task(
+    task_id: int,
+    task: Annotated[TaskUpdate, Body()],
+    if_match: Annotated[Optional[str], Header()] = None,
+):
     if task_id <= 0:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Task must be positive integer",
         )
-    for item in tasks_db:
-        if item["task_id"] == task_id:
-            if task.title is not None:
-                item["title"] = task.title
-            if task.priority is not None:
-                item["priority"] = task.priority
-            if task.description is not None:
-                item["description"] = task.description
-            if task.status is not None:
-                item["status"] = task.status
-            return TaskResponse(**item)
+    try:
+        expected_version = await run_store(
+            if_match_version, if_match, tasks_db, task_id
+        )
+        item, version = await run_store(
+            tasks_db.update_with_version,
+            task_id,
+            task.model_dump(exclude_none=True),
+            expected_version=expected_version,
+        )
+    except VersionMismatch:
+        raise precondition_failed()
+    if item is not None:
+        await commit()
+        tag = etag(version)
+        return json_response(TASK, item, headers={"ETag": tag})
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail=f"Task with id {task_id} not found !",
@@ -109,16 +270,29 @@ async def update_task(task_id: int, task: Annotated[TaskUpdate, Body()]):
 
 
 @app.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_task(task_id: int):
+async def delete_task(
+    task_id: int,
+    if_match: Annotated[Optional[str], Header()] = None,
+):
     if task_id <= 0:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Task must be positive integer",
         )
-    for item in tasks_db:
-        if item["task_id"] == task_id:
-            tasks_db.remove(item)
-            return Response(status_code=status.HTTP_204_NO_CONTENT)
+    try:
+        expected_version = await run_store(
+            if_match_version, if_match, tasks_db, task_id
+        )
+        deleted = await run_store(
+            tasks_db.delete,
+            task_id,
+            expected_version=expected_version,
+        )
+    except VersionMismatch:
+        raise precondition_failed()
+    if deleted:
+        await commit()
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail=f"Task with id {task_id} not found !",
@@ -0,0 +1,85 @@
+import heapq
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+
+from schemas import TaskStatus
+
+# Heap entries are (-priority, task_id, sequence): highest priority first,
+# then oldest task. The sequence tells the live entry of a task from the
+# stale ones its earlier writes left behind.
+Entry = Tuple[int, int, int]
+
+
+class PriorityQueue:
+    """Heaps of task ids ordered by priority, one per status.
+
+    Writes push a new entry and leave the old one in place, so they cost
+    O(log N). ``top`` walks a heap as a tree from its root, only expanding
+    the children of entries it has popped, so the K most urgent tasks cost
+    O(K log K) however many tasks are queued. Stale entries are skipped on
+    the way and dropped by rebuilding the heaps once they outnumber the
+    live ones.
+    """
+
+    def __init__(self):
+        self._heaps: Dict[TaskStatus, List[Entry]] = {
+            task_status: [] for task_status in TaskStatus
+        }
+        self._live: Dict[int, int] = {}
+        self._sequence = count()
+        self._stale = 0
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def push(self, task_id: int, priority: int, status: TaskStatus) -> None:
+        if task_id in self._live:
+            self._stale += 1
+        sequence = next(self._sequence)
+        self._live[task_id] = sequence
+        heapq.heappush(self._heaps[status], (-priority, task_id, sequence))
+        self._compact()
+
+    def remove(self, task_id: int) -> None:
+        if self._live.pop(task_id, None) is not None:
+            self._stale += 1
+            self._compact()
+
+    def clear(self) -> None:
+        for heap in self._heaps.values():
+            heap.clear()
+        self._live.clear()
+        self._stale = 0
+
+    def top(self, k: int, status: Optional[TaskStatus] = None) -> List[int]:
+        """Return the ids of up to ``k`` tasks with the highest priority,
+        oldest first among equals, optionally only those with ``status``."""
+        if status is not None:
+            heaps = [self._heaps[status]]
+        else:
+            heaps = list(self._heaps.values())
+        # Frontier of (entry, heap, position): the smallest entry not yet
+        # returned is always in it, since a node only enters once its
+        # parent has been popped.
+        frontier = [(heap[0], h, 0) for h, heap in enumerate(heaps) if heap]
+        heapq.heapify(frontier)
+        task_ids = []
+        while frontier and len(task_ids) < k:
+            (_, task_id, sequence), h, position = heapq.heappop(frontier)
+            if self._live.get(task_id) == sequence:
+                task_ids.append(task_id)
+            heap = heaps[h]
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], h, child))
+        return task_ids
+
+    def _compact(self) -> None:
+        if self._stale <= max(len(self._live), 1024):
+            return
+        for heap in self._heaps.values():
+            heap[:] = [
+                entry for entry in heap if self._live.get(entry[1]) == entry[2]
+            ]
+            heapq.heapify(heap)
+        self._stale = 0
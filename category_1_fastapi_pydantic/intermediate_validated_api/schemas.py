@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 
 
@@ -52,3 +52,10 @@ class TaskUpdate(TasksBase):
 
 class TaskResponse(TasksBase):
     task_id: int
+
+
+class TaskPage(BaseModel):
+    items: List[TaskResponse]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as ?cursor= to fetch the next page"
+    )
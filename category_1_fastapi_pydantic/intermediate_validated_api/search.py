@@ -0,0 +1,128 @@
+import heapq
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+TOKEN = re.compile(r"\w+")
+# A match in the title counts this many times more than one in the
+# description.
+TITLE_WEIGHT = 2
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN.findall(text.lower()) if text else []
+
+
+def parse_query(query: str) -> List[Tuple[str, bool]]:
+    """Split a query into ``(token, is_prefix)`` terms.
+
+    Every term is required. A term ending in ``*`` matches any token that
+    starts with it, e.g. ``deploy* api`` matches "deployment of the API".
+    """
+    terms = []
+    for word in query.split():
+        tokens = tokenize(word)
+        terms.extend((token, False) for token in tokens)
+        if tokens and word.endswith("*"):
+            terms[-1] = (tokens[-1], True)
+    return terms
+
+
+class SearchIndex:
+    """In-memory inverted index over task titles and descriptions.
+
+    Each token maps to a posting list of ``{task_id: weight}``, where the
+    weight counts the token's occurrences with title hits weighted by
+    ``TITLE_WEIGHT``. A sorted vocabulary (a ``SortedList``, so a new or
+    vanished token costs O(log N)) answers prefix terms with a binary
+    search. Queries only touch the posting lists of their terms, so
+    their cost follows the size of those lists rather than the store.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._documents: Dict[int, Dict[str, int]] = {}
+        self._vocabulary = SortedList()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(
+        self, task_id: int, title: str, description: Optional[str]
+    ) -> None:
+        weights: Dict[str, int] = {}
+        for token in tokenize(title):
+            weights[token] = weights.get(token, 0) + TITLE_WEIGHT
+        for token in tokenize(description):
+            weights[token] = weights.get(token, 0) + 1
+        if not weights:
+            return
+        self._documents[task_id] = weights
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                self._vocabulary.add(token)
+            postings[task_id] = weight
+
+    def remove(self, task_id: int) -> None:
+        for token in self._documents.pop(task_id, ()):
+            postings = self._postings[token]
+            del postings[task_id]
+            if not postings:
+                del self._postings[token]
+                self._vocabulary.remove(token)
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._documents.clear()
+        self._vocabulary.clear()
+
+    def search(self, query: str, limit: int = 20) -> List[int]:
+        """Return up to ``limit`` ids of tasks matching every query term,
+        best first.
+
+        Scores are TF-IDF: each matched token adds its weight in the task
+        times ``log(1 + N / df)``. Ties go to the lower ``task_id``.
+        """
+        terms = []
+        for token, prefix in parse_query(query):
+            matches = self._expand(token) if prefix else [token]
+            lists = [self._postings[m] for m in matches if m in self._postings]
+            if not lists:
+                return []
+            terms.append(lists)
+        if not terms:
+            return []
+        # Start from the rarest term and narrow with C-level set
+        # intersections, so only tasks matching every term get scored.
+        terms.sort(key=lambda lists: sum(map(len, lists)))
+        candidates = _ids(terms[0])
+        for lists in terms[1:]:
+            candidates = _ids(lists) & candidates
+        documents = len(self._documents)
+        weighted = [
+            (postings, math.log(1 + documents / len(postings)))
+            for lists in terms
+            for postings in lists
+        ]
+        scores = {
+            task_id: sum(
+                postings.get(task_id, 0) * idf for postings, idf in weighted
+            )
+            for task_id in candidates
+        }
+        return heapq.nsmallest(
+            limit, scores, key=lambda task_id: (-scores[task_id], task_id)
+        )
+
+    def _expand(self, prefix: str) -> List[str]:
+        return list(self._vocabulary.irange(prefix, prefix + chr(0x10FFFF)))
+
+
+def _ids(lists: List[Dict[int, int]]):
+    if len(lists) == 1:
+        return lists[0].keys()
+    return set().union(*lists)
@@ -0,0 +1,360 @@
+import secrets
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from sortedcontainers import SortedList
+
+from priority_queue import PriorityQueue
+from schemas import TaskStatus
+from search import SearchIndex
+
+PRIORITIES = range(1, 6)
+
+
+class VersionMismatch(Exception):
+    """A conditional write named a version the task no longer has."""
+
+
+@dataclass(slots=True)
+class Task:
+    """A stored task.
+
+    Declared with ``__slots__`` so a task carries no instance ``dict``.
+    The fields are in ``TaskResponse`` order, which keeps the JSON dumped
+    from a ``Task`` identical to the model's.
+    """
+
+    title: str
+    priority: int
+    description: Optional[str]
+    status: TaskStatus
+    task_id: int
+
+
+class IdIndex:
+    """Task ids for one status or priority.
+
+    A set answers membership; a ``SortedList`` keeps the same ids in
+    ascending order so a page can bisect straight to the first id after
+    its cursor. Both insert and remove in O(log N), so moving a task
+    between indexes stays cheap however many tasks are stored.
+    """
+
+    __slots__ = ("_members", "_order")
+
+    def __init__(self):
+        self._members: Set[int] = set()
+        self._order = SortedList()
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._order)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._members
+
+    def add(self, task_id: int) -> None:
+        if task_id not in self._members:
+            self._members.add(task_id)
+            self._order.add(task_id)
+
+    def discard(self, task_id: int) -> None:
+        if task_id in self._members:
+            self._members.remove(task_id)
+            self._order.remove(task_id)
+
+    def clear(self) -> None:
+        self._members.clear()
+        self._order.clear()
+
+    def after(self, task_id: int) -> Iterator[int]:
+        """Yield the ids greater than ``task_id``, in order."""
+        return self._order.irange(task_id, inclusive=(False, True))
+
+
+class TaskStore:
+    """In-memory task store keyed by ``task_id``.
+
+    Alongside the primary dict it maintains secondary indexes from
+    ``status`` and ``priority`` to the matching task ids (``IdIndex``), so
+    filtered listings cost about the size of the result rather than the
+    store, an
+    inverted index over ``title`` and ``description`` for ``search``, and
+    priority heaps for ``top``.
+    """
+
+    def __init__(self, start_id: int = 1):
+        self._tasks: Dict[int, Task] = {}
+        self._start_id = start_id
+        self._next_id = start_id
+        self._by_status: Dict[TaskStatus, IdIndex] = {
+            task_status: IdIndex() for task_status in TaskStatus
+        }
+        self._by_priority: Dict[int, IdIndex] = {
+            priority: IdIndex() for priority in PRIORITIES
+        }
+        self._search = SearchIndex()
+        self._queue = PriorityQueue()
+        # Versions come from one counter bumped on every write; the random
+        # epoch keeps versions handed out before a restart from matching.
+        self._epoch = secrets.token_hex(4)
+        self._version = 0
+        self._versions: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._tasks.values())
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._tasks
+
+    def next_id(self) -> int:
+        task_id = self._next_id
+        self._next_id += 1
+        return task_id
+
+    def version(self) -> str:
+        """Token that changes whenever any task is written."""
+        return f"{self._epoch}.{self._version}"
+
+    def record_version(self, task_id: int) -> Optional[str]:
+        version = self._versions.get(task_id)
+        if version is None:
+            return None
+        return f"{self._epoch}.{version}"
+
+    def all(self) -> list:
+        return list(self._tasks.values())
+
+    def get(self, task_id: int) -> Optional[Task]:
+        return self._tasks.get(task_id)
+
+    def scan(self) -> Iterator[Task]:
+        """Yield tasks in id order without holding a copy of the store.
+
+        Walks the id range allocated so far, so it is safe to resume
+        between writes: deleted ids are skipped and later inserts are left
+        out of the scan.
+        """
+        for task_id in range(self._start_id, self._next_id):
+            task = self._tasks.get(task_id)
+            if task is not None:
+                yield task
+
+    def filter(
+        self,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[int] = None,
+    ) -> list:
+        task_ids = self._matching(status, priority)
+        if task_ids is None:
+            return self.all()
+        return [self._tasks[task_id] for task_id in task_ids]
+
+    def search(self, query: str, limit: int = 20) -> list:
+        """Return tasks matching every term of ``query``, best first."""
+        return [
+            self._tasks[task_id]
+            for task_id in self._search.search(query, limit)
+        ]
+
+    def top(self, k: int, status: Optional[TaskStatus] = None) -> list:
+        """Return up to ``k`` tasks with the highest priority, oldest first
+        among equals, optionally only those with ``status``."""
+        return [self._tasks[task_id] for task_id in self._queue.top(k, status)]
+
+    def page(
+        self,
+        after: int = 0,
+        limit: int = 100,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[int] = None,
+    ) -> Tuple[List[Task], Optional[int]]:
+        """Return up to ``limit`` tasks with ``task_id > after``.
+
+        Unfiltered pages walk the id range from ``after``; filtered pages
+        bisect to ``after`` in the sorted indexes and read on from there.
+        Either way a page stops after ``limit + 1`` matches and never
+        scans the store from the start. The second value is the id to
+        continue after, or None on the last page.
+        """
+        task_ids = self._matching(status, priority, after)
+        if task_ids is None:
+            task_ids = (
+                task_id
+                for task_id in range(
+                    max(after + 1, self._start_id), self._next_id
+                )
+                if task_id in self._tasks
+            )
+        page_ids = list(islice(task_ids, limit + 1))
+        items = [self._tasks[task_id] for task_id in page_ids[:limit]]
+        if len(page_ids) > limit:
+            return items, items[-1].task_id
+        return items, None
+
+    def add(self, data: dict) -> Task:
+        task = Task(**data, task_id=self.next_id())
+        self._tasks[task.task_id] = task
+        self._index(task)
+        self._bump(task.task_id)
+        return task
+
+    def update(
+        self, task_id: int, data: dict, expected_version: Optional[str] = None
+    ) -> Optional[Task]:
+        """Update a task; with ``expected_version``, only if the task is
+        still at that version, else raise ``VersionMismatch``."""
+        task = self._tasks.get(task_id)
+        if task is None:
+            return None
+        self._check_version(task_id, expected_version)
+        status, priority = task.status, task.priority
+        text = task.title, task.description
+        for name, value in data.items():
+            setattr(task, name, value)
+        # Only the indexes over fields that changed are touched, so a
+        # title-only PATCH leaves the status and priority indexes alone.
+        if task.status != status:
+            self._by_status[status].discard(task_id)
+            self._by_status[task.status].add(task_id)
+        if task.priority != priority:
+            self._by_priority[priority].discard(task_id)
+            self._by_priority[task.priority].add(task_id)
+        if (task.title, task.description) != text:
+            self._search.remove(task_id)
+            self._search.add(task_id, task.title, task.description)
+        if task.status != status or task.priority != priority:
+            self._queue.push(task_id, task.priority, task.status)
+        self._bump(task_id)
+        return task
+
+    def add_with_version(self, data: dict) -> Tuple[Task, str]:
+        """``add``, also returning the version the write gave the task."""
+        task = self.add(data)
+        return task, self.record_version(task.task_id)
+
+    def update_with_version(
+        self, task_id: int, data: dict, expected_version: Optional[str] = None
+    ) -> Tuple[Optional[Task], Optional[str]]:
+        """``update``, also returning the version the write gave the task
+        (None if there is no such task)."""
+        task = self.update(task_id, data, expected_version=expected_version)
+        if task is None:
+            return None, None
+        return task, self.record_version(task_id)
+
+    def delete(
+        self, task_id: int, expected_version: Optional[str] = None
+    ) -> bool:
+        task = self._tasks.get(task_id)
+        if task is None:
+            return False
+        self._check_version(task_id, expected_version)
+        del self._tasks[task_id]
+        del self._versions[task_id]
+        self._version += 1
+        self._unindex(task)
+        return True
+
+    def clear(self) -> None:
+        self._tasks.clear()
+        for task_ids in self._by_status.values():
+            task_ids.clear()
+        for task_ids in self._by_priority.values():
+            task_ids.clear()
+        self._search.clear()
+        self._queue.clear()
+        self._versions.clear()
+        self._version += 1
+
+    def load(self, tasks: List[Task], next_id: int) -> None:
+        """Replace the contents with ``tasks``, given in id order."""
+        self.clear()
+        for task in tasks:
+            self._tasks[task.task_id] = task
+            self._index(task)
+        self._next_id = max(self._next_id, next_id)
+        self._version += 1
+        self._versions = dict.fromkeys(self._tasks, self._version)
+
+    def _bump(self, task_id: int) -> None:
+        self._version += 1
+        self._versions[task_id] = self._version
+
+    def _check_version(
+        self, task_id: int, expected_version: Optional[str]
+    ) -> None:
+        if (
+            expected_version is not None
+            and expected_version != self.record_version(task_id)
+        ):
+            raise VersionMismatch(task_id)
+
+    def _matching(
+        self,
+        status: Optional[TaskStatus],
+        priority: Optional[int],
+        after: int = 0,
+    ) -> Optional[Iterator[int]]:
+        """Ids above ``after`` matching the filters, in order, or None
+        when there are no filters.
+
+        Never copies an index: one filter reads its index from ``after``
+        on; two filters walk the smaller index from ``after`` and look
+        each id up in the larger one.
+        """
+        candidates: List[IdIndex] = []
+        if status is not None:
+            candidates.append(self._by_status[status])
+        if priority is not None:
+            candidates.append(self._by_priority.get(priority, IdIndex()))
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0].after(after)
+        smaller, larger = sorted(candidates, key=len)
+        return (
+            task_id for task_id in smaller.after(after) if task_id in larger
+        )
+
+    def _index(self, task: Task) -> None:
+        self._by_status[task.status].add(task.task_id)
+        self._by_priority[task.priority].add(task.task_id)
+        self._search.add(task.task_id, task.title, task.description)
+        self._queue.push(task.task_id, task.priority, task.status)
+
+    def _unindex(self, task: Task) -> None:
+        self._by_status[task.status].discard(task.task_id)
+        self._by_priority[task.priority].discard(task.task_id)
+        self._search.remove(task.task_id)
+        self._queue.remove(task.task_id)
+
+
+# Plain lookup: calling TaskStatus(value) per record dominates recovery.
+STATUSES = {task_status.value: task_status for task_status in TaskStatus}
+
+
+def encode_task(task: Task) -> dict:
+    return {
+        "title": task.title,
+        "priority": task.priority,
+        "description": task.description,
+        "status": task.status.value,
+        "task_id": task.task_id,
+    }
+
+
+def decode_task(record: dict) -> Task:
+    return Task(
+        record["title"],
+        record["priority"],
+        record["description"],
+        STATUSES[record["status"]],
+        record["task_id"],
+    )
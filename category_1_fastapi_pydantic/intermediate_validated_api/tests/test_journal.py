@@ -0,0 +1,69 @@
+"""Restarting from the write log and a snapshot rebuilds the tasks and
+every index over them. journal.py itself is covered by the
+simple_task_manager suite; this checks the task codec and the indexes."""
+
+import asyncio
+
+from journal import Journal, JournaledStore
+from schemas import TaskStatus
+from store import TaskStore, decode_task, encode_task
+
+
+def run(directory, writes):
+    journal = Journal(
+        str(directory),
+        key="task_id",
+        encode=encode_task,
+        decode=decode_task,
+        snapshot_interval=3600,
+    )
+    store = TaskStore()
+
+    async def session():
+        async with journal.attach(store):
+            await writes(JournaledStore(store, journal), journal)
+
+    asyncio.run(session())
+    return store
+
+
+async def no_writes(store, journal):
+    pass
+
+
+def task(title, priority, status=TaskStatus.pending):
+    return {
+        "title": title,
+        "priority": priority,
+        "description": f"{title} description",
+        "status": status,
+    }
+
+
+def views(store):
+    return [
+        [item.task_id for item in view]
+        for view in (
+            store.scan(),
+            store.filter(TaskStatus.pending),
+            store.filter(priority=5),
+            store.search("deploy*"),
+            store.top(10, TaskStatus.pending),
+        )
+    ]
+
+
+def test_indexes_rebuilt_from_snapshot_and_log(tmp_path):
+    async def writes(store, journal):
+        store.add(task("deploy api", 3))
+        store.add(task("write docs", 5))
+        store.add(task("deploy web", 4))
+        await journal.snapshot(store)
+        store.update(2, {"status": TaskStatus.completed, "priority": 2})
+        store.delete(3)
+        store.add(task("deployment plan", 5))
+        await journal.commit()
+
+    written = views(run(tmp_path, writes))
+    assert written == [[1, 2, 4], [1, 4], [4], [1, 4], [4, 1]]
+    assert views(run(tmp_path, no_writes)) == written
@@ -0,0 +1,118 @@
+"""GET /tasks/next returns the same tasks as sorting every task by
+priority and age, after any mix of writes."""
+
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from priority_queue import PriorityQueue
+from schemas import TaskStatus
+from store import TaskStore
+
+STATUSES = [None, *TaskStatus]
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = TaskStore()
+    monkeypatch.setattr(main, "tasks_db", store)
+    return store
+
+
+def sorted_ids(store, k, status=None):
+    tasks = [
+        task
+        for task in store.scan()
+        if status is None or task.status == status
+    ]
+    tasks.sort(key=lambda task: (-task.priority, task.task_id))
+    return [task.task_id for task in tasks[:k]]
+
+
+def next_ids(client, k, status=None):
+    params = {"k": k}
+    if status is not None:
+        params["status"] = status.value
+    response = client.get("/tasks/next", params=params)
+    return [task["task_id"] for task in response.json()]
+
+
+def check(client, store):
+    for status in STATUSES:
+        for k in (1, 7, 100):
+            assert next_ids(client, k, status) == sorted_ids(
+                store, k, status
+            ), (k, status)
+
+
+def test_next_after_priority_status_changes_and_deletes(store):
+    rng = random.Random(0)
+    client = TestClient(main.app)
+    for i in range(40):
+        client.post(
+            "/tasks/",
+            json={
+                "title": f"task {i}",
+                "priority": rng.randint(2, 5),
+                "status": rng.choice(list(TaskStatus)).value,
+            },
+        )
+    check(client, store)
+
+    for task_id in rng.sample(range(1, 41), 15):
+        client.patch(f"/tasks/{task_id}", json={"priority": rng.randint(2, 5)})
+    for task_id in rng.sample(range(1, 41), 15):
+        status = rng.choice(list(TaskStatus)).value
+        client.patch(f"/tasks/{task_id}", json={"status": status})
+    check(client, store)
+
+    for task_id in rng.sample(range(1, 41), 20):
+        client.delete(f"/tasks/{task_id}")
+    check(client, store)
+
+
+def test_next_after_compaction(store):
+    rng = random.Random(1)
+    client = TestClient(main.app)
+    for i in range(200):
+        store.add(
+            {
+                "title": f"task {i}",
+                "priority": rng.randint(2, 5),
+                "description": None,
+                "status": TaskStatus.pending,
+            }
+        )
+    # Each update leaves a stale entry behind; past 1024 of them the
+    # heaps are rebuilt.
+    for _ in range(1500):
+        task_id = rng.randint(1, 200)
+        if task_id in store:
+            store.update(
+                task_id,
+                {
+                    "priority": rng.randint(2, 5),
+                    "status": rng.choice(list(TaskStatus)),
+                },
+            )
+        if rng.random() < 0.05:
+            store.delete(task_id)
+    queued = sum(len(heap) for heap in store._queue._heaps.values())
+    assert queued < len(store) + 1024
+    check(client, store)
+
+
+def test_queue_skips_stale_entries():
+    queue = PriorityQueue()
+    queue.push(1, 3, TaskStatus.pending)
+    queue.push(2, 5, TaskStatus.pending)
+    queue.push(3, 5, TaskStatus.completed)
+    queue.push(2, 2, TaskStatus.pending)
+    queue.remove(3)
+    assert queue.top(10) == [1, 2]
+    assert queue.top(10, TaskStatus.completed) == []
+    assert len(queue) == 2
+    queue.remove(3)
+    assert len(queue) == 2
@@ -0,0 +1,143 @@
+"""Search results follow every add, update and delete, and come back in
+TF-IDF order."""
+
+import math
+import random
+
+import pytest
+
+from schemas import TaskStatus
+from search import TITLE_WEIGHT, SearchIndex, parse_query, tokenize
+from store import TaskStore
+
+WORDS = ["deploy", "deployment", "api", "docs", "web", "fix", "release"]
+
+
+def task(title, description=None):
+    return {
+        "title": title,
+        "priority": 3,
+        "description": description,
+        "status": TaskStatus.pending,
+    }
+
+
+def ranked(store, query, limit=20):
+    """The expected result, scored from scratch over every stored task."""
+    weights = {}
+    for item in store.scan():
+        counts = {}
+        for token in tokenize(item.title):
+            counts[token] = counts.get(token, 0) + TITLE_WEIGHT
+        for token in tokenize(item.description):
+            counts[token] = counts.get(token, 0) + 1
+        if counts:
+            weights[item.task_id] = counts
+    scores = {}
+    for task_id, counts in weights.items():
+        score = 0.0
+        for token, prefix in parse_query(query):
+            matched = [
+                word
+                for word in counts
+                if word == token or prefix and word.startswith(token)
+            ]
+            if not matched:
+                break
+            for word in matched:
+                df = sum(word in other for other in weights.values())
+                score += counts[word] * math.log(1 + len(weights) / df)
+        else:
+            scores[task_id] = score
+    if not parse_query(query):
+        return []
+    order = sorted(scores, key=lambda task_id: (-scores[task_id], task_id))
+    return order[:limit]
+
+
+def found(store, query, limit=20):
+    return [item.task_id for item in store.search(query, limit)]
+
+
+QUERIES = ["deploy", "deploy*", "api web", "dep* api", "fix docs*", "nothing"]
+
+
+def test_search_follows_every_kind_of_write():
+    rng = random.Random(0)
+    store = TaskStore()
+
+    def sentence(size):
+        return " ".join(rng.choice(WORDS) for _ in range(size))
+
+    def check():
+        for query in QUERIES:
+            assert found(store, query) == ranked(store, query), query
+
+    for _ in range(60):
+        store.add(task(sentence(3), sentence(8)))
+    check()
+    for task_id in rng.sample(range(1, 61), 20):
+        store.update(task_id, {"title": sentence(2)})
+    for task_id in rng.sample(range(1, 61), 10):
+        store.update(task_id, {"description": sentence(5)})
+    check()
+    for task_id in rng.sample(range(1, 61), 25):
+        store.delete(task_id)
+    check()
+    store.clear()
+    assert all(found(store, query) == [] for query in QUERIES)
+
+
+def test_title_match_outranks_description_match():
+    store = TaskStore()
+    store.add(task("write docs", "then ship the release notes"))
+    store.add(task("release notes", "after writing the docs"))
+    assert found(store, "release") == [2, 1]
+    assert found(store, "docs") == [1, 2]
+
+
+def test_rarer_term_weighs_more():
+    store = TaskStore()
+    store.add(task("fix api", "fix fix fix"))
+    store.add(task("fix web", "web"))
+    store.add(task("fix docs", "fix"))
+    # "web" is in one task, "fix" in all three.
+    assert found(store, "fix web*")[0] == 2
+    assert found(store, "fix", limit=2) == [1, 3]
+
+
+def test_prefix_uses_the_current_vocabulary():
+    store = TaskStore()
+    store.add(task("deployment plan"))
+    store.add(task("deploy api"))
+    # Equal scores: the lower id first.
+    assert found(store, "deploy*") == [1, 2]
+    store.update(1, {"title": "rollout plan"})
+    assert found(store, "deploy*") == [2]
+    assert found(store, "deployment") == []
+    store.delete(2)
+    assert found(store, "dep*") == []
+    assert found(store, "roll*") == [1]
+
+
+@pytest.mark.parametrize(
+    "query,terms",
+    [
+        ("Deploy* API", [("deploy", True), ("api", False)]),
+        ("web-app*", [("web", False), ("app", True)]),
+        ("* !!", []),
+    ],
+)
+def test_parse_query(query, terms):
+    assert parse_query(query) == terms
+
+
+def test_index_drops_empty_postings():
+    index = SearchIndex()
+    index.add(1, "alpha beta", None)
+    index.add(2, "beta", "gamma")
+    index.remove(1)
+    index.remove(2)
+    assert len(index) == 0
+    assert index.search("beta") == []
+    assert index._vocabulary == []
@@ -0,0 +1,49 @@
+"""With TASK_STORE=sqlite, a write waiting for another worker's lock does
+not stop the app from serving other requests."""
+
+import sqlite3
+
+import anyio
+import httpx
+
+import main
+from sqlite_store import SQLiteTaskStore
+
+
+def test_write_waiting_on_lock_does_not_block_reads(tmp_path, monkeypatch):
+    path = str(tmp_path / "tasks.db")
+    monkeypatch.setattr(main, "TASK_STORE", "sqlite")
+    monkeypatch.setattr(
+        main, "tasks_db", SQLiteTaskStore(path, busy_timeout_ms=5000)
+    )
+    # Another worker holding the write lock.
+    other_worker = sqlite3.connect(path, isolation_level=None)
+    other_worker.execute("BEGIN IMMEDIATE")
+    task = {
+        "title": "write",
+        "priority": 3,
+        "description": None,
+        "status": "pending",
+    }
+    responses = {}
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+
+            async def create():
+                responses["create"] = await client.post("/tasks/", json=task)
+
+            async with anyio.create_task_group() as group:
+                group.start_soon(create)
+                await anyio.sleep(0.2)
+                responses["list"] = await client.get("/tasks/")
+                assert "create" not in responses
+                other_worker.execute("COMMIT")
+
+    anyio.run(scenario)
+    other_worker.close()
+    assert responses["list"].json()["items"] == []
+    assert responses["create"].status_code == 201
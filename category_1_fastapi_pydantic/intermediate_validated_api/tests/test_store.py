@@ -0,0 +1,134 @@
+"""Filtered listings and pages read the sorted status and priority indexes
+and agree with a plain scan of the store."""
+
+import random
+
+import pytest
+
+from schemas import TaskStatus
+from store import IdIndex, TaskStore
+
+
+def fill(store, count, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        store.add(
+            {
+                "title": f"task {i}",
+                "priority": rng.randint(2, 5),
+                "description": None,
+                "status": rng.choice(list(TaskStatus)),
+            }
+        )
+
+
+def scanned(store, status=None, priority=None):
+    return [
+        task
+        for task in store.scan()
+        if (status is None or task.status == status)
+        and (priority is None or task.priority == priority)
+    ]
+
+
+@pytest.mark.parametrize(
+    "status,priority",
+    [
+        (None, None),
+        (TaskStatus.pending, None),
+        (None, 3),
+        (TaskStatus.completed, 4),
+        (TaskStatus.in_progress, 1),
+    ],
+)
+def test_filter_matches_scan(status, priority):
+    store = TaskStore()
+    fill(store, 200)
+    for task_id in range(1, 200, 7):
+        store.delete(task_id)
+    for task_id in range(2, 200, 5):
+        store.update(task_id, {"status": TaskStatus.completed, "priority": 4})
+
+    assert store.filter(status, priority) == scanned(store, status, priority)
+
+
+def test_filters_leave_indexes_alone():
+    store = TaskStore()
+    fill(store, 50)
+    before = store.filter(TaskStatus.pending)
+    store.filter(TaskStatus.pending, 3)
+    store.page(status=TaskStatus.pending, priority=3)
+    assert store.filter(TaskStatus.pending) == before
+
+
+def pages(store, limit, **filters):
+    after, walked = 0, []
+    while True:
+        items, after = store.page(after=after, limit=limit, **filters)
+        walked.append(items)
+        if after is None:
+            return walked
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"status": TaskStatus.pending},
+        {"priority": 5},
+        {"status": TaskStatus.in_progress, "priority": 2},
+    ],
+)
+def test_pages_cover_the_filtered_tasks(filters):
+    store = TaskStore()
+    fill(store, 300, seed=3)
+    for task_id in range(3, 300, 4):
+        store.delete(task_id)
+    # Moves tasks into the middle of the other indexes.
+    for task_id in range(1, 300, 9):
+        store.update(task_id, {"status": TaskStatus.in_progress})
+
+    walked = pages(store, 7, **filters)
+    assert all(len(items) == 7 for items in walked[:-1])
+    assert sum(walked, []) == store.filter(**filters)
+
+
+def test_id_index():
+    index = IdIndex()
+    for task_id in [1, 4, 9, 2, 4, 7]:
+        index.add(task_id)
+    index.discard(9)
+    index.discard(5)
+    assert list(index) == [1, 2, 4, 7]
+    assert 4 in index and 9 not in index
+    assert list(index.after(2)) == [4, 7]
+    assert list(index.after(0)) == [1, 2, 4, 7]
+    assert list(index.after(7)) == []
+
+
+def test_update_touches_only_the_changed_indexes(monkeypatch):
+    store = TaskStore()
+    fill(store, 20)
+    moved = []
+    for name in ("add", "discard"):
+        method = getattr(IdIndex, name)
+        monkeypatch.setattr(
+            IdIndex,
+            name,
+            lambda index, task_id, method=method: moved.append(task_id)
+            or method(index, task_id),
+        )
+    top = store.top(5)
+
+    store.update(3, {"title": "renamed", "description": "new words"})
+    assert moved == []
+    assert store.top(5) == top
+    assert [task.task_id for task in store.search("renamed")] == [3]
+    # Task 3 was added as "task 2".
+    assert store.search("task 2") == []
+
+    task = store.get(4)
+    store.update(4, {"status": TaskStatus.completed, "priority": 1})
+    assert moved == [4, 4, 4, 4]
+    assert store.filter(TaskStatus.completed, 1) == [task]
+    assert task not in store.filter(priority=5)
@@ -0,0 +1,115 @@
+"""POST latency under each journal fsync policy, and recovery time.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_journal
+    python -m benchmarks.bench_journal --requests 500 --recover 100000
+
+POSTs are sent one at a time (latency) and from ``--clients`` concurrent
+callers (throughput, where group commit shares one fsync between them).
+Recovery is timed from a snapshot alone and from a log alone.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+import main
+from journal import FSYNC_POLICIES, Journal, JournaledStore
+from schemas import TaskCreate, TaskStatus
+from store import TaskStore, decode_task, encode_task
+
+
+def make_journal(directory: str, fsync: str = "group") -> Journal:
+    return Journal(
+        directory,
+        key="task_id",
+        encode=encode_task,
+        decode=decode_task,
+        fsync=fsync,
+        snapshot_interval=3600,
+    )
+
+
+async def run_posts(fsync: str, requests: int, clients: int) -> tuple:
+    body = TaskCreate(
+        title="bench", description="bench", status=TaskStatus.pending
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        store = TaskStore()
+        if fsync == "none":
+            main.journal, main.tasks_db = None, store
+            return await time_posts(body, requests, clients)
+        main.journal = make_journal(directory, fsync)
+        main.tasks_db = JournaledStore(store, main.journal)
+        async with main.journal.attach(store):
+            return await time_posts(body, requests, clients)
+
+
+async def time_posts(body: TaskCreate, requests: int, clients: int) -> tuple:
+    start = time.perf_counter()
+    for _ in range(requests):
+        await main.add_task(body)
+    sequential = (time.perf_counter() - start) / requests * 1e6
+
+    async def client() -> None:
+        for _ in range(requests // clients):
+            await main.add_task(body)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    return sequential, requests // clients * clients / elapsed
+
+
+async def write_journal(directory: str, size: int, snapshot: bool) -> None:
+    journal = make_journal(directory, "off")
+    store = TaskStore()
+    async with journal.attach(store):
+        tasks_db = JournaledStore(store, journal)
+        for i in range(size):
+            tasks_db.add(
+                {
+                    "title": f"task {i}",
+                    "description": "recovered",
+                    "status": TaskStatus.pending,
+                }
+            )
+        if snapshot:
+            await journal.snapshot(store)
+
+
+def time_recovery(size: int, snapshot: bool) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(write_journal(directory, size, snapshot))
+        start = time.perf_counter()
+        records, next_id = make_journal(directory).recover()
+        TaskStore().load(records, next_id)
+        return time.perf_counter() - start
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--recover", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'fsync':>10} | {'POST us':>10} | {'POST/s @' + str(args.clients):>12}"
+    )
+    for fsync in ("none", *FSYNC_POLICIES):
+        latency, throughput = asyncio.run(
+            run_posts(fsync, args.requests, args.clients)
+        )
+        print(f"{fsync:>10} | {latency:>10.1f} | {throughput:>12,.0f}")
+
+    print(f"\nrecovering {args.recover:,} tasks")
+    for label, snapshot in (("from snapshot", True), ("from log", False)):
+        seconds = time_recovery(args.recover, snapshot)
+        print(f"{label:>14}: {seconds:.2f} s")
+
+
+if __name__ == "__main__":
+    main_cli()
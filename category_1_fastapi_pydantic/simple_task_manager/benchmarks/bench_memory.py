@@ -0,0 +1,86 @@
+"""Memory per task for dict records against the slotted ``Task`` records.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_memory
+    python -m benchmarks.bench_memory --sizes 100000 1000000
+
+Measured with ``tracemalloc``: everything allocated while filling a store
+and still alive afterwards, divided by the number of tasks. "dict" fills
+a plain ``{task_id: dict}`` mapping the way the store did before ``Task``,
+plus the per-task versions the store keeps; "slots" fills a
+``TaskStore``. Titles and descriptions are distinct strings, as they
+would be when parsed from requests, and are counted in both columns.
+"""
+
+import argparse
+import gc
+import tracemalloc
+from typing import Callable
+
+from schemas import TaskStatus
+from store import TaskStore
+
+
+def fill_dicts(size: int) -> tuple:
+    tasks, versions = {}, {}
+    for i in range(1, size + 1):
+        tasks[i] = {
+            "title": f"task {i}",
+            "description": f"description {i}",
+            "status": TaskStatus.pending,
+            "task_id": i,
+        }
+        versions[i] = i
+    return tasks, versions
+
+
+def fill_store(size: int) -> TaskStore:
+    store = TaskStore()
+    for i in range(1, size + 1):
+        store.add(
+            {
+                "title": f"task {i}",
+                "description": f"description {i}",
+                "status": TaskStatus.pending,
+            }
+        )
+    return store
+
+
+def bytes_per_task(fill: Callable[[int], object], size: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    tasks = fill(size)
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del tasks
+    return used / size
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100_000, 1_000_000, 5_000_000],
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'tasks':>12} | {'dict':>10} | {'slots':>10} | {'saved':>8}"
+        "   (bytes/task)"
+    )
+    for size in args.sizes:
+        before = bytes_per_task(fill_dicts, size)
+        after = bytes_per_task(fill_store, size)
+        print(
+            f"{size:>12,} | {before:>10.1f} | {after:>10.1f} | "
+            f"{1 - after / before:>8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,90 @@
+"""Per-request latency of the task endpoints as the store grows.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_store
+    python -m benchmarks.bench_store --sizes 1000 10000 --requests 500
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import main
+from schemas import TaskCreate, TaskStatus
+
+
+def prefill(size: int) -> None:
+    main.tasks_db.clear()
+    for i in range(size):
+        main.tasks_db.add(
+            {
+                "title": f"task {i}",
+                "description": "prefilled",
+                "status": TaskStatus.pending,
+            }
+        )
+
+
+async def run_requests(requests: int) -> dict:
+    body = TaskCreate(
+        title="bench", description="bench", status=TaskStatus.pending
+    )
+    timings = {}
+
+    start = time.perf_counter()
+    created = [await main.add_task(body) for _ in range(requests)]
+    timings["POST"] = time.perf_counter() - start
+
+    ids = [json.loads(response.body)["task_id"] for response in created]
+    start = time.perf_counter()
+    for task_id in ids:
+        await main.get_task(task_id)
+    timings["GET"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for task_id in ids:
+        await main.update_task(task_id, body)
+    timings["PUT"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for task_id in ids:
+        await main.delete_task(task_id)
+    timings["DELETE"] = time.perf_counter() - start
+
+    return {name: total / requests * 1e6 for name, total in timings.items()}
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000, 1_000_000],
+    )
+    parser.add_argument("--requests", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'store size':>12} | "
+        + " | ".join(
+            f"{name:>10}" for name in ("POST", "GET", "PUT", "DELETE")
+        )
+        + "   (us/request)"
+    )
+    for size in args.sizes:
+        prefill(size)
+        result = asyncio.run(run_requests(args.requests))
+        print(
+            f"{size:>12,} | "
+            + " | ".join(
+                f"{result[name]:>10.2f}"
+                for name in ("POST", "GET", "PUT", "DELETE")
+            )
+        )
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,126 @@
+"""Load test the shared SQLite store under 1..N uvicorn workers.
+
+Starts ``uvicorn main:app --workers N`` with TASK_STORE=sqlite for each
+worker count, drives it with concurrent HTTP clients (mostly reads, some
+creates) and reports requests per second. It also checks that every
+task id handed out across the workers is unique.
+
+Run from the project directory (needs uvicorn and httpx):
+
+    python -m benchmarks.load_workers
+    python -m benchmarks.load_workers --workers 1 2 4 8 --seconds 15
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+TASK = {"title": "load", "description": "load test", "status": "pending"}
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 20) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await client.get("/tasks/?limit=1")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError("uvicorn did not start in time")
+
+
+async def client_loop(
+    client: httpx.AsyncClient,
+    stop_at: float,
+    write_ratio: float,
+    created: list,
+) -> int:
+    done = 0
+    while time.monotonic() < stop_at:
+        if not created or random.random() < write_ratio:
+            response = await client.post("/tasks/", json=TASK)
+            created.append(response.json()["task_id"])
+        else:
+            await client.get(f"/tasks/{random.choice(created)}")
+        done += 1
+    return done
+
+
+async def drive(port: int, clients: int, seconds: float, write_ratio: float):
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30
+    ) as client:
+        await wait_ready(client)
+        created: list = []
+        stop_at = time.monotonic() + seconds
+        counts = await asyncio.gather(
+            *(
+                client_loop(client, stop_at, write_ratio, created)
+                for _ in range(clients)
+            )
+        )
+    return sum(counts) / seconds, created
+
+
+def run(workers: int, args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "TASK_STORE": "sqlite",
+            "TASK_DB_PATH": os.path.join(tmp, "tasks.db"),
+        }
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "main:app",
+                "--port",
+                str(args.port),
+                "--workers",
+                str(workers),
+                "--log-level",
+                "warning",
+            ],
+            env=env,
+        )
+        try:
+            rps, created = asyncio.run(
+                drive(args.port, args.clients, args.seconds, args.write_ratio)
+            )
+        finally:
+            server.terminate()
+            server.wait()
+    unique = len(set(created)) == len(created)
+    print(
+        f"{workers:>7} | {rps:>10,.0f} | {len(created):>9,} | "
+        f"{'yes' if unique else 'NO':>10}"
+    )
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(
+        f"{'workers':>7} | {'req/s':>10} | {'created':>9} | {'ids unique':>10}"
+    )
+    for workers in args.workers:
+        run(workers, args)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,61 @@
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+
+
+def etag(version: str) -> str:
+    """Strong ETag for a store version token."""
+    return f'"{version}"'
+
+
+def not_modified(if_none_match: Optional[str], tag: str) -> bool:
+    """Whether ``If-None-Match`` says the client already has ``tag``.
+
+    Uses the weak comparison RFC 9110 prescribes for this header, so a
+    ``W/`` prefix added by a proxy still matches.
+    """
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return tag in (
+        listed.removeprefix("W/") for listed in _listed(if_none_match)
+    )
+
+
+def not_modified_response(tag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": tag}
+    )
+
+
+def if_match_version(
+    if_match: Optional[str], store, record_id: int
+) -> Optional[str]:
+    """Version a conditional write must still find, or None if unconditional.
+
+    Raises 412 when ``If-Match`` does not name the record's current ETag,
+    using strong comparison. A missing record matches no tag, not even
+    ``*``, so any ``If-Match`` on it is also 412 (RFC 9110, 13.1.1).
+    """
+    if if_match is None:
+        return None
+    version = store.record_version(record_id)
+    if version is None:
+        raise precondition_failed()
+    if if_match.strip() == "*":
+        return None
+    if etag(version) not in _listed(if_match):
+        raise precondition_failed()
+    return version
+
+
+def precondition_failed() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Resource has changed; fetch it again",
+    )
+
+
+def _listed(header: str) -> list:
+    return [tag.strip() for tag in header.split(",")]
@@ -1,23 +1,115 @@
-from fastapi import FastAPI, status, Body, HTTPException, Response
-from typing import Annotated
-from schemas import TaskCreate, TaskResponse
-
-
-app = FastAPI()
-
-
-tasks_db = []
-
-
-def genereate_unique_task_id(db: list) -> int:
-    if not db:
-        return 0
-    return max(db, key=lambda x: x["task_id"])["task_id"] + 1
-
+from fastapi import (
+    FastAPI,
+    status,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Response,
+)
+from fastapi.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from typing import Annotated, Callable, Optional, TypeVar
+import os
+from schemas import TaskCreate, TaskPage, TaskResponse
+from store import TaskStore, VersionMismatch, decode_task, encode_task
+from serializers import TASK, TASK_PAGE, json_response
+from etags import (
+    etag,
+    if_match_version,
+    not_modified,
+    not_modified_response,
+    precondition_failed,
+)
+from journal import Journal, JournaledStore
+from sqlite_store import SQLiteTaskStore
+from pagination import (
+    DEFAULT_PAGE_SIZE,
+    PageSize,
+    cursor_param,
+    encode_cursor,
+)
 
-@app.get("/tasks/", status_code=status.HTTP_200_OK)
-async def list_tasks():
-    return tasks_db
+# "memory" keeps tasks in this process only; "sqlite" shares them between
+# uvicorn workers through the SQLite file at TASK_DB_PATH.
+TASK_STORE = os.getenv("TASK_STORE", "memory")
+# Directory for the write log and snapshots of the "memory" store; unset
+# means tasks are lost on restart.
+TASK_JOURNAL_DIR = os.getenv("TASK_JOURNAL_DIR")
+
+journal = None
+if TASK_STORE == "sqlite":
+    tasks_db = SQLiteTaskStore(os.getenv("TASK_DB_PATH", "tasks.db"))
+else:
+    tasks_db = TaskStore()
+    if TASK_JOURNAL_DIR:
+        journal = Journal(
+            TASK_JOURNAL_DIR,
+            key="task_id",
+            encode=encode_task,
+            decode=decode_task,
+            fsync=os.getenv("TASK_JOURNAL_FSYNC", "group"),
+            snapshot_interval=float(os.getenv("TASK_SNAPSHOT_INTERVAL", "60")),
+        )
+        tasks_db = JournaledStore(tasks_db, journal)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if journal is None:
+        yield
+        return
+    async with journal.attach(tasks_db.store):
+        yield
+
+
+async def commit():
+    """Wait until the writes made so far are durable, if journaling."""
+    if journal is not None:
+        await journal.commit()
+
+
+T = TypeVar("T")
+
+
+async def run_store(method: Callable[..., T], *args, **kwargs) -> T:
+    """Call a store method without blocking the event loop on SQLite.
+
+    A SQLite call can wait up to ``busy_timeout`` for another worker's
+    write lock, so it runs in the threadpool and only holds up its own
+    request. The in-memory stores answer in microseconds and are not
+    thread-safe, so they are called inline.
+    """
+    if TASK_STORE == "sqlite":
+        return await run_in_threadpool(method, *args, **kwargs)
+    return method(*args, **kwargs)
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.get("/tasks/", response_model=TaskPage, status_code=status.HTTP_200_OK)
+async def list_tasks(
+    after: Annotated[int, Depends(cursor_param)],
+    limit: PageSize = DEFAULT_PAGE_SIZE,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    # The collection ETag changes on any write, so one tag covers every
+    # page of the listing.
+    tag = etag(await run_store(tasks_db.version))
+    if not_modified(if_none_match, tag):
+        return not_modified_response(tag)
+    items, last_id = await run_store(tasks_db.page, after=after, limit=limit)
+    return json_response(
+        TASK_PAGE,
+        {
+            "items": items,
+            "next_cursor": (
+                encode_cursor(last_id) if last_id is not None else None
+            ),
+        },
+        headers={"ETag": tag},
+    )
 
 
 @app.get(
@@ -25,16 +117,23 @@ async def list_tasks():
     response_model=TaskResponse,
     status_code=status.HTTP_200_OK,
 )
-async def get_task(task_id: int):
+async def get_task(
+    task_id: int,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
     if task_id <= 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Task ID must be positive integer",
         )
 
-    for task in tasks_db:
-        if task["task_id"] == task_id:
-            return TaskResponse(**task)
+    version = await run_store(tasks_db.record_version, task_id)
+    if version is not None:
+        tag = etag(version)
+        if not_modified(if_none_match, tag):
+            return not_modified_response(tag)
+        task = await run_store(tasks_db.get, task_id)
+        return json_response(TASK, task, headers={"ETag": tag})
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND, detail="Item not found !"
     )
@@ -44,30 +143,54 @@ async def get_task(task_id: int):
     "/tasks/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED
 )
 async def add_task(task: Annotated[TaskCreate, Body()]):
-    task_id = genereate_unique_task_id(tasks_db)
-    new_task = {
-        "task_id": task_id,
-        "title": task.title,
-        "description": task.description,
-        "status": task.status,
-    }
-    tasks_db.append(new_task)
-    return new_task
+    # The tag comes from the write itself: read separately, it could be
+    # the version of another worker's later write.
+    new_task, version = await run_store(
+        tasks_db.add_with_version,
+        {
+            "title": task.title,
+            "description": task.description,
+            "status": task.status,
+        },
+    )
+    await commit()
+    tag = etag(version)
+    return json_response(
+        TASK, new_task, status.HTTP_201_CREATED, headers={"ETag": tag}
+    )
 
 
 @app.put("/tasks/{task_id}", response_model=TaskResponse)
-async def update_task(task_id: int, task: Annotated[TaskCreate, Body()]):
+async def update_task(
+    task_id: int,
+    task: Annotated[TaskCreate, Body()],
+    if_match: Annotated[Optional[str], Header()] = None,
+):
     if task_id <= 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Task must be positive integer",
         )
-    for item in tasks_db:
-        if item["task_id"] == task_id:
-            item["title"] = task.title
-            item["description"] = task.description
-            item["status"] = task.status
-            return TaskResponse(**item)
+    try:
+        expected_version = await run_store(
+            if_match_version, if_match, tasks_db, task_id
+        )
+        item, version = await run_store(
+            tasks_db.update_with_version,
+            task_id,
+            {
+                "title": task.title,
+                "description": task.description,
+                "status": task.status,
+            },
+            expected_version=expected_version,
+        )
+    except VersionMismatch:
+        raise precondition_failed()
+    if item is not None:
+        await commit()
+        tag = etag(version)
+        return json_response(TASK, item, headers={"ETag": tag})
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail=f"Task with id {task_id} not found !",
@@ -75,16 +198,29 @@ async def update_task(task_id: int, task: Annotated[TaskCreate, Body()]):
 
 
 @app.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_task(task_id: int):
+async def delete_task(
+    task_id: int,
+    if_match: Annotated[Optional[str], Header()] = None,
+):
     if task_id <= 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Task must be positive integer",
         )
-    for item in tasks_db:
-        if item["task_id"] == task_id:
-            tasks_db.remove(item)
-            return Response(status_code=status.HTTP_204_NO_CONTENT)
+    try:
+        expected_version = await run_store(
+            if_match_version, if_match, tasks_db, task_id
+        )
+        deleted = await run_store(
+            tasks_db.delete,
+            task_id,
+            expected_version=expected_version,
+        )
+    except VersionMismatch:
+        raise precondition_failed()
+    if deleted:
+        await commit()
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail=f"Task with id {task_id} not found !",
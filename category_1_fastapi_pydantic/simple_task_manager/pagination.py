@@ -0,0 +1,48 @@
+import base64
+from typing import Annotated, Optional
+
+from fastapi import HTTPException, Query, status
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+PageSize = Annotated[
+    int,
+    Query(
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description=f"Tasks per page (at most {MAX_PAGE_SIZE})",
+    ),
+]
+
+
+def encode_cursor(task_id: int) -> str:
+    raw = f"task:{task_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    # binascii.Error and UnicodeDecodeError are both ValueErrors.
+    raw = base64.urlsafe_b64decode(padded.encode()).decode()
+    prefix, _, value = raw.partition(":")
+    if prefix != "task" or not value.isdigit():
+        raise ValueError("Invalid cursor")
+    return int(value)
+
+
+def cursor_param(
+    cursor: Annotated[
+        Optional[str],
+        Query(description="Opaque next_cursor from the previous page"),
+    ] = None,
+) -> int:
+    """Dependency turning the ``cursor`` query param into a task id."""
+    if cursor is None:
+        return 0
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from enum import Enum
+from typing import List, Optional
 
 
 class TaskStatus(str, Enum):
@@ -20,3 +21,10 @@ class TaskCreate(TasksBase):
 
 class TaskResponse(TasksBase):
     task_id: int
+
+
+class TaskPage(BaseModel):
+    items: List[TaskResponse]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as ?cursor= to fetch the next page"
+    )
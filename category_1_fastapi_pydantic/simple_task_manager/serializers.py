@@ -0,0 +1,41 @@
+from typing import List, Optional
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+from store import Task
+
+# Stored tasks were validated when they were written, so responses are
+# dumped from them directly instead of through a model instance. ``Task``
+# has the fields of ``TaskResponse`` in the same order, so the JSON is the
+# same as FastAPI would produce.
+TaskPageRecord = TypedDict(
+    "TaskPageRecord",
+    {"items": List[Task], "next_cursor": Optional[str]},
+)
+
+# Built once at import; each call only runs the compiled serializer.
+TASK = TypeAdapter(Task)
+TASK_PAGE = TypeAdapter(TaskPageRecord)
+
+
+def json_response(
+    adapter: TypeAdapter,
+    value,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[dict] = None,
+    **options,
+) -> Response:
+    """Serialize ``value`` to a JSON response in a single pass.
+
+    Returning a ``Response`` makes FastAPI skip validating and serializing
+    against ``response_model``, which stays on the route for the OpenAPI
+    schema. ``options`` are passed on to ``dump_json`` (e.g. ``exclude``).
+    """
+    return Response(
+        content=adapter.dump_json(value, **options),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
@@ -0,0 +1,250 @@
+import sqlite3
+import threading
+from typing import Iterator, List, Optional, Tuple
+
+from schemas import TaskStatus
+from store import Task, VersionMismatch
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    status TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS task_versions (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    epoch TEXT NOT NULL,
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO task_versions (id, epoch, version)
+VALUES (1, lower(hex(randomblob(4))), 0);
+
+CREATE TRIGGER IF NOT EXISTS tasks_version_after_insert
+AFTER INSERT ON tasks BEGIN
+    UPDATE task_versions SET version = version + 1;
+    UPDATE tasks SET version = (SELECT version FROM task_versions)
+    WHERE task_id = NEW.task_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_version_after_update
+AFTER UPDATE OF title, description, status ON tasks BEGIN
+    UPDATE task_versions SET version = version + 1;
+    UPDATE tasks SET version = (SELECT version FROM task_versions)
+    WHERE task_id = NEW.task_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_version_after_delete
+AFTER DELETE ON tasks BEGIN
+    UPDATE task_versions SET version = version + 1;
+END;
+"""
+
+COLUMNS = "task_id, title, description, status"
+# RETURNING reports a row as the statement wrote it, before the version
+# triggers run. So inserts and updates stamp the row themselves with the
+# value the trigger is about to give the shared counter (they hold the
+# write lock, so nothing else can take it first), and read the row's
+# version back in the same statement, never with a second query.
+NEXT_VERSION = "(SELECT version + 1 FROM task_versions)"
+VERSIONED = f"{COLUMNS}, (SELECT epoch FROM task_versions) || '.' || version"
+UPDATABLE = ("title", "description", "status")
+
+
+class SQLiteTaskStore:
+    """Task store shared by every worker process through one SQLite file.
+
+    The database runs in WAL mode, so readers never block on the writer
+    and each other. Ids come from ``AUTOINCREMENT``, which SQLite assigns
+    inside the write lock: they are unique across workers and never
+    reused. Triggers stamp every written row with the next value of a
+    shared version counter. Each thread gets its own connection.
+
+    Exposes the same interface as ``TaskStore``.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        self._path = path
+        self._busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        connection = self._connection()
+        columns = [
+            row[1] for row in connection.execute("PRAGMA table_info(tasks)")
+        ]
+        if columns and "version" not in columns:
+            # Databases created before versioning: add the column first.
+            connection.execute(
+                "ALTER TABLE tasks "
+                "ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+            )
+        connection.executescript(SCHEMA)
+
+    def __len__(self) -> int:
+        return (
+            self._connection()
+            .execute("SELECT COUNT(*) FROM tasks")
+            .fetchone()[0]
+        )
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self.all())
+
+    def __contains__(self, task_id: int) -> bool:
+        return self.get(task_id) is not None
+
+    def version(self) -> str:
+        """Token that changes whenever any task is written, by any worker."""
+        return (
+            self._connection()
+            .execute("SELECT epoch || '.' || version FROM task_versions")
+            .fetchone()[0]
+        )
+
+    def record_version(self, task_id: int) -> Optional[str]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT epoch || '.' || tasks.version "
+                "FROM tasks, task_versions WHERE task_id = ?",
+                (task_id,),
+            )
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def all(self) -> list:
+        rows = self._connection().execute(
+            f"SELECT {COLUMNS} FROM tasks ORDER BY task_id"
+        )
+        return [self._to_task(row) for row in rows]
+
+    def get(self, task_id: int) -> Optional[Task]:
+        row = (
+            self._connection()
+            .execute(
+                f"SELECT {COLUMNS} FROM tasks WHERE task_id = ?", (task_id,)
+            )
+            .fetchone()
+        )
+        return self._to_task(row) if row else None
+
+    def page(
+        self, after: int = 0, limit: int = 100
+    ) -> Tuple[List[Task], Optional[int]]:
+        rows = self._connection().execute(
+            f"SELECT {COLUMNS} FROM tasks WHERE task_id > ? "
+            "ORDER BY task_id LIMIT ?",
+            (after, limit + 1),
+        )
+        items = [self._to_task(row) for row in rows]
+        if len(items) > limit:
+            return items[:limit], items[limit - 1].task_id
+        return items, None
+
+    def add(self, data: dict) -> Task:
+        return self.add_with_version(data)[0]
+
+    def add_with_version(self, data: dict) -> Tuple[Task, str]:
+        """``add``, also returning the version the write gave the task,
+        read back by the INSERT itself."""
+        rows = self._connection().execute(
+            "INSERT INTO tasks (title, description, status, version) "
+            f"VALUES (?, ?, ?, {NEXT_VERSION}) RETURNING {VERSIONED}",
+            (data["title"], data["description"], data["status"].value),
+        )
+        # Drain RETURNING rows so the statement, and its commit, completes.
+        return self._to_versioned(rows.fetchall()[0])
+
+    def update(
+        self, task_id: int, data: dict, expected_version: Optional[str] = None
+    ) -> Optional[Task]:
+        """Update a task; with ``expected_version``, only if the task is
+        still at that version, else raise ``VersionMismatch``."""
+        return self.update_with_version(
+            task_id, data, expected_version=expected_version
+        )[0]
+
+    def update_with_version(
+        self, task_id: int, data: dict, expected_version: Optional[str] = None
+    ) -> Tuple[Optional[Task], Optional[str]]:
+        """``update``, also returning the version the write gave the task
+        (None if there is no such task), read back by the UPDATE itself."""
+        data = {
+            key: value.value if isinstance(value, TaskStatus) else value
+            for key, value in data.items()
+            if key in UPDATABLE
+        }
+        assignments = ", ".join(f"{key} = ?" for key in data)
+        condition, params = self._version_clause(expected_version)
+        rows = self._connection().execute(
+            f"UPDATE tasks SET {assignments}, version = {NEXT_VERSION} "
+            f"WHERE task_id = ?{condition} RETURNING {VERSIONED}",
+            (*data.values(), task_id, *params),
+        )
+        updated = rows.fetchall()
+        if updated:
+            return self._to_versioned(updated[0])
+        self._missing_or_mismatch(task_id, expected_version)
+        return None, None
+
+    def delete(
+        self, task_id: int, expected_version: Optional[str] = None
+    ) -> bool:
+        condition, params = self._version_clause(expected_version)
+        cursor = self._connection().execute(
+            f"DELETE FROM tasks WHERE task_id = ?{condition}",
+            (task_id, *params),
+        )
+        if cursor.rowcount > 0:
+            return True
+        self._missing_or_mismatch(task_id, expected_version)
+        return False
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM tasks")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit: every statement is its own atomic transaction.
+            connection = sqlite3.connect(
+                self._path, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA busy_timeout={self._busy_timeout_ms}")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _version_clause(
+        expected_version: Optional[str],
+    ) -> Tuple[str, tuple]:
+        """SQL condition that holds only while the task is at
+        ``expected_version``; empty when no version is expected."""
+        if expected_version is None:
+            return "", ()
+        epoch, _, version = expected_version.partition(".")
+        return (
+            " AND version = ? AND (SELECT epoch FROM task_versions) = ?",
+            (int(version) if version.isdigit() else -1, epoch),
+        )
+
+    def _missing_or_mismatch(
+        self, task_id: int, expected_version: Optional[str]
+    ) -> None:
+        """After a conditional write matched no row: raise
+        ``VersionMismatch`` if the task exists, i.e. the version was wrong."""
+        if expected_version is not None and task_id in self:
+            raise VersionMismatch(task_id)
+
+    @classmethod
+    def _to_versioned(cls, row: tuple) -> Tuple[Task, str]:
+        return cls._to_task(row[:-1]), row[-1]
+
+    @staticmethod
+    def _to_task(row: tuple) -> Task:
+        task_id, title, description, status = row
+        return Task(title, description, TaskStatus(status), task_id)
@@ -0,0 +1,200 @@
+import secrets
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from schemas import TaskStatus
+
+
+class VersionMismatch(Exception):
+    """A conditional write named a version the task no longer has."""
+
+
+@dataclass(slots=True)
+class Task:
+    """A stored task.
+
+    Slots instead of a per-task ``dict`` save about 88 bytes per stored
+    task, a fifth of the total (``benchmarks/bench_memory.py``). Fields
+    follow ``TaskResponse`` order, so responses dumped from a ``Task`` are
+    the same JSON as from the model.
+    """
+
+    title: str
+    description: str
+    status: TaskStatus
+    task_id: int
+
+
+class TaskStore:
+    """In-memory task store keyed by ``task_id``.
+
+    Ids come from a monotonic counter and are never reused, so lookups,
+    updates and deletes are O(1) dict operations. Dicts keep insertion
+    order, which means iteration is always in ``task_id`` order.
+    """
+
+    def __init__(self, start_id: int = 1):
+        self._tasks: Dict[int, Task] = {}
+        self._start_id = start_id
+        self._next_id = start_id
+        # Versions come from one counter bumped on every write; the random
+        # epoch keeps versions handed out before a restart from matching.
+        self._epoch = secrets.token_hex(4)
+        self._version = 0
+        self._versions: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._tasks.values())
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._tasks
+
+    def next_id(self) -> int:
+        task_id = self._next_id
+        self._next_id += 1
+        return task_id
+
+    def version(self) -> str:
+        """Token that changes whenever any task is written."""
+        return f"{self._epoch}.{self._version}"
+
+    def record_version(self, task_id: int) -> Optional[str]:
+        version = self._versions.get(task_id)
+        if version is None:
+            return None
+        return f"{self._epoch}.{version}"
+
+    def all(self) -> list:
+        return list(self._tasks.values())
+
+    def get(self, task_id: int) -> Optional[Task]:
+        return self._tasks.get(task_id)
+
+    def scan(self) -> Iterator[Task]:
+        """Yield tasks in id order without holding a copy of the store.
+
+        Walks the id range allocated so far, so it is safe to resume
+        between writes: deleted ids are skipped and later inserts are left
+        out of the scan.
+        """
+        for task_id in range(self._start_id, self._next_id):
+            task = self._tasks.get(task_id)
+            if task is not None:
+                yield task
+
+    def page(
+        self, after: int = 0, limit: int = 100
+    ) -> Tuple[List[Task], Optional[int]]:
+        """Return up to ``limit`` tasks with ``task_id > after``.
+
+        Walks the id range from ``after`` rather than the store, so a page
+        costs its size plus any deleted ids in between. The second value
+        is the id to continue after, or None on the last page.
+        """
+        candidates = (
+            task_id
+            for task_id in range(max(after + 1, self._start_id), self._next_id)
+            if task_id in self._tasks
+        )
+        page_ids = list(islice(candidates, limit + 1))
+        items = [self._tasks[task_id] for task_id in page_ids[:limit]]
+        if len(page_ids) > limit:
+            return items, items[-1].task_id
+        return items, None
+
+    def add(self, data: dict) -> Task:
+        task = Task(**data, task_id=self.next_id())
+        self._tasks[task.task_id] = task
+        self._bump(task.task_id)
+        return task
+
+    def update(
+        self, task_id: int, data: dict, expected_version: Optional[str] = None
+    ) -> Optional[Task]:
+        """Update a task; with ``expected_version``, only if the task is
+        still at that version, else raise ``VersionMismatch``."""
+        task = self._tasks.get(task_id)
+        if task is None:
+            return None
+        self._check_version(task_id, expected_version)
+        for name, value in data.items():
+            setattr(task, name, value)
+        self._bump(task_id)
+        return task
+
+    def add_with_version(self, data: dict) -> Tuple[Task, str]:
+        """``add``, also returning the version the write gave the task."""
+        task = self.add(data)
+        return task, self.record_version(task.task_id)
+
+    def update_with_version(
+        self, task_id: int, data: dict, expected_version: Optional[str] = None
+    ) -> Tuple[Optional[Task], Optional[str]]:
+        """``update``, also returning the version the write gave the task
+        (None if there is no such task)."""
+        task = self.update(task_id, data, expected_version=expected_version)
+        if task is None:
+            return None, None
+        return task, self.record_version(task_id)
+
+    def delete(
+        self, task_id: int, expected_version: Optional[str] = None
+    ) -> bool:
+        if task_id not in self._tasks:
+            return False
+        self._check_version(task_id, expected_version)
+        del self._tasks[task_id]
+        del self._versions[task_id]
+        self._version += 1
+        return True
+
+    def clear(self) -> None:
+        self._tasks.clear()
+        self._versions.clear()
+        self._version += 1
+
+    def load(self, tasks: List[Task], next_id: int) -> None:
+        """Replace the contents with ``tasks``, given in id order."""
+        self._tasks = {task.task_id: task for task in tasks}
+        self._next_id = max(self._next_id, next_id)
+        self._version += 1
+        self._versions = dict.fromkeys(self._tasks, self._version)
+
+    def _bump(self, task_id: int) -> None:
+        self._version += 1
+        self._versions[task_id] = self._version
+
+    def _check_version(
+        self, task_id: int, expected_version: Optional[str]
+    ) -> None:
+        if (
+            expected_version is not None
+            and expected_version != self.record_version(task_id)
+        ):
+            raise VersionMismatch(task_id)
+
+
+# Plain lookup: calling TaskStatus(value) per record dominates recovery.
+STATUSES = {task_status.value: task_status for task_status in TaskStatus}
+
+
+def encode_task(task: Task) -> dict:
+    return {
+        "title": task.title,
+        "description": task.description,
+        "status": task.status.value,
+        "task_id": task.task_id,
+    }
+
+
+def decode_task(record: dict) -> Task:
+    return Task(
+        record["title"],
+        record["description"],
+        STATUSES[record["status"]],
+        record["task_id"],
+    )
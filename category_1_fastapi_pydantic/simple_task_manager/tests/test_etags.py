@@ -0,0 +1,100 @@
+"""Reads answer 304 to a current If-None-Match, and writes answer 412 to an
+If-Match that no longer holds."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from sqlite_store import SQLiteTaskStore
+from store import TaskStore
+
+TASK = {"title": "write", "description": "docs", "status": "pending"}
+UPDATE = {"title": "write", "description": "docs", "status": "completed"}
+WRITE = "PUT"
+SUCCESS = {WRITE: 200, "DELETE": 204}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def client(request, monkeypatch, tmp_path):
+    if request.param == "sqlite":
+        store = SQLiteTaskStore(str(tmp_path / "tasks.db"))
+    else:
+        store = TaskStore()
+    monkeypatch.setattr(main, "TASK_STORE", request.param)
+    monkeypatch.setattr(main, "tasks_db", store)
+    client = TestClient(main.app)
+    client.post("/tasks/", json=TASK)
+    return client
+
+
+def write(client, method, if_match):
+    if method == "DELETE":
+        return client.delete("/tasks/1", headers={"If-Match": if_match})
+    return write_to(client, 1, if_match)
+
+
+def write_to(client, task_id, if_match):
+    return client.request(
+        WRITE, f"/tasks/{task_id}", json=UPDATE, headers={"If-Match": if_match}
+    )
+
+
+@pytest.mark.parametrize("path", ["/tasks/", "/tasks/1"])
+def test_not_modified_until_a_write(client, path):
+    tag = client.get(path).headers["ETag"]
+    for if_none_match in (tag, f"W/{tag}", f'"other", {tag}', "*"):
+        response = client.get(path, headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == tag
+
+    client.request(WRITE, "/tasks/1", json=UPDATE)
+    response = client.get(path, headers={"If-None-Match": tag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != tag
+
+
+@pytest.mark.parametrize("method", [WRITE, "DELETE"])
+def test_stale_if_match(client, method):
+    stale = client.get("/tasks/1").headers["ETag"]
+    client.request(WRITE, "/tasks/1", json=UPDATE)
+
+    assert write(client, method, stale).status_code == 412
+    # The weak form never matches for writes.
+    current = client.get("/tasks/1").headers["ETag"]
+    assert write(client, method, f"W/{current}").status_code == 412
+    response = write(client, method, f'"other", {current}')
+    assert response.status_code == SUCCESS[method]
+
+
+@pytest.mark.parametrize("method", [WRITE, "DELETE"])
+def test_if_match_any(client, method):
+    assert write(client, method, "*").status_code == SUCCESS[method]
+
+
+@pytest.mark.parametrize("method", [WRITE, "DELETE"])
+@pytest.mark.parametrize("if_match", ["*", '"some-tag"'])
+def test_if_match_on_missing_task(client, method, if_match):
+    client.delete("/tasks/1")
+    assert write(client, method, if_match).status_code == 412
+    # Without a precondition it is an ordinary 404.
+    assert client.delete("/tasks/1").status_code == 404
+
+
+@pytest.mark.parametrize(
+    "method,path,task_id", [("POST", "/tasks/", 2), (WRITE, "/tasks/1", 1)]
+)
+def test_write_tag_is_the_written_version(
+    client, monkeypatch, method, path, task_id
+):
+    async def another_worker_writes():
+        # Lands after the write, before the response is built.
+        main.tasks_db.update(task_id, {"title": "theirs"})
+
+    monkeypatch.setattr(main, "commit", another_worker_writes)
+    tag = client.request(method, path, json=TASK).headers["ETag"]
+
+    # The tag names the version this request wrote, so a write based on
+    # it cannot overwrite the change it never saw.
+    assert client.get(f"/tasks/{task_id}").headers["ETag"] != tag
+    assert write_to(client, task_id, tag).status_code == 412
@@ -0,0 +1,216 @@
+"""The write log and snapshots bring the store back after a restart, and
+each fsync policy syncs when it promises to."""
+
+import asyncio
+import os
+
+import pytest
+
+import journal as journal_module
+from journal import Journal, JournaledStore
+from schemas import TaskStatus
+from store import TaskStore, decode_task, encode_task
+
+
+def open_journal(directory, fsync="group", **options):
+    return Journal(
+        str(directory),
+        key="task_id",
+        encode=encode_task,
+        decode=decode_task,
+        fsync=fsync,
+        snapshot_interval=3600,
+        **options,
+    )
+
+
+def run(directory, writes, fsync="group", **options):
+    """Start the store from ``directory``, apply ``writes`` and shut down
+    cleanly; return the store as it was recovered and written to."""
+    journal = open_journal(directory, fsync, **options)
+    store = TaskStore()
+
+    async def session():
+        async with journal.attach(store):
+            await writes(JournaledStore(store, journal), journal)
+
+    asyncio.run(session())
+    return store
+
+
+async def no_writes(store, journal):
+    pass
+
+
+def task(title, status=TaskStatus.pending):
+    return {"title": title, "description": "", "status": status}
+
+
+def contents(store):
+    return [encode_task(item) for item in store.scan()]
+
+
+def ids(store):
+    return [item.task_id for item in store.scan()]
+
+
+def segments(directory):
+    return sorted(
+        name for name in os.listdir(directory) if name.startswith("journal-")
+    )
+
+
+def test_restart_replays_the_log(tmp_path):
+    async def writes(store, journal):
+        for title in ("a", "b", "c"):
+            store.add(task(title))
+        store.update(2, task("b2", TaskStatus.completed))
+        await journal.commit()
+
+    written = contents(run(tmp_path, writes))
+    assert contents(run(tmp_path, no_writes)) == written
+
+
+def test_restart_after_delete_keeps_ids_unused(tmp_path):
+    async def writes(store, journal):
+        for title in ("a", "b", "c"):
+            store.add(task(title))
+        store.delete(1)
+        store.delete(3)
+        await journal.commit()
+
+    run(tmp_path, writes)
+
+    async def add_after_restart(store, journal):
+        store.add(task("d"))
+        await journal.commit()
+
+    # Deleted ids, including the highest one, are never handed out again.
+    assert ids(run(tmp_path, add_after_restart)) == [2, 4]
+    assert ids(run(tmp_path, no_writes)) == [2, 4]
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    async def writes(store, journal):
+        store.add(task("a"))
+        store.add(task("b"))
+        await journal.commit()
+
+    written = contents(run(tmp_path, writes))
+    # A crash halfway through appending the next line.
+    with open(tmp_path / segments(tmp_path)[-1], "ab") as file:
+        file.write(b'{"put":{"title":"c","descr')
+
+    assert contents(run(tmp_path, no_writes)) == written
+
+
+def test_corrupt_line_before_the_end_is_an_error(tmp_path):
+    async def writes(store, journal):
+        store.add(task("a"))
+        await journal.commit()
+
+    run(tmp_path, writes)
+    with open(tmp_path / segments(tmp_path)[-1], "ab") as file:
+        file.write(b"{not json\n")
+        file.write(b'{"del":1}\n')
+
+    with pytest.raises(ValueError, match="Corrupt journal line"):
+        run(tmp_path, no_writes)
+
+
+def test_snapshot_plus_later_segments(tmp_path):
+    async def writes(store, journal):
+        for title in ("a", "b", "c"):
+            store.add(task(title))
+        await journal.snapshot(store)
+        # These land in the segment opened by the snapshot.
+        store.update(1, task("a2"))
+        store.delete(2)
+        store.add(task("d"))
+        await journal.commit()
+
+    written = contents(run(tmp_path, writes))
+    assert os.path.exists(tmp_path / "snapshot.ndjson")
+    # Only the segment written after the snapshot is left.
+    assert len(segments(tmp_path)) == 1
+
+    async def more_writes(store, journal):
+        store.delete(4)
+        store.add(task("e"))
+        await journal.commit()
+
+    run(tmp_path, more_writes)
+    recovered = contents(run(tmp_path, no_writes))
+    assert recovered == [
+        *written[:2],
+        {"title": "e", "description": "", "status": "pending", "task_id": 5},
+    ]
+
+
+def test_clear_survives_restart(tmp_path):
+    async def writes(store, journal):
+        store.add(task("a"))
+        store.clear()
+        store.add(task("b"))
+        await journal.commit()
+
+    run(tmp_path, writes)
+    assert [item.title for item in run(tmp_path, no_writes).scan()] == ["b"]
+
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    """Count fsync calls made by the journal."""
+    calls = []
+    real_fsync = os.fsync
+
+    def fsync(descriptor):
+        calls.append(descriptor)
+        real_fsync(descriptor)
+
+    monkeypatch.setattr(journal_module.os, "fsync", fsync)
+    return calls
+
+
+@pytest.mark.parametrize(
+    "fsync,expected",
+    [
+        ("always", lambda synced: synced == 20),
+        ("group", lambda synced: 1 <= synced < 20),
+        ("interval", lambda synced: synced == 0),
+        ("off", lambda synced: synced == 0),
+    ],
+)
+def test_fsync_policy(tmp_path, fsyncs, fsync, expected):
+    synced = []
+
+    async def writes(store, journal):
+        async def write(title):
+            store.add(task(title))
+            await journal.commit()
+
+        before = len(fsyncs)
+        await asyncio.gather(*(write(str(i)) for i in range(20)))
+        synced.append(len(fsyncs) - before)
+
+    store = run(tmp_path, writes, fsync)
+    [count] = synced
+    assert expected(count)
+    # Every policy still has the writes on disk after a clean shutdown.
+    assert contents(run(tmp_path, no_writes)) == contents(store)
+
+
+def test_interval_commits_in_the_background(tmp_path, fsyncs):
+    async def writes(store, journal):
+        store.add(task("a"))
+        await journal.commit()
+        before = len(fsyncs)
+        await asyncio.sleep(0.1)
+        assert len(fsyncs) > before
+
+    run(tmp_path, writes, "interval", commit_interval=0.01)
+
+
+def test_unknown_fsync_policy(tmp_path):
+    with pytest.raises(ValueError, match="fsync must be one of"):
+        open_journal(tmp_path, "sometimes")
@@ -0,0 +1,110 @@
+"""GET /tasks/ pages by an opaque cursor: following next_cursor visits
+every task once, in id order, even with deletes between pages."""
+
+import base64
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor
+from sqlite_store import SQLiteTaskStore
+from store import TaskStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def client(request, monkeypatch, tmp_path):
+    if request.param == "sqlite":
+        store = SQLiteTaskStore(str(tmp_path / "tasks.db"))
+    else:
+        store = TaskStore()
+    monkeypatch.setattr(main, "TASK_STORE", request.param)
+    monkeypatch.setattr(main, "tasks_db", store)
+    return TestClient(main.app)
+
+
+def add_tasks(client, count):
+    for i in range(count):
+        client.post(
+            "/tasks/",
+            json={
+                "title": f"task {i}",
+                "description": "",
+                "status": "pending",
+            },
+        )
+
+
+def ids(page):
+    return [task["task_id"] for task in page["items"]]
+
+
+def test_walk_every_page(client):
+    add_tasks(client, 50)
+    walked, params = [], {"limit": 7}
+    while True:
+        page = client.get("/tasks/", params=params).json()
+        walked.append(ids(page))
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+
+    assert all(len(page) == 7 for page in walked[:-1])
+    assert sum(walked, []) == list(range(1, 51))
+
+
+def test_deletes_between_pages(client):
+    add_tasks(client, 30)
+    first = client.get("/tasks/", params={"limit": 10}).json()
+    # Behind the cursor, the task the cursor points at, and ahead of it.
+    for task_id in (3, 10, 11, 20, 21, 30):
+        client.delete(f"/tasks/{task_id}")
+
+    walked, cursor = ids(first), first["next_cursor"]
+    while cursor is not None:
+        page = client.get(
+            "/tasks/", params={"limit": 10, "cursor": cursor}
+        ).json()
+        walked.extend(ids(page))
+        cursor = page["next_cursor"]
+
+    assert walked == sorted(set(walked))
+    # 3 and 10 were sent on the first page before they were deleted.
+    assert walked == [*range(1, 11), *range(12, 20), *range(22, 30)]
+
+
+def b64(raw):
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "!!!",
+        "a",
+        b64(b"user:5"),
+        b64(b"task:"),
+        b64(b"task:abc"),
+        b64(b"task:-1"),
+        b64(b"\xff\xfe"),
+        encode_cursor(5) + "x",
+    ],
+)
+def test_malformed_cursor(client, cursor):
+    response = client.get("/tasks/", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+def test_limit_is_capped(client):
+    add_tasks(client, DEFAULT_PAGE_SIZE + 1)
+    page = client.get("/tasks/").json()
+    assert len(page["items"]) == DEFAULT_PAGE_SIZE
+    assert page["next_cursor"] == encode_cursor(DEFAULT_PAGE_SIZE)
+
+    response = client.get("/tasks/", params={"limit": MAX_PAGE_SIZE})
+    assert response.status_code == 200
+    assert response.json()["next_cursor"] is None
+    for limit in (0, MAX_PAGE_SIZE + 1):
+        response = client.get("/tasks/", params={"limit": limit})
+        assert response.status_code == 422
@@ -0,0 +1,70 @@
+"""TaskStore hands out ids that only ever grow and answers missing ids
+without raising."""
+
+from schemas import TaskStatus
+from store import TaskStore
+
+
+def task(title, status=TaskStatus.pending):
+    return {"title": title, "description": "", "status": status}
+
+
+def ids(store):
+    return [item.task_id for item in store]
+
+
+def test_ids_grow_and_are_never_reused():
+    store = TaskStore()
+    assert [store.add(task(t)).task_id for t in "abc"] == [1, 2, 3]
+    store.delete(3)
+    store.delete(2)
+    assert store.add(task("d")).task_id == 4
+    store.clear()
+    assert store.add(task("e")).task_id == 5
+
+    assert TaskStore(start_id=10).add(task("a")).task_id == 10
+
+
+def test_missing_ids():
+    store = TaskStore()
+    store.add(task("a"))
+    store.delete(1)
+
+    for task_id in (0, 1, 2):
+        assert store.get(task_id) is None
+        assert task_id not in store
+        assert store.update(task_id, task("b")) is None
+        assert store.delete(task_id) is False
+        assert store.record_version(task_id) is None
+    # Nothing was created by the failed writes.
+    assert len(store) == 0
+    assert store.add(task("c")).task_id == 2
+
+
+def test_update_changes_the_stored_task():
+    store = TaskStore()
+    store.add(task("a"))
+    version = store.record_version(1)
+    updated = store.update(1, task("b", TaskStatus.completed))
+
+    assert store.get(1) is updated
+    assert (updated.title, updated.status) == ("b", TaskStatus.completed)
+    assert store.record_version(1) != version
+
+
+def test_len_and_order_after_mixed_writes():
+    store = TaskStore()
+    for i in range(10):
+        store.add(task(str(i)))
+    for task_id in (1, 5, 10):
+        store.delete(task_id)
+    store.add(task("10"))
+    store.update(2, task("2b"))
+    store.delete(7)
+
+    expected = [2, 3, 4, 6, 8, 9, 11]
+    assert len(store) == len(expected)
+    assert ids(store) == expected
+    assert [item.task_id for item in store.scan()] == expected
+    assert [item.task_id for item in store.all()] == expected
+    assert store.get(2).title == "2b"
@@ -1,29 +1,369 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import os
+from sqlalchemy import (
+    CTE,
+    Delete,
+    Executable,
+    Insert,
+    Select,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from app import models, schemas
+from app.bulk import batches
+from app.cache import EntityCache, entity_cache, invalidate
+from app.fields import Fields, columns
+from app.includes import Include
+from app.pagination import PageQuery, keyset
+
+# Relationship path loaded for each ?include= name.
+PROJECT_PATHS: Dict[str, Tuple] = {
+    "tasks": (models.Project.tasks,),
+    "sub_tasks": (models.Project.tasks, models.Task.sub_tasks),
+}
+TASK_PATHS: Dict[str, Tuple] = {
+    "projects": (models.Task.projects,),
+    "sub_tasks": (models.Task.sub_tasks,),
+}
+
+
+def eager(paths: Dict[str, Tuple], include: Include, loader: Callable) -> list:
+    """Loader options for the relationships in ``include``.
+
+    Lists use ``selectinload``: one ``SELECT ... WHERE id IN (...)`` per
+    relationship for the whole page, which also leaves LIMIT applying to
+    the parent rows. Single rows use ``joinedload``: one statement,
+    except that a many-to-many gets its own ``selectinload`` statement;
+    joined, it renders as ``LEFT OUTER JOIN (project_task JOIN ...)``,
+    which SQLite materializes by scanning the whole link table. Either way
+    the statement count does not depend on how many rows are returned.
+    """
+
+    def load(attribute):
+        if attribute.property.secondary is not None:
+            return selectinload(attribute)
+        return loader(attribute)
+
+    options = []
+    for name in sorted(include):
+        first, *rest = paths[name]
+        option = load(first)
+        for attribute in rest:
+            option = option.options(load(attribute))
+        options.append(option)
+    return options
+
+
+def reads_rows(include: Include, fields: Fields) -> bool:
+    """Whether a page can be plain rows rather than ORM objects: only
+    objects carry ``include``d relationships."""
+    return bool(fields) and not include
+
+
+def page_statement(
+    model: Any,
+    paths: Dict[str, Tuple],
+    page: PageQuery,
+    limit: int,
+    include: Include,
+    fields: Fields,
+) -> Select:
+    """The page after ``page.after``; see ``keyset``.
+
+    With ``fields``, only those columns are read, plus the id and sort key
+    that cursors (and eager loads) need. Without ``include`` they come
+    back as plain rows, so no ORM object or identity map entry is built
+    per row; with it, ``load_only`` objects carry the relationships.
+    """
+    if reads_rows(include, fields):
+        statement = select(*columns(model, fields, "id", page.sort))
+    else:
+        statement = select(model).options(*eager(paths, include, selectinload))
+        if fields:
+            statement = statement.options(
+                load_only(*columns(model, fields, "id", page.sort))
+            )
+    return keyset(statement, model, page, limit)
+
+
+# ---------------------------
+# Task trees
+# ---------------------------
+# Deepest level below the root that /tasks/{id}/tree will expand.
+MAX_TREE_DEPTH = int(os.getenv("TASK_TREE_MAX_DEPTH", "100"))
+
+
+def subtree(task_id: int, max_depth: int) -> CTE:
+    """Recursive CTE of ``task_id`` (depth 0) and its descendants down to
+    ``max_depth``.
+
+    SQLite walks the whole hierarchy in one statement instead of one
+    query per node. The depth bound also stops the walk if ``parent_id``
+    values ever form a cycle.
+    """
+    tasks = models.Task.__table__
+    tree = (
+        select(*tasks.c, literal(0).label("depth"))
+        .where(tasks.c.id == task_id)
+        .cte("tree", recursive=True)
+    )
+    return tree.union_all(
+        select(*tasks.c, (tree.c.depth + 1).label("depth"))
+        .join(tree, tasks.c.parent_id == tree.c.id)
+        .where(tree.c.depth < max_depth)
+    )
+
+
+def tree_statement(task_id: int, max_depth: int) -> Select:
+    # One level past max_depth, only to tell which nodes at the limit
+    # have children; see nest().
+    tree = subtree(task_id, max_depth + 1)
+    return select(tree).order_by(tree.c.depth)
+
+
+def count_statement(task_id: int, max_depth: int) -> Select:
+    tree = subtree(task_id, max_depth)
+    # DISTINCT: a parent_id cycle would reach the same tasks again. The
+    # root itself is not a descendant.
+    return select(
+        func.count(tree.c.id.distinct()) - 1, func.max(tree.c.depth)
+    )
+
+
+def nest(rows: Iterable[Row], max_depth: int) -> Optional[Dict[str, Any]]:
+    """Build the nested tree from ``tree_statement`` rows in one pass.
+
+    Rows come parents first, so every node's parent is already built when
+    the node arrives. Nodes at ``max_depth`` that have children get
+    ``sub_tasks=None``: not expanded, as opposed to ``[]`` for a leaf.
+    Returns None if the root task does not exist.
+    """
+    nodes: Dict[int, Dict[str, Any]] = {}
+    for row in rows:
+        node = dict(row._mapping)
+        depth = node.pop("depth")
+        if node["id"] in nodes:
+            # Reached again through a parent_id cycle.
+            continue
+        if depth > max_depth:
+            nodes[node["parent_id"]]["sub_tasks"] = None
+            continue
+        node["sub_tasks"] = []
+        nodes[node["id"]] = node
+        if depth > 0:
+            nodes[node["parent_id"]]["sub_tasks"].append(node)
+    return next(iter(nodes.values()), None)
+
+
+# ---------------------------
+# Bulk writes
+# ---------------------------
+def insert_tasks() -> Any:
+    """Multi-row INSERT handing back the new ids.
+
+    SQLite numbers the rows of one INSERT in ascending order, so sorting
+    the returned ids lines them up with the batch. Asking SQLAlchemy for
+    that order (``sort_by_parameter_order``) costs one INSERT per row
+    here.
+    """
+    return insert(models.Task).returning(models.Task.id)
+
+
+def unlink_tasks(task_ids: Sequence[int]) -> Tuple[Delete, Any]:
+    """What the ORM does before deleting a task, for a whole batch: drop
+    its project links, and detach its sub-tasks (returning their ids)."""
+    return (
+        delete(models.project_task_table).where(
+            models.project_task_table.c.task_id.in_(task_ids)
+        ),
+        update(models.Task)
+        .where(models.Task.parent_id.in_(task_ids))
+        .values(parent_id=None)
+        .returning(models.Task.id)
+        .execution_options(synchronize_session=False),
+    )
+
+
+def delete_tasks(task_ids: Sequence[int]) -> Any:
+    return (
+        delete(models.Task)
+        .where(models.Task.id.in_(task_ids))
+        .returning(models.Task.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def bulk_results(
+    ids: Iterable[int], found: Iterable[bool], done: schemas.BulkStatus
+) -> List[schemas.BulkRowResult]:
+    return [
+        schemas.BulkRowResult(
+            row=row,
+            id=row_id,
+            status=done if ok else schemas.BulkStatus.not_found,
+        )
+        for row, (row_id, ok) in enumerate(zip(ids, found))
+    ]
+
+
+# ---------------------------
+# Write modes
+# ---------------------------
+# "orm" loads the row, sets its attributes, commits and refreshes it: up
+# to four round trips per write. "returning" sends one INSERT, UPDATE or
+# DELETE ... RETURNING (SQLite 3.35+) and answers from the returned row.
+WRITE_MODES = ("orm", "returning")
+WRITE_MODE = os.getenv("WRITE_MODE", "orm")
+if WRITE_MODE not in WRITE_MODES:
+    raise ValueError(
+        f"Unknown WRITE_MODE {WRITE_MODE!r}; expected one of {WRITE_MODES}"
+    )
+RETURNING_WRITES = WRITE_MODE == "returning"
+
+
+def insert_row(model: Any, values: Dict[str, Any]) -> Insert:
+    table = model.__table__
+    return insert(table).values(**values).returning(*table.c)
+
+
+def update_row(model: Any, row_id: int, values: Dict[str, Any]) -> Executable:
+    """UPDATE ... RETURNING of one row, or a plain SELECT when there is
+    nothing to set, so ``updated_at`` only moves on a real change."""
+    table = model.__table__
+    if not values:
+        return select_row(model, row_id)
+    return (
+        update(table)
+        .where(table.c.id == row_id)
+        .values(**values)
+        .returning(*table.c)
+    )
+
+
+def delete_row(model: Any, row_id: int) -> Delete:
+    table = model.__table__
+    return delete(table).where(table.c.id == row_id).returning(table.c.id)
+
+
+def unlink_project(project_id: int) -> Delete:
+    """What the ORM does before deleting a project: drop its task links."""
+    return delete(models.project_task_table).where(
+        models.project_task_table.c.project_id == project_id
+    )
+
+
+# ---------------------------
+# Entity cache
+# ---------------------------
+# Rows by id behind get(), shared by every session of the app, sync or
+# async. A cached row holds only its own table's columns, so a write
+# invalidates exactly the rows whose columns it changed.
+PROJECT_CACHE = entity_cache()
+TASK_CACHE = entity_cache()
+
+
+def select_row(model: Any, row_id: int) -> Select:
+    table = model.__table__
+    return select(*table.c).where(table.c.id == row_id)
+
+
+def clear_caches() -> None:
+    for cache in (PROJECT_CACHE, TASK_CACHE):
+        if cache is not None:
+            cache.clear()
+
+
+def cache_stats() -> Dict[str, Optional[Dict[str, int]]]:
+    """Hit and miss counters per entity; None when the cache is off."""
+    caches = {"projects": PROJECT_CACHE, "tasks": TASK_CACHE}
+    return {
+        name: None if cache is None else cache.stats()
+        for name, cache in caches.items()
+    }
 
 
 # ---------------------------
 # Project CRUD
 # ---------------------------
 class ProjectCRUD:
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        returning: bool = RETURNING_WRITES,
+        cache: Optional[EntityCache] = PROJECT_CACHE,
+    ):
         self.db = db
+        self.returning = returning
+        self.cache = cache
+
+    def get(
+        self, project_id: int, include: Include = frozenset()
+    ) -> Union[models.Project, Row, None]:
+        """The project, or None. Without ``include`` and with a cache, a
+        row read through the cache."""
+        if include or self.cache is None:
+            return self.load(project_id, include)
+        return self.cache.read_through(
+            project_id,
+            lambda: self.db.execute(
+                select_row(models.Project, project_id)
+            ).first(),
+        )
 
-    def get(self, project_id: int) -> Optional[models.Project]:
+    def load(
+        self, project_id: int, include: Include = frozenset()
+    ) -> Optional[models.Project]:
         return (
             self.db.query(models.Project)
+            .options(*eager(PROJECT_PATHS, include, joinedload))
             .filter(models.Project.id == project_id)
             .one_or_none()
         )
 
     def get_multi(
-        self, skip: int = 0, limit: int = 10
-    ) -> List[models.Project]:
-        return self.db.query(models.Project).offset(skip).limit(limit).all()
+        self,
+        page: PageQuery = PageQuery(),
+        limit: int = 10,
+        include: Include = frozenset(),
+        fields: Fields = frozenset(),
+    ) -> List[Union[models.Project, Row]]:
+        """Up to ``limit + 1`` projects from ``page``; see
+        ``page_statement``."""
+        result = self.db.execute(
+            page_statement(
+                models.Project, PROJECT_PATHS, page, limit, include, fields
+            )
+        )
+        if reads_rows(include, fields):
+            return result.all()
+        return result.scalars().all()
 
-    def create(self, project: schemas.ProjectCreate) -> models.Project:
+    def create(
+        self, project: schemas.ProjectCreate
+    ) -> Union[models.Project, Row]:
+        if self.returning:
+            values = project.model_dump()
+            row = self.db.execute(insert_row(models.Project, values)).one()
+            self.db.commit()
+            return row
         project_db = models.Project(**project.model_dump())
         self.db.add(project_db)
         self.db.commit()
@@ -32,23 +372,39 @@ class ProjectCRUD:
 
     def update(
         self, project_id: int, project: schemas.ProjectUpdate
-    ) -> Optional[models.Project]:
-        db_project = self.get(project_id)
+    ) -> Union[models.Project, Row, None]:
+        update_data = project.model_dump(exclude_unset=True)
+        if self.returning:
+            row = self.db.execute(
+                update_row(models.Project, project_id, update_data)
+            ).first()
+            self.db.commit()
+            invalidate(self.cache, project_id)
+            return row
+        db_project = self.load(project_id)
         if db_project is None:
             return None
-        update_data = project.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_project, key, value)
         self.db.commit()
+        invalidate(self.cache, project_id)
         self.db.refresh(db_project)
         return db_project
 
     def delete(self, project_id: int) -> bool:
-        project_db = self.get(project_id)
+        if self.returning:
+            self.db.execute(unlink_project(project_id))
+            row = self.db.execute(delete_row(models.Project, project_id))
+            deleted = row.first() is not None
+            self.db.commit()
+            invalidate(self.cache, project_id)
+            return deleted
+        project_db = self.load(project_id)
         if project_db is None:
             return False
         self.db.delete(project_db)
         self.db.commit()
+        invalidate(self.cache, project_id)
         return True
 
 
@@ -56,20 +412,62 @@ class ProjectCRUD:
 # Task CRUD
 # ---------------------------
 class TaskCRUD:
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        returning: bool = RETURNING_WRITES,
+        cache: Optional[EntityCache] = TASK_CACHE,
+    ):
         self.db = db
+        self.returning = returning
+        self.cache = cache
+
+    def get(
+        self, task_id: int, include: Include = frozenset()
+    ) -> Union[models.Task, Row, None]:
+        """The task, or None. Without ``include`` and with a cache, a row
+        read through the cache."""
+        if include or self.cache is None:
+            return self.load(task_id, include)
+        return self.cache.read_through(
+            task_id,
+            lambda: self.db.execute(select_row(models.Task, task_id)).first(),
+        )
 
-    def get(self, task_id: int) -> Optional[models.Task]:
+    def load(
+        self, task_id: int, include: Include = frozenset()
+    ) -> Optional[models.Task]:
         return (
             self.db.query(models.Task)
+            .options(*eager(TASK_PATHS, include, joinedload))
             .filter(models.Task.id == task_id)
             .first()
         )
 
-    def get_multi(self, skip: int = 0, limit: int = 100) -> List[models.Task]:
-        return self.db.query(models.Task).offset(skip).limit(limit).all()
+    def get_multi(
+        self,
+        page: PageQuery = PageQuery(),
+        limit: int = 100,
+        include: Include = frozenset(),
+        fields: Fields = frozenset(),
+    ) -> List[Union[models.Task, Row]]:
+        """Up to ``limit + 1`` tasks from ``page``; see
+        ``page_statement``."""
+        result = self.db.execute(
+            page_statement(
+                models.Task, TASK_PATHS, page, limit, include, fields
+            )
+        )
+        if reads_rows(include, fields):
+            return result.all()
+        return result.scalars().all()
 
-    def create(self, task: schemas.TaskCreate) -> models.Task:
+    def create(self, task: schemas.TaskCreate) -> Union[models.Task, Row]:
+        if self.returning:
+            values = task.model_dump()
+            row = self.db.execute(insert_row(models.Task, values)).one()
+            self.db.commit()
+            return row
         db_task = models.Task(**task.model_dump())
         self.db.add(db_task)
         self.db.commit()
@@ -78,29 +476,49 @@ class TaskCRUD:
 
     def update(
         self, task_id: int, task: schemas.TaskUpdate
-    ) -> Optional[models.Task]:
-        db_task = self.get(task_id)
+    ) -> Union[models.Task, Row, None]:
+        update_data = task.model_dump(exclude_unset=True)
+        if self.returning:
+            row = self.db.execute(
+                update_row(models.Task, task_id, update_data)
+            ).first()
+            self.db.commit()
+            invalidate(self.cache, task_id)
+            return row
+        db_task = self.load(task_id)
         if not db_task:
             return None
-        update_data = task.dict(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_task, key, value)
         self.db.commit()
+        invalidate(self.cache, task_id)
         self.db.refresh(db_task)
         return db_task
 
     def delete(self, task_id: int) -> bool:
-        db_task = self.get(task_id)
+        if self.returning:
+            links, detach = unlink_tasks([task_id])
+            self.db.execute(links)
+            detached = list(self.db.scalars(detach))
+            row = self.db.execute(delete_row(models.Task, task_id))
+            deleted = row.first() is not None
+            self.db.commit()
+            invalidate(self.cache, task_id, *detached)
+            return deleted
+        db_task = self.load(task_id)
         if not db_task:
             return False
+        # Flushing the delete sets these sub-tasks' parent_id to NULL.
+        detached = [sub_task.id for sub_task in db_task.sub_tasks]
         self.db.delete(db_task)
         self.db.commit()
+        invalidate(self.cache, task_id, *detached)
         return True
 
     def assign_to_project(
         self, task_id: int, project_id: int
     ) -> Optional[models.Task]:
-        db_task = self.get(task_id)
+        db_task = self.load(task_id)
         db_project = (
             self.db.query(models.Project)
             .filter(models.Project.id == project_id)
@@ -112,3 +530,402 @@ class TaskCRUD:
         self.db.commit()
         self.db.refresh(db_task)
         return db_task
+
+    def tree(self, task_id: int, max_depth: int) -> Optional[Dict[str, Any]]:
+        rows = self.db.execute(tree_statement(task_id, max_depth))
+        return nest(rows, max_depth)
+
+    def count_descendants(
+        self, task_id: int, max_depth: int
+    ) -> Optional[Tuple[int, int]]:
+        """(descendants, deepest level reached) down to ``max_depth``."""
+        count, depth = self.db.execute(
+            count_statement(task_id, max_depth)
+        ).one()
+        return None if depth is None else (count, depth)
+
+    def create_many(
+        self, tasks: List[schemas.TaskCreate], batch_size: int
+    ) -> List[schemas.BulkRowResult]:
+        """Insert ``tasks`` with one INSERT per batch, all in one
+        transaction."""
+        ids: List[int] = []
+        for batch in batches(tasks, batch_size):
+            rows = [task.model_dump() for task in batch]
+            ids.extend(sorted(self.db.scalars(insert_tasks(), rows)))
+        self.db.commit()
+        return bulk_results(ids, [True] * len(ids), schemas.BulkStatus.created)
+
+    def update_many(
+        self, tasks: List[schemas.TaskBulkUpdate], batch_size: int
+    ) -> List[schemas.BulkRowResult]:
+        """Update ``tasks`` by id with one executemany UPDATE per batch
+        (per set of changed columns), all in one transaction."""
+        found: List[bool] = []
+        for batch in batches(tasks, batch_size):
+            # The ORM's bulk UPDATE by primary key raises on a missing
+            # row, so find out first which ids exist.
+            existing = set(
+                self.db.scalars(
+                    select(models.Task.id).where(
+                        models.Task.id.in_([task.id for task in batch])
+                    )
+                )
+            )
+            rows = [
+                task.model_dump(exclude_unset=True)
+                for task in batch
+                if task.id in existing
+            ]
+            # A row with only its id has nothing to set.
+            rows = [row for row in rows if len(row) > 1]
+            if rows:
+                self.db.execute(update(models.Task), rows)
+            found.extend(task.id in existing for task in batch)
+        self.db.commit()
+        invalidate(self.cache, *(task.id for task in tasks))
+        return bulk_results(
+            [task.id for task in tasks], found, schemas.BulkStatus.updated
+        )
+
+    def delete_many(
+        self, task_ids: List[int], batch_size: int
+    ) -> List[schemas.BulkRowResult]:
+        """Delete ``task_ids`` with one ``DELETE ... WHERE id IN`` per
+        batch, all in one transaction."""
+        deleted = set()
+        detached: List[int] = []
+        for batch in batches(task_ids, batch_size):
+            links, detach = unlink_tasks(batch)
+            self.db.execute(links)
+            detached.extend(self.db.scalars(detach))
+            deleted.update(self.db.scalars(delete_tasks(batch)))
+        self.db.commit()
+        invalidate(self.cache, *deleted, *detached)
+        return bulk_results(
+            task_ids,
+            [task_id in deleted for task_id in task_ids],
+            schemas.BulkStatus.deleted,
+        )
+
+
+# ---------------------------
+# Async Project CRUD
+# ---------------------------
+class AsyncProjectCRUD:
+    """``ProjectCRUD`` on an ``AsyncSession``: the event loop serves other
+    requests while a query waits on the database."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        returning: bool = RETURNING_WRITES,
+        cache: Optional[EntityCache] = PROJECT_CACHE,
+    ):
+        self.db = db
+        self.returning = returning
+        self.cache = cache
+
+    async def get(
+        self, project_id: int, include: Include = frozenset()
+    ) -> Union[models.Project, Row, None]:
+        if include or self.cache is None:
+            return await self.load(project_id, include)
+        row, version = self.cache.lookup(project_id)
+        if row is None:
+            result = await self.db.execute(
+                select_row(models.Project, project_id)
+            )
+            row = result.first()
+            self.cache.fill(project_id, row, version)
+        return row
+
+    async def load(
+        self, project_id: int, include: Include = frozenset()
+    ) -> Optional[models.Project]:
+        result = await self.db.execute(
+            select(models.Project)
+            .options(*eager(PROJECT_PATHS, include, joinedload))
+            .where(models.Project.id == project_id)
+        )
+        # unique(): joined collections repeat the parent row.
+        return result.unique().scalar_one_or_none()
+
+    async def get_multi(
+        self,
+        page: PageQuery = PageQuery(),
+        limit: int = 10,
+        include: Include = frozenset(),
+        fields: Fields = frozenset(),
+    ) -> List[Union[models.Project, Row]]:
+        result = await self.db.execute(
+            page_statement(
+                models.Project, PROJECT_PATHS, page, limit, include, fields
+            )
+        )
+        if reads_rows(include, fields):
+            return result.all()
+        return result.scalars().all()
+
+    async def create(
+        self, project: schemas.ProjectCreate
+    ) -> Union[models.Project, Row]:
+        if self.returning:
+            values = project.model_dump()
+            result = await self.db.execute(insert_row(models.Project, values))
+            row = result.one()
+            await self.db.commit()
+            return row
+        project_db = models.Project(**project.model_dump())
+        self.db.add(project_db)
+        await self.db.commit()
+        await self.db.refresh(project_db)
+        return project_db
+
+    async def update(
+        self, project_id: int, project: schemas.ProjectUpdate
+    ) -> Union[models.Project, Row, None]:
+        update_data = project.model_dump(exclude_unset=True)
+        if self.returning:
+            result = await self.db.execute(
+                update_row(models.Project, project_id, update_data)
+            )
+            row = result.first()
+            await self.db.commit()
+            invalidate(self.cache, project_id)
+            return row
+        db_project = await self.load(project_id)
+        if db_project is None:
+            return None
+        for key, value in update_data.items():
+            setattr(db_project, key, value)
+        await self.db.commit()
+        invalidate(self.cache, project_id)
+        await self.db.refresh(db_project)
+        return db_project
+
+    async def delete(self, project_id: int) -> bool:
+        if self.returning:
+            await self.db.execute(unlink_project(project_id))
+            result = await self.db.execute(
+                delete_row(models.Project, project_id)
+            )
+            deleted = result.first() is not None
+            await self.db.commit()
+            invalidate(self.cache, project_id)
+            return deleted
+        project_db = await self.load(project_id)
+        if project_db is None:
+            return False
+        await self.db.delete(project_db)
+        await self.db.commit()
+        invalidate(self.cache, project_id)
+        return True
+
+
+# ---------------------------
+# Async Task CRUD
+# ---------------------------
+class AsyncTaskCRUD:
+    """``TaskCRUD`` on an ``AsyncSession``."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        returning: bool = RETURNING_WRITES,
+        cache: Optional[EntityCache] = TASK_CACHE,
+    ):
+        self.db = db
+        self.returning = returning
+        self.cache = cache
+
+    async def get(
+        self, task_id: int, include: Include = frozenset()
+    ) -> Union[models.Task, Row, None]:
+        if include or self.cache is None:
+            return await self.load(task_id, include)
+        row, version = self.cache.lookup(task_id)
+        if row is None:
+            result = await self.db.execute(select_row(models.Task, task_id))
+            row = result.first()
+            self.cache.fill(task_id, row, version)
+        return row
+
+    async def load(
+        self, task_id: int, include: Include = frozenset()
+    ) -> Optional[models.Task]:
+        result = await self.db.execute(
+            select(models.Task)
+            .options(*eager(TASK_PATHS, include, joinedload))
+            .where(models.Task.id == task_id)
+        )
+        return result.unique().scalars().first()
+
+    async def get_multi(
+        self,
+        page: PageQuery = PageQuery(),
+        limit: int = 100,
+        include: Include = frozenset(),
+        fields: Fields = frozenset(),
+    ) -> List[Union[models.Task, Row]]:
+        result = await self.db.execute(
+            page_statement(
+                models.Task, TASK_PATHS, page, limit, include, fields
+            )
+        )
+        if reads_rows(include, fields):
+            return result.all()
+        return result.scalars().all()
+
+    async def create(
+        self, task: schemas.TaskCreate
+    ) -> Union[models.Task, Row]:
+        if self.returning:
+            values = task.model_dump()
+            result = await self.db.execute(insert_row(models.Task, values))
+            row = result.one()
+            await self.db.commit()
+            return row
+        db_task = models.Task(**task.model_dump())
+        self.db.add(db_task)
+        await self.db.commit()
+        await self.db.refresh(db_task)
+        return db_task
+
+    async def update(
+        self, task_id: int, task: schemas.TaskUpdate
+    ) -> Union[models.Task, Row, None]:
+        update_data = task.model_dump(exclude_unset=True)
+        if self.returning:
+            result = await self.db.execute(
+                update_row(models.Task, task_id, update_data)
+            )
+            row = result.first()
+            await self.db.commit()
+            invalidate(self.cache, task_id)
+            return row
+        db_task = await self.load(task_id)
+        if not db_task:
+            return None
+        for key, value in update_data.items():
+            setattr(db_task, key, value)
+        await self.db.commit()
+        invalidate(self.cache, task_id)
+        await self.db.refresh(db_task)
+        return db_task
+
+    async def delete(self, task_id: int) -> bool:
+        if self.returning:
+            links, detach = unlink_tasks([task_id])
+            await self.db.execute(links)
+            detached = list(await self.db.scalars(detach))
+            result = await self.db.execute(delete_row(models.Task, task_id))
+            deleted = result.first() is not None
+            await self.db.commit()
+            invalidate(self.cache, task_id, *detached)
+            return deleted
+        db_task = await self.load(task_id)
+        if not db_task:
+            return False
+        # Flushing the delete sets these sub-tasks' parent_id to NULL;
+        # sub_tasks cannot be lazy-loaded here to find them.
+        detached = list(
+            await self.db.scalars(
+                select(models.Task.id).where(models.Task.parent_id == task_id)
+            )
+        )
+        await self.db.delete(db_task)
+        await self.db.commit()
+        invalidate(self.cache, task_id, *detached)
+        return True
+
+    async def assign_to_project(
+        self, task_id: int, project_id: int
+    ) -> Optional[models.Task]:
+        # Load the collection up front: it cannot be lazy-loaded on
+        # attribute access under an AsyncSession.
+        result = await self.db.execute(
+            select(models.Task)
+            .where(models.Task.id == task_id)
+            .options(selectinload(models.Task.projects))
+        )
+        db_task = result.scalars().first()
+        db_project = (
+            await self.db.execute(
+                select(models.Project).where(models.Project.id == project_id)
+            )
+        ).scalar_one_or_none()
+        if not db_task or db_project is None:
+            return None
+        db_task.projects.append(db_project)
+        await self.db.commit()
+        await self.db.refresh(db_task)
+        return db_task
+
+    async def tree(
+        self, task_id: int, max_depth: int
+    ) -> Optional[Dict[str, Any]]:
+        rows = await self.db.execute(tree_statement(task_id, max_depth))
+        return nest(rows, max_depth)
+
+    async def count_descendants(
+        self, task_id: int, max_depth: int
+    ) -> Optional[Tuple[int, int]]:
+        result = await self.db.execute(count_statement(task_id, max_depth))
+        count, depth = result.one()
+        return None if depth is None else (count, depth)
+
+    async def create_many(
+        self, tasks: List[schemas.TaskCreate], batch_size: int
+    ) -> List[schemas.BulkRowResult]:
+        ids: List[int] = []
+        for batch in batches(tasks, batch_size):
+            rows = [task.model_dump() for task in batch]
+            ids.extend(sorted(await self.db.scalars(insert_tasks(), rows)))
+        await self.db.commit()
+        return bulk_results(ids, [True] * len(ids), schemas.BulkStatus.created)
+
+    async def update_many(
+        self, tasks: List[schemas.TaskBulkUpdate], batch_size: int
+    ) -> List[schemas.BulkRowResult]:
+        found: List[bool] = []
+        for batch in batches(tasks, batch_size):
+            existing = set(
+                await self.db.scalars(
+                    select(models.Task.id).where(
+                        models.Task.id.in_([task.id for task in batch])
+                    )
+                )
+            )
+            rows = [
+                task.model_dump(exclude_unset=True)
+                for task in batch
+                if task.id in existing
+            ]
+            rows = [row for row in rows if len(row) > 1]
+            if rows:
+                await self.db.execute(update(models.Task), rows)
+            found.extend(task.id in existing for task in batch)
+        await self.db.commit()
+        invalidate(self.cache, *(task.id for task in tasks))
+        return bulk_results(
+            [task.id for task in tasks], found, schemas.BulkStatus.updated
+        )
+
+    async def delete_many(
+        self, task_ids: List[int], batch_size: int
+    ) -> List[schemas.BulkRowResult]:
+        deleted = set()
+        detached: List[int] = []
+        for batch in batches(task_ids, batch_size):
+            links, detach = unlink_tasks(batch)
+            await self.db.execute(links)
+            detached.extend(await self.db.scalars(detach))
+            deleted.update(await self.db.scalars(delete_tasks(batch)))
+        await self.db.commit()
+        invalidate(self.cache, *deleted, *detached)
+        return bulk_results(
+            task_ids,
+            [task_id in deleted for task_id in task_ids],
+            schemas.BulkStatus.deleted,
+        )
@@ -1,10 +1,22 @@
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from app.sqlite_engine import create_async_sqlite_engine, create_sqlite_engine
+
 DATABASE_URL = "sqlite:///./database.db"
+# Same database through aiosqlite, for the async routes.
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./database.db"
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_sqlite_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_sqlite_engine(ASYNC_DATABASE_URL)
+
+# expire_on_commit=False: an expired attribute would be reloaded lazily,
+# which an AsyncSession cannot do implicitly.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
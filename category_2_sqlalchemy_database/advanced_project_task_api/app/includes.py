@@ -0,0 +1,42 @@
+from typing import Annotated, Callable, FrozenSet, Optional
+
+from fastapi import HTTPException, Query, status
+
+# Relationships a route can embed in its response with ?include=.
+PROJECT_INCLUDES = ("tasks", "sub_tasks")
+TASK_INCLUDES = ("projects", "sub_tasks")
+
+Include = FrozenSet[str]
+
+
+def include_param(*allowed: str) -> Callable[..., Include]:
+    """Build a dependency parsing ``?include=a,b`` into a set of names
+    from ``allowed``, rejecting any other name with 400."""
+
+    def dependency(
+        include: Annotated[
+            Optional[str],
+            Query(
+                description="Comma-separated relationships to embed: "
+                + ", ".join(allowed)
+            ),
+        ] = None,
+    ) -> Include:
+        if not include:
+            return frozenset()
+        names = frozenset(
+            name.strip() for name in include.split(",") if name.strip()
+        )
+        unknown = names.difference(allowed)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot include: {', '.join(sorted(unknown))}",
+            )
+        return names
+
+    return dependency
+
+
+project_include = include_param(*PROJECT_INCLUDES)
+task_include = include_param(*TASK_INCLUDES)
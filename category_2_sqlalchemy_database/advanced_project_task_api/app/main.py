@@ -1,8 +1,14 @@
 # app/main.py
+import os
 from fastapi import FastAPI
-from app.routers import task, project
+from app import crud
+from app.routers import async_project, async_task, task, project
 from app.database import Base, engine
 
+# "sync" serves routes as plain functions on Starlette's threadpool;
+# "async" serves them on the event loop through an AsyncSession (aiosqlite).
+DB_MODE = os.getenv("DB_MODE", "sync")
+
 # ---------------------------
 # Create database tables
 # ---------------------------
@@ -20,8 +26,12 @@ app = FastAPI(
 # ---------------------------
 # Include Routers
 # ---------------------------
-app.include_router(project.router)
-app.include_router(task.router)
+if DB_MODE == "async":
+    app.include_router(async_project.router)
+    app.include_router(async_task.router)
+else:
+    app.include_router(project.router)
+    app.include_router(task.router)
 
 
 # ---------------------------
@@ -30,3 +40,10 @@ app.include_router(task.router)
 @app.get("/", tags=["Root"])
 def read_root():
     return {"message": "Welcome to Project & Task Management API"}
+
+
+@app.get("/cache", tags=["Root"])
+def read_cache_stats():
+    """Hits, misses, evictions and size of the entity caches (null for
+    each when ENTITY_CACHE=off)."""
+    return crud.cache_stats()
@@ -25,7 +25,15 @@ project_task_table = Table(
     "project_task",
     Base.metadata,
     Column("project_id", Integer, ForeignKey("projects.id"), primary_key=True),
-    Column("task_id", Integer, ForeignKey("tasks.id"), primary_key=True),
+    # The primary key index leads with project_id; lookups by task (a
+    # task's projects, unlinking a deleted task) need their own index.
+    Column(
+        "task_id",
+        Integer,
+        ForeignKey("tasks.id"),
+        primary_key=True,
+        index=True,
+    ),
 )
 
 
@@ -36,7 +44,7 @@ class Project(Base):
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(Text)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow
+        DateTime, default=datetime.utcnow, index=True
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -57,10 +65,10 @@ class Task(Base):
         Enum(TaskStatus), default=TaskStatus.pending
     )
     parent_id: Mapped[Optional[int]] = mapped_column(
-        Integer, ForeignKey("tasks.id"), nullable=True
+        Integer, ForeignKey("tasks.id"), nullable=True, index=True
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow
+        DateTime, default=datetime.utcnow, index=True
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -69,6 +77,11 @@ class Task(Base):
     projects: Mapped[List["Project"]] = relationship(
         "Project", secondary=project_task_table, back_populates="tasks"
     )
+    # remote_side marks parent as the many-to-one side; on sub_tasks it
+    # would turn the collection into a reference to the parent.
     sub_tasks: Mapped[List["Task"]] = relationship(
-        "Task", backref="parent", remote_side=[id]
+        "Task", back_populates="parent"
+    )
+    parent: Mapped[Optional["Task"]] = relationship(
+        "Task", back_populates="sub_tasks", remote_side=[id]
     )
@@ -0,0 +1,113 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated, Any, List, Literal, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+PageSize = Annotated[
+    int,
+    Query(
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description=f"Items per page (at most {MAX_PAGE_SIZE})",
+    ),
+]
+
+SortKey = Literal["id", "created_at"]
+
+Statement = TypeVar("Statement")
+
+
+@dataclass(frozen=True)
+class PageQuery:
+    sort: SortKey = "id"
+    # Sort key of the last row of the previous page: (id,) or
+    # (created_at, id). None for the first page.
+    after: Optional[Tuple[Any, ...]] = None
+
+
+def encode_cursor(sort: SortKey, row: Any) -> str:
+    if sort == "id":
+        values = [row.id]
+    else:
+        values = [row.created_at.isoformat(), row.id]
+    raw = json.dumps([sort, *values]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> PageQuery:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    # binascii.Error, UnicodeDecodeError and JSONDecodeError are all
+    # ValueErrors.
+    decoded = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    match decoded:
+        case ["id", int(row_id)]:
+            return PageQuery(sort="id", after=(row_id,))
+        case ["created_at", str(created_at), int(row_id)]:
+            return PageQuery(
+                sort="created_at",
+                after=(datetime.fromisoformat(created_at), row_id),
+            )
+    raise ValueError("Invalid cursor")
+
+
+def page_query(
+    sort: Annotated[
+        SortKey, Query(description="Column to page through, oldest first")
+    ] = "id",
+    cursor: Annotated[
+        Optional[str],
+        Query(description="Opaque next_cursor from the previous page"),
+    ] = None,
+) -> PageQuery:
+    """Dependency turning the ``sort`` and ``cursor`` query params into
+    where the page starts."""
+    if cursor is None:
+        return PageQuery(sort=sort)
+    try:
+        query = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    if query.sort != sort:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cursor was issued for sort={query.sort}",
+        )
+    return query
+
+
+def keyset(
+    statement: Statement, model: Any, page: PageQuery, limit: int
+) -> Statement:
+    """Restrict a ``Query`` or ``select()`` of ``model`` to the page after
+    ``page.after``.
+
+    Seeks on the sort key instead of using OFFSET, so SQLite starts at the
+    right index entry rather than reading and discarding every earlier
+    row. One row beyond ``limit`` is fetched to tell whether another page
+    follows; ``to_page`` drops it.
+    """
+    if page.sort == "id":
+        columns = (model.id,)
+    else:
+        columns = (model.created_at, model.id)
+    if page.after is not None:
+        # (created_at, id) > (?, ?): ties on created_at fall back to id.
+        statement = statement.where(tuple_(*columns) > tuple_(*page.after))
+    return statement.order_by(*columns).limit(limit + 1)
+
+
+def to_page(rows: List[Any], page: PageQuery, limit: int) -> dict:
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(page.sort, items[-1])
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,103 @@
+# app/routers/async_project.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Annotated
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import schemas, crud
+from app.includes import Include, project_include
+from app.fields import Fields, fields_param, json_response, page_of
+from app.pagination import (
+    DEFAULT_PAGE_SIZE,
+    PageQuery,
+    PageSize,
+    page_query,
+    to_page,
+)
+from app.deps import get_async_db
+
+router = APIRouter(prefix="/projects", tags=["Projects"])
+project_fields = fields_param(*schemas.ProjectResponse.model_fields)
+
+
+# ---------------------------
+# Project Routes
+# ---------------------------
+@router.post(
+    "/",
+    response_model=schemas.ProjectResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_project(
+    project: schemas.ProjectCreate, db: AsyncSession = Depends(get_async_db)
+):
+    return await crud.AsyncProjectCRUD(db).create(project)
+
+
+@router.get(
+    "/",
+    response_model=schemas.ProjectPage,
+    status_code=status.HTTP_200_OK,
+)
+async def get_projects(
+    page: Annotated[PageQuery, Depends(page_query)],
+    include: Annotated[Include, Depends(project_include)],
+    fields: Annotated[Fields, Depends(project_fields)],
+    limit: PageSize = DEFAULT_PAGE_SIZE,
+    db: AsyncSession = Depends(get_async_db),
+):
+    projects = await crud.AsyncProjectCRUD(db).get_multi(
+        page=page, limit=limit, include=include, fields=fields
+    )
+    detail = schemas.project_detail(include, fields)
+    return json_response(page_of(detail), to_page(projects, page, limit))
+
+
+@router.get(
+    "/{project_id}",
+    response_model=schemas.ProjectDetail,
+    response_model_exclude_unset=True,
+    status_code=status.HTTP_200_OK,
+)
+async def get_project(
+    project_id: int,
+    include: Annotated[Include, Depends(project_include)],
+    db: AsyncSession = Depends(get_async_db),
+):
+    project = await crud.AsyncProjectCRUD(db).get(project_id, include=include)
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
+        )
+    return schemas.project_detail(include).model_validate(project)
+
+
+@router.put(
+    "/{project_id}",
+    response_model=schemas.ProjectResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def update_project(
+    project_id: int,
+    project: schemas.ProjectUpdate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    updated_project = await crud.AsyncProjectCRUD(db).update(
+        project_id, project
+    )
+    if not updated_project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
+        )
+    return updated_project
+
+
+@router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_project(
+    project_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    success = await crud.AsyncProjectCRUD(db).delete(project_id)
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
+        )
+    return None
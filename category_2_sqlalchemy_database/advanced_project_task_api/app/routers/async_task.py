@@ -0,0 +1,223 @@
+# app/routers/async_task.py
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Annotated, List
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import schemas, crud
+from app.bulk import DEFAULT_BATCH_SIZE, BatchSize, ids_param
+from app.includes import Include, task_include
+from app.fields import Fields, fields_param, json_response, page_of
+from app.pagination import (
+    DEFAULT_PAGE_SIZE,
+    PageQuery,
+    PageSize,
+    page_query,
+    to_page,
+)
+from app.deps import get_async_db
+
+router = APIRouter(prefix="/tasks", tags=["Tasks"])
+task_fields = fields_param(*schemas.TaskResponse.model_fields)
+
+
+# ---------------------------
+# Task Routes
+# ---------------------------
+@router.post(
+    "/",
+    response_model=schemas.TaskResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_task(
+    task: schemas.TaskCreate, db: AsyncSession = Depends(get_async_db)
+):
+    return await crud.AsyncTaskCRUD(db).create(task)
+
+
+@router.get(
+    "/",
+    response_model=schemas.TaskPage,
+    status_code=status.HTTP_200_OK,
+)
+async def get_tasks(
+    page: Annotated[PageQuery, Depends(page_query)],
+    include: Annotated[Include, Depends(task_include)],
+    fields: Annotated[Fields, Depends(task_fields)],
+    limit: PageSize = DEFAULT_PAGE_SIZE,
+    db: AsyncSession = Depends(get_async_db),
+):
+    tasks = await crud.AsyncTaskCRUD(db).get_multi(
+        page=page, limit=limit, include=include, fields=fields
+    )
+    detail = schemas.task_detail(include, fields)
+    return json_response(page_of(detail), to_page(tasks, page, limit))
+
+
+# Declared before /{task_id} so "bulk" is not read as a task id.
+@router.post(
+    "/bulk",
+    response_model=schemas.BulkResult,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_tasks(
+    tasks: List[schemas.TaskCreate],
+    batch_size: BatchSize = DEFAULT_BATCH_SIZE,
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        results = await crud.AsyncTaskCRUD(db).create_many(tasks, batch_size)
+    except IntegrityError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch rolled back: {exc.orig}",
+        )
+    return schemas.BulkResult.from_rows(results)
+
+
+@router.patch(
+    "/bulk",
+    response_model=schemas.BulkResult,
+    status_code=status.HTTP_200_OK,
+)
+async def update_tasks(
+    tasks: List[schemas.TaskBulkUpdate],
+    batch_size: BatchSize = DEFAULT_BATCH_SIZE,
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        results = await crud.AsyncTaskCRUD(db).update_many(tasks, batch_size)
+    except IntegrityError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch rolled back: {exc.orig}",
+        )
+    return schemas.BulkResult.from_rows(results)
+
+
+@router.delete(
+    "/bulk",
+    response_model=schemas.BulkResult,
+    status_code=status.HTTP_200_OK,
+)
+async def delete_tasks(
+    ids: Annotated[List[int], Depends(ids_param)],
+    batch_size: BatchSize = DEFAULT_BATCH_SIZE,
+    db: AsyncSession = Depends(get_async_db),
+):
+    results = await crud.AsyncTaskCRUD(db).delete_many(ids, batch_size)
+    return schemas.BulkResult.from_rows(results)
+
+
+@router.get(
+    "/{task_id}",
+    response_model=schemas.TaskDetail,
+    response_model_exclude_unset=True,
+    status_code=status.HTTP_200_OK,
+)
+async def get_task(
+    task_id: int,
+    include: Annotated[Include, Depends(task_include)],
+    db: AsyncSession = Depends(get_async_db),
+):
+    task = await crud.AsyncTaskCRUD(db).get(task_id, include=include)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+        )
+    return schemas.task_detail(include).model_validate(task)
+
+
+MaxDepth = Annotated[
+    int,
+    Query(
+        ge=0,
+        le=crud.MAX_TREE_DEPTH,
+        description="Levels below the task to expand "
+        f"(at most {crud.MAX_TREE_DEPTH})",
+    ),
+]
+
+
+@router.get(
+    "/{task_id}/tree",
+    response_model=schemas.TaskTree,
+    status_code=status.HTTP_200_OK,
+)
+async def get_task_tree(
+    task_id: int,
+    max_depth: MaxDepth = crud.MAX_TREE_DEPTH,
+    db: AsyncSession = Depends(get_async_db),
+):
+    tree = await crud.AsyncTaskCRUD(db).tree(task_id, max_depth)
+    if tree is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+        )
+    return tree
+
+
+@router.get(
+    "/{task_id}/tree/count",
+    response_model=schemas.TaskTreeCount,
+    status_code=status.HTTP_200_OK,
+)
+async def count_task_descendants(
+    task_id: int,
+    max_depth: MaxDepth = crud.MAX_TREE_DEPTH,
+    db: AsyncSession = Depends(get_async_db),
+):
+    counted = await crud.AsyncTaskCRUD(db).count_descendants(
+        task_id, max_depth
+    )
+    if counted is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+        )
+    descendants, depth = counted
+    return {"task_id": task_id, "descendants": descendants, "depth": depth}
+
+
+@router.put(
+    "/{task_id}",
+    response_model=schemas.TaskResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def update_task(
+    task_id: int,
+    task: schemas.TaskUpdate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    updated_task = await crud.AsyncTaskCRUD(db).update(task_id, task)
+    if not updated_task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+        )
+    return updated_task
+
+
+@router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_task(task_id: int, db: AsyncSession = Depends(get_async_db)):
+    success = await crud.AsyncTaskCRUD(db).delete(task_id)
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+        )
+    return None
+
+
+@router.post(
+    "/{task_id}/assign/{project_id}",
+    response_model=schemas.TaskResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def assign_task_to_project(
+    task_id: int, project_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    task = await crud.AsyncTaskCRUD(db).assign_to_project(task_id, project_id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task or Project not found",
+        )
+    return task
@@ -1,12 +1,22 @@
 # app/routers/project.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from typing import Annotated
 from sqlalchemy.orm import Session
 
 from app import schemas, crud
+from app.includes import Include, project_include
+from app.fields import Fields, fields_param, json_response, page_of
+from app.pagination import (
+    DEFAULT_PAGE_SIZE,
+    PageQuery,
+    PageSize,
+    page_query,
+    to_page,
+)
 from app.deps import get_db
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
+project_fields = fields_param(*schemas.ProjectResponse.model_fields)
 
 
 # ---------------------------
@@ -25,27 +35,40 @@ def create_project(
 
 @router.get(
     "/",
-    response_model=List[schemas.ProjectResponse],
+    response_model=schemas.ProjectPage,
     status_code=status.HTTP_200_OK,
 )
 def get_projects(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    page: Annotated[PageQuery, Depends(page_query)],
+    include: Annotated[Include, Depends(project_include)],
+    fields: Annotated[Fields, Depends(project_fields)],
+    limit: PageSize = DEFAULT_PAGE_SIZE,
+    db: Session = Depends(get_db),
 ):
-    return crud.ProjectCRUD(db).get_multi(skip=skip, limit=limit)
+    projects = crud.ProjectCRUD(db).get_multi(
+        page=page, limit=limit, include=include, fields=fields
+    )
+    detail = schemas.project_detail(include, fields)
+    return json_response(page_of(detail), to_page(projects, page, limit))
 
 
 @router.get(
     "/{project_id}",
-    response_model=schemas.ProjectResponse,
+    response_model=schemas.ProjectDetail,
+    response_model_exclude_unset=True,
     status_code=status.HTTP_200_OK,
 )
-def get_project(project_id: int, db: Session = Depends(get_db)):
-    project = crud.ProjectCRUD(db).get(project_id)
+def get_project(
+    project_id: int,
+    include: Annotated[Include, Depends(project_include)],
+    db: Session = Depends(get_db),
+):
+    project = crud.ProjectCRUD(db).get(project_id, include=include)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
         )
-    return project
+    return schemas.project_detail(include).model_validate(project)
 
 
 @router.put(
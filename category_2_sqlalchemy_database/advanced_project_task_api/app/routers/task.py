@@ -1,12 +1,24 @@
 # app/routers/task.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Annotated, List
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app import schemas, crud
+from app.bulk import DEFAULT_BATCH_SIZE, BatchSize, ids_param
+from app.includes import Include, task_include
+from app.fields import Fields, fields_param, json_response, page_of
+from app.pagination import (
+    DEFAULT_PAGE_SIZE,
+    PageQuery,
+    PageSize,
+    page_query,
+    to_page,
+)
 from app.deps import get_db
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
+task_fields = fields_param(*schemas.TaskResponse.model_fields)
 
 
 # ---------------------------
@@ -23,25 +35,143 @@ def create_task(task: schemas.TaskCreate, db: Session = Depends(get_db)):
 
 @router.get(
     "/",
-    response_model=List[schemas.TaskResponse],
+    response_model=schemas.TaskPage,
     status_code=status.HTTP_200_OK,
 )
-def get_tasks(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.TaskCRUD(db).get_multi(skip=skip, limit=limit)
+def get_tasks(
+    page: Annotated[PageQuery, Depends(page_query)],
+    include: Annotated[Include, Depends(task_include)],
+    fields: Annotated[Fields, Depends(task_fields)],
+    limit: PageSize = DEFAULT_PAGE_SIZE,
+    db: Session = Depends(get_db),
+):
+    tasks = crud.TaskCRUD(db).get_multi(
+        page=page, limit=limit, include=include, fields=fields
+    )
+    detail = schemas.task_detail(include, fields)
+    return json_response(page_of(detail), to_page(tasks, page, limit))
+
+
+# Declared before /{task_id} so "bulk" is not read as a task id.
+@router.post(
+    "/bulk",
+    response_model=schemas.BulkResult,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_tasks(
+    tasks: List[schemas.TaskCreate],
+    batch_size: BatchSize = DEFAULT_BATCH_SIZE,
+    db: Session = Depends(get_db),
+):
+    try:
+        results = crud.TaskCRUD(db).create_many(tasks, batch_size)
+    except IntegrityError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch rolled back: {exc.orig}",
+        )
+    return schemas.BulkResult.from_rows(results)
+
+
+@router.patch(
+    "/bulk",
+    response_model=schemas.BulkResult,
+    status_code=status.HTTP_200_OK,
+)
+def update_tasks(
+    tasks: List[schemas.TaskBulkUpdate],
+    batch_size: BatchSize = DEFAULT_BATCH_SIZE,
+    db: Session = Depends(get_db),
+):
+    try:
+        results = crud.TaskCRUD(db).update_many(tasks, batch_size)
+    except IntegrityError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch rolled back: {exc.orig}",
+        )
+    return schemas.BulkResult.from_rows(results)
+
+
+@router.delete(
+    "/bulk",
+    response_model=schemas.BulkResult,
+    status_code=status.HTTP_200_OK,
+)
+def delete_tasks(
+    ids: Annotated[List[int], Depends(ids_param)],
+    batch_size: BatchSize = DEFAULT_BATCH_SIZE,
+    db: Session = Depends(get_db),
+):
+    results = crud.TaskCRUD(db).delete_many(ids, batch_size)
+    return schemas.BulkResult.from_rows(results)
 
 
 @router.get(
     "/{task_id}",
-    response_model=schemas.TaskResponse,
+    response_model=schemas.TaskDetail,
+    response_model_exclude_unset=True,
     status_code=status.HTTP_200_OK,
 )
-def get_task(task_id: int, db: Session = Depends(get_db)):
-    task = crud.TaskCRUD(db).get(task_id)
+def get_task(
+    task_id: int,
+    include: Annotated[Include, Depends(task_include)],
+    db: Session = Depends(get_db),
+):
+    task = crud.TaskCRUD(db).get(task_id, include=include)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
         )
-    return task
+    return schemas.task_detail(include).model_validate(task)
+
+
+MaxDepth = Annotated[
+    int,
+    Query(
+        ge=0,
+        le=crud.MAX_TREE_DEPTH,
+        description="Levels below the task to expand "
+        f"(at most {crud.MAX_TREE_DEPTH})",
+    ),
+]
+
+
+@router.get(
+    "/{task_id}/tree",
+    response_model=schemas.TaskTree,
+    status_code=status.HTTP_200_OK,
+)
+def get_task_tree(
+    task_id: int,
+    max_depth: MaxDepth = crud.MAX_TREE_DEPTH,
+    db: Session = Depends(get_db),
+):
+    tree = crud.TaskCRUD(db).tree(task_id, max_depth)
+    if tree is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+        )
+    return tree
+
+
+@router.get(
+    "/{task_id}/tree/count",
+    response_model=schemas.TaskTreeCount,
+    status_code=status.HTTP_200_OK,
+)
+def count_task_descendants(
+    task_id: int,
+    max_depth: MaxDepth = crud.MAX_TREE_DEPTH,
+    db: Session = Depends(get_db),
+):
+    counted = crud.TaskCRUD(db).count_descendants(task_id, max_depth)
+    if counted is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+        )
+    descendants, depth = counted
+    return {"task_id": task_id, "descendants": descendants, "depth": depth}
 
 
 @router.put(
@@ -1,8 +1,11 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from functools import lru_cache
+from pydantic import BaseModel, Field, create_model
+from typing import Any, Dict, FrozenSet, Optional, List, Type
 from datetime import datetime
 from enum import Enum
 
+from app.fields import Fields, projection
+
 
 class TaskStatus(str, Enum):
     pending = "pending"
@@ -37,21 +40,6 @@ class TaskResponse(TaskBase):
         from_attributes = True
 
 
-# class TaskInDBBase(TaskBase):
-#     id: int
-#     created_at: datetime
-#     updated_at: datetime
-
-
-# class Config:
-#     from_attributes = True
-
-
-# class TaskResponse(TaskInDBBase):
-#     projects: List["ProjectResponse"] = []
-#     sub_tasks: List["TaskResponse"] = []
-
-
 class ProjectBase(BaseModel):
     name: str
     description: Optional[str] = None
@@ -75,14 +63,121 @@ class ProjectResponse(ProjectBase):
         from_attributes = True
 
 
-# class ProjectInDBBase(ProjectBase):
-#     id: int
-#     created_at: datetime
-#     updated_at: datetime
+# ---------------------------
+# Nested responses (?include=)
+# ---------------------------
+class TaskDetail(TaskResponse):
+    projects: Optional[List[ProjectResponse]] = None
+    sub_tasks: Optional[List[TaskResponse]] = None
+
+
+class ProjectDetail(ProjectResponse):
+    tasks: Optional[List[TaskDetail]] = None
+
+
+@lru_cache
+def task_detail(
+    include: FrozenSet[str], fields: Fields = frozenset()
+) -> Type[BaseModel]:
+    """``TaskResponse``, cut down to ``fields`` if any, plus exactly the
+    relationships in ``include``.
+
+    Validating from an ORM object reads only the declared fields, so
+    relationships that were not eager-loaded are never touched (and never
+    lazy-loaded, one query per row). Single reads return these through
+    ``TaskDetail`` with ``response_model_exclude_unset``, so fields that
+    were not included are left out of the response; lists serialize them
+    directly (see ``json_response``).
+    """
+    relationships: Dict[str, Any] = {}
+    if "projects" in include:
+        relationships["projects"] = (List[ProjectResponse], ...)
+    if "sub_tasks" in include:
+        relationships["sub_tasks"] = (List[TaskResponse], ...)
+    base = projection(TaskResponse, fields)
+    if not relationships:
+        return base
+    return create_model("TaskDetail", __base__=base, **relationships)
+
+
+@lru_cache
+def project_detail(
+    include: FrozenSet[str], fields: Fields = frozenset()
+) -> Type[BaseModel]:
+    """``ProjectResponse``, cut down to ``fields`` if any, plus its tasks
+    if ``include`` has "tasks", each with its sub-tasks if it has
+    "sub_tasks" (which implies "tasks"). ``fields`` applies to the
+    project, not to its tasks."""
+    base = projection(ProjectResponse, fields)
+    if not include:
+        return base
+    task = task_detail(include & {"sub_tasks"})
+    return create_model(
+        "ProjectDetail", __base__=base, tasks=(List[task], ...)
+    )
+
+
+# ---------------------------
+# Task trees
+# ---------------------------
+class TaskTree(TaskResponse):
+    sub_tasks: Optional[List["TaskTree"]] = Field(
+        ...,
+        description="Child tasks; null when they lie below max_depth",
+    )
+
+
+class TaskTreeCount(BaseModel):
+    task_id: int
+    descendants: int
+    depth: int = Field(..., description="Deepest level below the task")
+
+
+# ---------------------------
+# Bulk writes
+# ---------------------------
+class TaskBulkUpdate(TaskUpdate):
+    id: int
+
+
+class BulkStatus(str, Enum):
+    created = "created"
+    updated = "updated"
+    deleted = "deleted"
+    not_found = "not_found"
+
+
+class BulkRowResult(BaseModel):
+    row: int = Field(..., description="Zero-based position in the batch")
+    id: int
+    status: BulkStatus
+
+
+class BulkResult(BaseModel):
+    succeeded: int = Field(..., description="Rows written")
+    failed: int = Field(..., description="Rows whose id was not found")
+    results: List[BulkRowResult]
+
+    @classmethod
+    def from_rows(cls, results: List[BulkRowResult]) -> "BulkResult":
+        failed = sum(r.status is BulkStatus.not_found for r in results)
+        return cls(
+            succeeded=len(results) - failed, failed=failed, results=results
+        )
+
 
-#     class Config:
-#         from_attributes = True
+# ---------------------------
+# Pages
+# ---------------------------
+class TaskPage(BaseModel):
+    items: List[TaskDetail]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as ?cursor= to fetch the next page"
+    )
 
 
-# class ProjectResponse(ProjectInDBBase):
-#     tasks: List[TaskResponse] = []
+class ProjectPage(BaseModel):
+    items: List[ProjectDetail]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as ?cursor= to fetch the next page"
+    )
@@ -0,0 +1,125 @@
+"""Rows per second through the single-row CRUD path and the bulk one.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_bulk
+    python -m benchmarks.bench_bulk --rows 20000 --batch-sizes 100 1000
+
+Each run starts from a fresh SQLite file with the app's default engine
+profile. "single" calls ``TaskCRUD.create``, ``update`` and ``delete``
+once per row: one transaction per row, plus the SELECTs ``refresh`` and
+the lookups issue. "bulk" calls ``create_many``, ``update_many`` and
+``delete_many`` on the same rows: one statement per batch and one
+transaction for the lot.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.database import Base
+from app.sqlite_engine import create_sqlite_engine
+
+
+def payloads(rows: int) -> List[schemas.TaskCreate]:
+    return [
+        schemas.TaskCreate(title=f"task {i}", description="bulk")
+        for i in range(rows)
+    ]
+
+
+def single(
+    tasks: crud.TaskCRUD, new: List[schemas.TaskCreate], _: int
+) -> List[Callable[[], None]]:
+    ids: List[int] = []
+
+    def create():
+        ids.extend(tasks.create(task).id for task in new)
+
+    def update():
+        for task_id in ids:
+            tasks.update(task_id, schemas.TaskUpdate(status="done"))
+
+    def delete():
+        for task_id in ids:
+            tasks.delete(task_id)
+
+    return [create, update, delete]
+
+
+def bulk(
+    tasks: crud.TaskCRUD, new: List[schemas.TaskCreate], batch_size: int
+) -> List[Callable[[], None]]:
+    ids: List[int] = []
+
+    def create():
+        ids.extend(r.id for r in tasks.create_many(new, batch_size))
+
+    def update():
+        changes = [
+            schemas.TaskBulkUpdate(id=task_id, status="done")
+            for task_id in ids
+        ]
+        tasks.update_many(changes, batch_size)
+
+    def delete():
+        tasks.delete_many(ids, batch_size)
+
+    return [create, update, delete]
+
+
+def run(path, build, new, batch_size) -> List[str]:
+    engine = create_sqlite_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    cells = []
+    with Session(engine) as session:
+        for step in build(crud.TaskCRUD(session), new, batch_size):
+            statements = 0
+            start = time.perf_counter()
+            step()
+            elapsed = time.perf_counter() - start
+            session.expunge_all()
+            cells.append(f"{len(new) / elapsed:>10,.0f} | {statements:>7,}")
+    engine.dispose()
+    return cells
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[100, 500, 1000]
+    )
+    args = parser.parse_args()
+    new = payloads(args.rows)
+
+    print(
+        f"{args.rows:,} rows; rows/s and SQL statements per operation\n"
+        f"{'path':>12} | {'create':>10} | {'stmts':>7} | "
+        f"{'update':>10} | {'stmts':>7} | {'delete':>10} | {'stmts':>7}"
+    )
+    runs = [("single", single, 1)] + [
+        (f"bulk {size}", bulk, size) for size in args.batch_sizes
+    ]
+    for label, build, batch_size in runs:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bench.db")
+            cells = run(path, build, new, batch_size)
+        print(f"{label:>12} | " + " | ".join(cells))
+
+
+if __name__ == "__main__":
+    main_cli()
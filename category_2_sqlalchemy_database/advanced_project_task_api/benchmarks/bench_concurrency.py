@@ -0,0 +1,177 @@
+"""Throughput of the sync and async routes under concurrent clients.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_concurrency
+    python -m benchmarks.bench_concurrency --clients 50 200 --requests 2000
+
+Each mode serves the task and project routers against its own fresh
+SQLite file, prefilled with tasks. ``--clients`` callers share
+``--requests`` requests: mostly ``GET /tasks/{id}`` plus one
+``POST /tasks/`` in every ``--write-every``. Requests go through httpx's
+in-process ASGI transport, so the numbers show how the routes are
+scheduled (threadpool against event loop), not network cost.
+
+Both engines keep SQLAlchemy's default pool of 15 connections. In sync
+mode, once every threadpool thread is blocked waiting for a connection,
+the sessions holding the connections cannot be closed either, because
+``get_db``'s cleanup needs a threadpool thread too. Only the pool timeout
+breaks the stall, so it is lowered to ``--pool-timeout`` seconds and
+requests that hit it are counted as errors.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.database import Base
+from app.deps import get_async_db, get_db
+from app.routers import async_project, async_task, project, task
+
+MODES = ("sync", "async")
+
+
+def build_app(
+    mode: str, path: str, prefill: int, pool_timeout: float
+) -> FastAPI:
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_timeout=pool_timeout,
+    )
+    Base.metadata.create_all(bind=engine)
+    # Rows cached from the previous run's database would be stale here.
+    crud.clear_caches()
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO tasks (title, description, status, created_at, "
+            "updated_at) VALUES (?, ?, 'pending', datetime(), datetime())",
+            [(f"task {i}", "prefilled") for i in range(prefill)],
+        )
+
+    app = FastAPI()
+    if mode == "async":
+        sessions = async_sessionmaker(
+            create_async_engine(
+                f"sqlite+aiosqlite:///{path}", pool_timeout=pool_timeout
+            ),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+
+        async def get_bench_async_db():
+            async with sessions() as db:
+                yield db
+
+        app.include_router(async_project.router)
+        app.include_router(async_task.router)
+        app.dependency_overrides[get_async_db] = get_bench_async_db
+    else:
+        sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        def get_bench_db():
+            db = sessions()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.include_router(project.router)
+        app.include_router(task.router)
+        app.dependency_overrides[get_db] = get_bench_db
+    return app
+
+
+async def run_clients(
+    app: FastAPI, clients: int, requests: int, prefill: int, write_every: int
+) -> dict:
+    latencies = []
+    errors = 0
+    counter = iter(range(requests))
+    # Count app errors (e.g. pool timeouts) as 500s instead of raising.
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async def client(http: httpx.AsyncClient, rng: random.Random) -> None:
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            if i % write_every == 0:
+                response = await http.post(
+                    "/tasks/", json={"title": "bench", "description": "bench"}
+                )
+            else:
+                response = await http.get(f"/tasks/{rng.randint(1, prefill)}")
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as http:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(client(http, random.Random(n)) for n in range(clients))
+        )
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50": statistics.median(latencies) * 1e3,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1e3,
+        "errors": errors,
+    }
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--clients", type=int, nargs="+", default=[50, 200, 1000]
+    )
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--prefill", type=int, default=10_000)
+    parser.add_argument("--write-every", type=int, default=10)
+    parser.add_argument("--pool-timeout", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(
+        f"{'clients':>8} | {'mode':>6} | {'req/s':>8} | {'p50 ms':>8} | "
+        f"{'p99 ms':>8} | {'errors':>6}"
+    )
+    for clients in args.clients:
+        for mode in MODES:
+            with tempfile.TemporaryDirectory() as directory:
+                app = build_app(
+                    mode,
+                    os.path.join(directory, "bench.db"),
+                    args.prefill,
+                    args.pool_timeout,
+                )
+                result = asyncio.run(
+                    run_clients(
+                        app,
+                        clients,
+                        args.requests,
+                        args.prefill,
+                        args.write_every,
+                    )
+                )
+            print(
+                f"{clients:>8} | {mode:>6} | {result['rps']:>8,.0f} | "
+                f"{result['p50']:>8.1f} | {result['p99']:>8.1f} | "
+                f"{result['errors']:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,135 @@
+"""Read/write throughput of the engine profiles against the old engine.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_engine
+    python -m benchmarks.bench_engine --threads 4 16 --seconds 5
+
+Each run gets a fresh SQLite file prefilled with tasks. ``--threads``
+workers then call ``TaskCRUD`` directly for ``--seconds`` seconds, each
+with a session of its own per operation, as a request would. One
+operation in every ``--write-every`` is ``create`` (a committed INSERT)
+and the rest are ``get`` by id. "baseline" is the engine the app created
+before the profiles existed: rollback journal, synchronous=FULL and the
+pool SQLAlchemy picks by default. Operations that fail, e.g. with
+"database is locked", are counted as errors.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, schemas
+from app.database import Base
+from app.sqlite_engine import PROFILES, create_sqlite_engine
+
+ENGINES = ("baseline", *PROFILES)
+
+
+def build_engine(name: str, path: str, prefill: int) -> Engine:
+    url = f"sqlite:///{path}"
+    if name == "baseline":
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+    else:
+        engine = create_sqlite_engine(url, name)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO tasks (title, description, status, created_at, "
+            "updated_at) VALUES (?, ?, 'pending', datetime(), datetime())",
+            [(f"task {i}", "prefilled") for i in range(prefill)],
+        )
+    return engine
+
+
+def run_workers(
+    sessions: sessionmaker,
+    threads: int,
+    seconds: float,
+    prefill: int,
+    write_every: int,
+) -> dict:
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    task = schemas.TaskCreate(title="bench", description="bench")
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        done = {"reads": 0, "writes": 0, "errors": 0}
+        i = seed
+        while time.perf_counter() < deadline:
+            i += 1
+            with sessions() as db:
+                try:
+                    if i % write_every == 0:
+                        crud.TaskCRUD(db, cache=None).create(task)
+                        done["writes"] += 1
+                    else:
+                        crud.TaskCRUD(db, cache=None).get(
+                            rng.randint(1, prefill)
+                        )
+                        done["reads"] += 1
+                except OperationalError:
+                    done["errors"] += 1
+        with lock:
+            for key, value in done.items():
+                counts[key] += value
+
+    workers = [
+        threading.Thread(target=worker, args=(n,)) for n in range(threads)
+    ]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {
+        "ops": (counts["reads"] + counts["writes"]) / elapsed,
+        "writes": counts["writes"] / elapsed,
+        "errors": counts["errors"],
+    }
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--prefill", type=int, default=10_000)
+    parser.add_argument("--write-every", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'threads':>8} | {'engine':>10} | {'ops/s':>8} | {'writes/s':>8} | "
+        f"{'errors':>6}"
+    )
+    for threads in args.threads:
+        for name in ENGINES:
+            with tempfile.TemporaryDirectory() as directory:
+                engine = build_engine(
+                    name, os.path.join(directory, "bench.db"), args.prefill
+                )
+                result = run_workers(
+                    sessionmaker(autoflush=False, bind=engine),
+                    threads,
+                    args.seconds,
+                    args.prefill,
+                    args.write_every,
+                )
+                engine.dispose()
+            print(
+                f"{threads:>8} | {name:>10} | {result['ops']:>8,.0f} | "
+                f"{result['writes']:>8,.0f} | {result['errors']:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main_cli()
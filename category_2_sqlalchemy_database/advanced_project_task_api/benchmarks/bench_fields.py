@@ -0,0 +1,92 @@
+"""Cost of a task list page with every field against a ?fields= projection.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_fields
+    python -m benchmarks.bench_fields --rows 20000 --description 4096
+
+The tasks table is filled with ``--rows`` tasks, each with a
+``--description`` byte description, in a fresh SQLite file. Each line
+builds the body of ``GET /tasks/?limit=--limit`` the way the route does,
+``TaskCRUD.get_multi`` then ``json_response``, for one ``fields`` value,
+and shows the time per page and the size of the body.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.database import Base
+from app.fields import json_response, page_of
+from app.pagination import PageQuery, to_page
+from app.sqlite_engine import create_sqlite_engine
+
+FIELDS = ["", "id,title", "id,title,status", "description"]
+
+
+def fill(session: Session, rows: int, description: int) -> None:
+    session.connection().exec_driver_sql(
+        "INSERT INTO tasks (title, description, status, created_at, "
+        "updated_at) VALUES (?, ?, 'pending', '2024-01-01 00:00:00.000000', "
+        "'2024-01-01 00:00:00.000000')",
+        [(f"task {i}", "x" * description) for i in range(rows)],
+    )
+    session.commit()
+
+
+def page_body(session: Session, fields: str, limit: int) -> bytes:
+    names = frozenset(name for name in fields.split(",") if name)
+    page = PageQuery()
+    tasks = crud.TaskCRUD(session).get_multi(
+        page=page, limit=limit, fields=names
+    )
+    detail = schemas.task_detail(frozenset(), names)
+    body = json_response(page_of(detail), to_page(tasks, page, limit)).body
+    # A route's session would not outlive the request.
+    session.expunge_all()
+    return body
+
+
+def timed(operation: Callable[[], bytes], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        operation()
+    return (time.perf_counter() - start) / repeat
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--description", type=int, default=2_048)
+    parser.add_argument("--limit", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'fields':>16} | {'ms/page':>8} | {'KiB/page':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_sqlite_engine(
+            f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        )
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            fill(session, args.rows, args.description)
+            for fields in FIELDS:
+                body = page_body(session, fields, args.limit)
+                seconds = timed(
+                    lambda: page_body(session, fields, args.limit),
+                    args.repeat,
+                )
+                print(
+                    f"{fields or '(all)':>16} | {seconds * 1e3:>8.2f} | "
+                    f"{len(body) / 1024:>8.1f}"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main_cli()
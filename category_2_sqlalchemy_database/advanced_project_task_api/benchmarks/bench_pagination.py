@@ -0,0 +1,120 @@
+"""Latency of OFFSET pages against keyset pages, deep into a large table.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_pagination
+    python -m benchmarks.bench_pagination --depths 0 10000 --limit 50
+
+The tasks table is filled with ``max(--depths) + --limit`` rows in a
+fresh SQLite file. For each depth, "offset" runs the query ``get_multi``
+used before keyset pagination, ``OFFSET depth LIMIT limit``. The other two
+columns ask ``TaskCRUD.get_multi`` for the page starting after the
+``depth``-th row, sorted by id or by created_at. OFFSET should grow with
+the depth, and the keyset pages should stay flat.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.database import Base
+from app.pagination import PageQuery
+
+
+def fill(session: Session, size: int) -> None:
+    start = datetime(2024, 1, 1)
+    rows = (
+        (
+            f"task {i}",
+            "prefilled",
+            # SQLAlchemy's storage format for DateTime on SQLite.
+            (start + timedelta(milliseconds=i)).strftime(
+                "%Y-%m-%d %H:%M:%S.%f"
+            ),
+        )
+        for i in range(size)
+    )
+    session.connection().exec_driver_sql(
+        "INSERT INTO tasks (title, description, status, created_at, "
+        "updated_at) VALUES (?, ?, 'pending', ?, ?3)",
+        list(rows),
+    )
+    session.commit()
+
+
+def page_after(session: Session, depth: int, sort: str) -> PageQuery:
+    """The page query whose first row is the ``depth``-th task."""
+    if depth == 0:
+        return PageQuery(sort=sort)
+    row = (
+        session.query(models.Task)
+        .order_by(models.Task.id)
+        .offset(depth - 1)
+        .first()
+    )
+    if sort == "id":
+        return PageQuery(sort=sort, after=(row.id,))
+    return PageQuery(sort=sort, after=(row.created_at, row.id))
+
+
+def timed(query, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        query()
+    return (time.perf_counter() - start) / repeat
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--depths", type=int, nargs="+", default=[0, 100_000, 1_000_000]
+    )
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(
+        f"{'depth':>10} | {'offset':>10} | {'keyset id':>10} | "
+        f"{'created_at':>10}   (ms/page)"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        )
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            fill(session, max(args.depths) + args.limit)
+            tasks = crud.TaskCRUD(session)
+            for depth in args.depths:
+                by_id = page_after(session, depth, "id")
+                by_created = page_after(session, depth, "created_at")
+                pages = [
+                    lambda: session.query(models.Task)
+                    .offset(depth)
+                    .limit(args.limit)
+                    .all(),
+                    lambda: tasks.get_multi(page=by_id, limit=args.limit),
+                    lambda: tasks.get_multi(page=by_created, limit=args.limit),
+                ]
+                first_ids = {page()[0].id for page in pages}
+                assert first_ids == {depth + 1}, first_ids
+                timings = [timed(page, args.repeat) for page in pages]
+                # Keep the identity map from growing across depths.
+                session.expunge_all()
+                print(
+                    f"{depth:>10,} | "
+                    + " | ".join(
+                        f"{seconds * 1e3:>10.3f}" for seconds in timings
+                    )
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main_cli()
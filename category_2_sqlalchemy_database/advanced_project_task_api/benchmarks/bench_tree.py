@@ -0,0 +1,101 @@
+"""Loading a whole task tree level by level against one recursive CTE.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_tree
+    python -m benchmarks.bench_tree --sizes 1000 5000 --branching 3
+
+Each tree of ``--sizes`` tasks is built breadth first, ``--branching``
+children per task, in a fresh SQLite file. "lazy" loads the root and
+reads ``sub_tasks`` on every node, one SELECT per task, which is what a
+client walking the tree through ``GET /tasks/{id}`` costs at best.
+"cte" is ``TaskCRUD.tree``: one ``WITH RECURSIVE`` query and one pass to
+nest the rows.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.database import Base
+
+
+def fill(session: Session, size: int, branching: int) -> None:
+    rows = [("task 0", None)] + [
+        (f"task {i}", (i - 1) // branching + 1) for i in range(1, size)
+    ]
+    session.connection().exec_driver_sql(
+        "INSERT INTO tasks (title, description, status, parent_id, "
+        "created_at, updated_at) "
+        "VALUES (?, '', 'pending', ?, datetime(), datetime())",
+        rows,
+    )
+    session.commit()
+
+
+def lazy_walk(session: Session, task_id: int) -> int:
+    seen = 0
+    stack = [session.get(models.Task, task_id)]
+    while stack:
+        task = stack.pop()
+        seen += 1
+        stack.extend(task.sub_tasks)
+    session.expunge_all()
+    return seen
+
+
+def cte_walk(session: Session, task_id: int) -> int:
+    seen = 0
+    stack = [crud.TaskCRUD(session).tree(task_id, crud.MAX_TREE_DEPTH)]
+    while stack:
+        node = stack.pop()
+        seen += 1
+        stack.extend(node["sub_tasks"] or ())
+    return seen
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 5_000, 20_000]
+    )
+    parser.add_argument("--branching", type=int, default=4)
+    args = parser.parse_args()
+
+    print(
+        f"{'tasks':>8} | {'lazy ms':>10} | {'queries':>8} | "
+        f"{'cte ms':>10} | {'queries':>8}"
+    )
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(
+                f"sqlite:///{os.path.join(directory, 'bench.db')}"
+            )
+            Base.metadata.create_all(bind=engine)
+            queries = 0
+
+            def count(*_):
+                nonlocal queries
+                queries += 1
+
+            event.listen(engine, "before_cursor_execute", count)
+            cells = []
+            with Session(engine) as session:
+                fill(session, size, args.branching)
+                for walk in (lazy_walk, cte_walk):
+                    queries = 0
+                    start = time.perf_counter()
+                    assert walk(session, 1) == size
+                    elapsed = time.perf_counter() - start
+                    cells.append(f"{elapsed * 1e3:>10.1f} | {queries:>8,}")
+            engine.dispose()
+        print(f"{size:>8,} | " + " | ".join(cells))
+
+
+if __name__ == "__main__":
+    main_cli()
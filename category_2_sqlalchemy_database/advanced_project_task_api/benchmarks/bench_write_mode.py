@@ -0,0 +1,92 @@
+"""Latency of single-row writes in the "orm" and "returning" write modes.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_write_mode
+    python -m benchmarks.bench_write_mode --rows 5000
+
+Each mode starts from a fresh SQLite file with the app's default engine
+profile and runs ``TaskCRUD.create``, ``update`` and ``delete`` on
+``--rows`` tasks, one call per row, as the API routes do. Every call is
+timed on its own; the table shows the median and 99th percentile in
+microseconds and the SQL statements per call.
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.database import Base
+from app.sqlite_engine import create_sqlite_engine
+
+
+def summary(timings: List[float], statements: int) -> str:
+    cuts = statistics.quantiles(timings, n=100)
+    per_call = statements / len(timings)
+    return (
+        f"{statistics.median(timings) * 1e6:>8.0f} | "
+        f"{cuts[98] * 1e6:>8.0f} | {per_call:>5.1f}"
+    )
+
+
+def run(path: str, returning: bool, rows: int) -> List[str]:
+    engine = create_sqlite_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    new = schemas.TaskCreate(title="task", description="")
+    change = schemas.TaskUpdate(status="done")
+    cells = []
+    with Session(engine) as session:
+        tasks = crud.TaskCRUD(session, returning=returning)
+        ids: List[int] = []
+        steps = [
+            lambda _: ids.append(tasks.create(new).id),
+            lambda i: tasks.update(ids[i], change),
+            lambda i: tasks.delete(ids[i]),
+        ]
+        for step in steps:
+            statements = 0
+            timings = []
+            for i in range(rows):
+                start = time.perf_counter()
+                step(i)
+                timings.append(time.perf_counter() - start)
+            # A route's session would not outlive the request.
+            session.expunge_all()
+            cells.append(summary(timings, statements))
+    engine.dispose()
+    return cells
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000)
+    args = parser.parse_args()
+
+    columns = f"{'p50 us':>8} | {'p99 us':>8} | {'stmts':>5}"
+    print(
+        f"{'mode':>10} | {'create':^27} | {'update':^27} | {'delete':^27}\n"
+        f"{'':>10} | " + " | ".join([columns] * 3)
+    )
+    for mode in crud.WRITE_MODES:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bench.db")
+            cells = run(path, mode == "returning", args.rows)
+        print(f"{mode:>10} | " + " | ".join(cells))
+
+
+if __name__ == "__main__":
+    main_cli()
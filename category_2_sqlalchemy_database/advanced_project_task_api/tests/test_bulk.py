@@ -0,0 +1,77 @@
+"""Bulk endpoints write each batch with one statement, in one transaction,
+and report every row."""
+
+import pytest
+
+from tests.test_includes import build_client, count_statements
+
+
+@pytest.fixture(params=["sync", "async"])
+def mode(request):
+    return request.param
+
+
+def writes(statements, verb):
+    return [s for s in statements if s.lstrip().startswith(verb)]
+
+
+def test_create_runs_one_insert_per_batch(tmp_path, mode):
+    client, _, counted = build_client(tmp_path / "test.db", mode)
+    tasks = [{"title": f"task {i}", "description": ""} for i in range(25)]
+    with client, count_statements(counted) as statements:
+        response = client.post(
+            "/tasks/bulk", params={"batch_size": 10}, json=tasks
+        )
+        listed = client.get("/tasks/").json()["items"]
+
+    assert response.status_code == 201
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (25, 0)
+    assert len(writes(statements, "INSERT")) == 3
+    titles = {task["id"]: task["title"] for task in listed}
+    assert [titles[r["id"]] for r in body["results"]] == [
+        t["title"] for t in tasks
+    ]
+
+
+def test_create_rolls_back_the_whole_batch(tmp_path, mode):
+    client, _, _ = build_client(tmp_path / "test.db", mode)
+    with client:
+        response = client.post(
+            "/tasks/bulk",
+            json=[{"title": "ok", "description": ""}, {"title": "bad"}],
+        )
+        listed = client.get("/tasks/").json()["items"]
+
+    assert response.status_code == 422
+    assert listed == []
+
+
+def test_update_and_delete_report_missing_ids(tmp_path, mode):
+    client, _, counted = build_client(tmp_path / "test.db", mode)
+    with client:
+        client.post(
+            "/tasks/bulk",
+            json=[{"title": f"task {i}", "description": ""} for i in range(3)],
+        )
+        updated = client.patch(
+            "/tasks/bulk",
+            json=[{"id": 1, "status": "done"}, {"id": 9, "status": "done"}],
+        ).json()
+        with count_statements(counted) as statements:
+            deleted = client.delete(
+                "/tasks/bulk", params={"ids": "2,3,9"}
+            ).json()
+        left = client.get("/tasks/").json()["items"]
+
+    assert [r["status"] for r in updated["results"]] == [
+        "updated",
+        "not_found",
+    ]
+    assert [r["status"] for r in deleted["results"]] == [
+        "deleted",
+        "deleted",
+        "not_found",
+    ]
+    assert len(writes(statements, "DELETE FROM tasks")) == 1
+    assert [(t["id"], t["status"]) for t in left] == [(1, "done")]
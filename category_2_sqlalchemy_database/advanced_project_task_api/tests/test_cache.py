@@ -0,0 +1,101 @@
+"""Repeated GET /{id} is served from the entity cache, and every write
+drops exactly the rows it changed."""
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.cache import EntityCache
+from tests.test_includes import build_client, count_statements
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_and_ttl_eviction():
+    clock = Clock()
+    cache = EntityCache(size=2, ttl=10, clock=clock)
+    for key in (1, 2):
+        cache.fill(key, f"row {key}", cache.version)
+    assert cache.lookup(1)[0] == "row 1"
+    cache.fill(3, "row 3", cache.version)
+    # 2 was the least recently used.
+    assert cache.lookup(2)[0] is None
+    clock.now = 11
+    assert cache.lookup(1)[0] is None
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 1,
+        "size": 1,
+    }
+
+
+def test_fill_after_invalidate_is_dropped():
+    cache = EntityCache()
+    value, version = cache.lookup(1)
+    # A write commits and invalidates while the row is being loaded.
+    cache.invalidate(1)
+    cache.fill(1, "old row", version)
+    assert cache.lookup(1)[0] is None
+    assert cache.read_through(1, lambda: "new row") == "new row"
+    assert cache.lookup(1)[0] == "new row"
+
+
+@pytest.fixture(params=["sync", "async"])
+def mode(request):
+    return request.param
+
+
+def selects(statements):
+    return [s for s in statements if s.lstrip().startswith("SELECT")]
+
+
+@pytest.mark.skipif(crud.TASK_CACHE is None, reason="ENTITY_CACHE=off")
+def test_reads_hit_and_writes_invalidate(tmp_path, mode):
+    client, _, counted = build_client(tmp_path / "test.db", mode)
+    with client:
+        client.post(
+            "/tasks/bulk",
+            json=[
+                {"title": "parent", "description": ""},
+                {"title": "child", "description": "", "parent_id": 1},
+                {"title": "other", "description": ""},
+            ],
+        )
+        for task_id in (1, 2, 3):
+            client.get(f"/tasks/{task_id}")
+        with count_statements(counted) as statements:
+            cached = client.get("/tasks/2").json()
+        client.put("/tasks/3", json={"title": "renamed"})
+        renamed = client.get("/tasks/3").json()
+        client.delete("/tasks/1")
+        detached = client.get("/tasks/2").json()
+        client.patch("/tasks/bulk", json=[{"id": 2, "status": "done"}])
+        done = client.get("/tasks/2").json()
+        embedded = client.get("/tasks/3", params={"include": "projects"})
+
+    assert selects(statements) == []
+    assert cached["parent_id"] == 1
+    assert renamed["title"] == "renamed"
+    assert detached["parent_id"] is None
+    assert done["status"] == "done"
+    assert embedded.json()["projects"] == []
+    stats = crud.TASK_CACHE.stats()
+    assert stats["hits"] >= 1 and stats["misses"] >= 3
+
+
+def test_cache_can_be_turned_off(tmp_path):
+    client, engine, _ = build_client(tmp_path / "test.db", "sync")
+    with client:
+        client.post("/tasks/", json={"title": "task", "description": ""})
+    with Session(engine) as db, count_statements(engine) as statements:
+        tasks = crud.TaskCRUD(db, cache=None)
+        tasks.get(1)
+        tasks.get(1)
+    assert len(selects(statements)) == 2
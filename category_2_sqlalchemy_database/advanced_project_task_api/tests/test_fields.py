@@ -0,0 +1,74 @@
+"""?fields= reads and returns only the columns asked for, and still pages
+and embeds like the full list."""
+
+import pytest
+
+from tests.test_includes import build_client, count_statements, fill
+
+
+@pytest.fixture(params=["sync", "async"])
+def mode(request):
+    return request.param
+
+
+def selects(statements):
+    return [s for s in statements if s.lstrip().startswith("SELECT")]
+
+
+def test_only_requested_columns(tmp_path, mode):
+    client, engine, counted = build_client(tmp_path / "test.db", mode)
+    fill(engine, 2)
+    with client, count_statements(counted) as statements:
+        response = client.get("/projects/", params={"fields": "id,name"})
+
+    items = response.json()["items"]
+    assert [set(item) for item in items] == [{"id", "name"}] * 2
+    [statement] = selects(statements)
+    assert "description" not in statement.split("FROM")[0]
+
+
+def test_cursor_without_id_field(tmp_path, mode):
+    client, engine, _ = build_client(tmp_path / "test.db", mode)
+    fill(engine, 1)
+    titles = []
+    with client:
+        for sort in ("id", "created_at"):
+            params = {"fields": "title", "limit": 4, "sort": sort}
+            first = client.get("/tasks/", params=params).json()
+            params["cursor"] = first["next_cursor"]
+            second = client.get("/tasks/", params=params).json()
+            assert second["next_cursor"] is None
+            titles.append(
+                [t["title"] for t in first["items"] + second["items"]]
+            )
+
+    assert len(titles[0]) == 6
+    assert sorted(titles[0]) == sorted(titles[1])
+
+
+def test_fields_with_include(tmp_path, mode):
+    client, engine, counted = build_client(tmp_path / "test.db", mode)
+    fill(engine, 2)
+    with client, count_statements(counted) as statements:
+        response = client.get(
+            "/tasks/", params={"fields": "title", "include": "sub_tasks"}
+        )
+
+    items = response.json()["items"]
+    assert {frozenset(item) for item in items} == {
+        frozenset({"title", "sub_tasks"})
+    }
+    parents = [item for item in items if item["sub_tasks"]]
+    assert len(parents) == 4
+    # The sub-tasks are full tasks, even where they are also page items
+    # loaded with only their title.
+    assert all("description" in sub for p in parents for sub in p["sub_tasks"])
+    assert len(selects(statements)) == 2
+
+
+def test_unknown_field(tmp_path, mode):
+    client, _, _ = build_client(tmp_path / "test.db", mode)
+    with client:
+        response = client.get("/projects/", params={"fields": "id,owner"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: owner"
@@ -0,0 +1,140 @@
+"""?include= must cost a fixed number of SQL statements per request,
+however many rows the page holds."""
+
+from contextlib import contextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base
+from app.deps import get_async_db, get_db
+from app.routers import async_project, async_task, project, task
+
+
+def build_client(path, mode):
+    """Client for the routes of ``mode``, on a fresh database at ``path``,
+    plus the engine whose statements are counted."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    app = FastAPI()
+    if mode == "async":
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        async def get_test_db():
+            async with sessions() as db:
+                yield db
+
+        app.include_router(async_project.router)
+        app.include_router(async_task.router)
+        app.dependency_overrides[get_async_db] = get_test_db
+        return TestClient(app), engine, async_engine.sync_engine
+
+    sessions = sessionmaker(bind=engine)
+
+    def get_test_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.include_router(project.router)
+    app.include_router(task.router)
+    app.dependency_overrides[get_db] = get_test_db
+    return TestClient(app), engine, engine
+
+
+def fill(engine, projects):
+    """``projects`` projects with two tasks each; every task has two
+    sub-tasks."""
+    with sessionmaker(bind=engine)() as db:
+        for i in range(projects):
+            tasks = []
+            for j in range(2):
+                parent = models.Task(title=f"task {i}.{j}", description="")
+                parent.sub_tasks = [
+                    models.Task(title=f"sub {i}.{j}.{k}", description="")
+                    for k in range(2)
+                ]
+                tasks.append(parent)
+            db.add(
+                models.Project(
+                    name=f"project {i}", description="", tasks=tasks
+                )
+            )
+        db.commit()
+
+
+@contextmanager
+def count_statements(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture(params=["sync", "async"])
+def mode(request):
+    return request.param
+
+
+@pytest.mark.parametrize("projects", [2, 20])
+@pytest.mark.parametrize(
+    "url, include, expected",
+    [
+        ("/projects/", "", 1),
+        ("/projects/", "tasks", 2),
+        ("/projects/", "tasks,sub_tasks", 3),
+        ("/tasks/", "projects", 2),
+        ("/tasks/", "projects,sub_tasks", 3),
+        ("/projects/1", "tasks,sub_tasks", 2),
+        ("/tasks/1", "projects,sub_tasks", 2),
+        ("/tasks/1", "sub_tasks", 1),
+    ],
+)
+def test_statement_count_is_fixed(
+    tmp_path, mode, projects, url, include, expected
+):
+    client, engine, counted = build_client(tmp_path / "test.db", mode)
+    fill(engine, projects)
+    with client, count_statements(counted) as statements:
+        response = client.get(url, params={"include": include})
+    assert response.status_code == 200
+    selects = [s for s in statements if s.lstrip().startswith("SELECT")]
+    assert len(selects) == expected, statements
+
+
+def test_nested_fields_follow_include(tmp_path, mode):
+    client, engine, _ = build_client(tmp_path / "test.db", mode)
+    fill(engine, 1)
+    with client:
+        plain = client.get("/projects/").json()["items"][0]
+        nested = client.get(
+            "/projects/", params={"include": "tasks,sub_tasks"}
+        ).json()["items"][0]
+        task_only = client.get("/tasks/1", params={"include": "projects"})
+        rejected = client.get("/tasks/", params={"include": "owner"})
+
+    assert "tasks" not in plain
+    tasks = sorted(nested["tasks"], key=lambda t: t["title"])
+    assert [t["title"] for t in tasks] == ["task 0.0", "task 0.1"]
+    assert sorted(s["title"] for s in tasks[0]["sub_tasks"]) == [
+        "sub 0.0.0",
+        "sub 0.0.1",
+    ]
+    assert "projects" not in tasks[0]
+    assert [p["name"] for p in task_only.json()["projects"]] == ["project 0"]
+    assert "sub_tasks" not in task_only.json()
+    assert rejected.status_code == 400
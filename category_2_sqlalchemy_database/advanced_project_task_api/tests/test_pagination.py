@@ -0,0 +1,134 @@
+"""Keyset pages follow the sort key: walking next_cursor visits every row
+once, in order, with ties on created_at broken by id."""
+
+import base64
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.pagination import encode_cursor
+from tests.test_includes import build_client
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture(params=["sync", "async"])
+def mode(request):
+    return request.param
+
+
+@pytest.fixture(params=["/tasks/", "/projects/"])
+def path(request):
+    return request.param
+
+
+def fill(engine, count=23):
+    """Rows whose created_at repeats, in an order unrelated to their ids;
+    returns the rows as (created_at, id), sorted."""
+    rng = random.Random(0)
+    stamps = [
+        START + timedelta(seconds=rng.randrange(4)) for _ in range(count)
+    ]
+    with sessionmaker(bind=engine)() as db:
+        for i, stamp in enumerate(stamps):
+            db.add(
+                models.Project(name=f"p{i}", description="", created_at=stamp)
+            )
+            db.add(
+                models.Task(title=f"t{i}", description="", created_at=stamp)
+            )
+        db.commit()
+    return sorted((stamp, i + 1) for i, stamp in enumerate(stamps))
+
+
+def walk(client, path, sort, limit=4):
+    pages, params = [], {"sort": sort, "limit": limit}
+    while True:
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        page = response.json()
+        pages.append(page["items"])
+        if page["next_cursor"] is None:
+            return pages
+        params["cursor"] = page["next_cursor"]
+
+
+@pytest.mark.parametrize("sort", ["id", "created_at"])
+def test_pages_follow_the_sort_key(tmp_path, mode, path, sort):
+    client, engine, _ = build_client(tmp_path / "test.db", mode)
+    rows = fill(engine)
+    with client:
+        pages = walk(client, path, sort)
+
+    assert all(len(page) == 4 for page in pages[:-1])
+    walked = [
+        (datetime.fromisoformat(item["created_at"]), item["id"])
+        for page in pages
+        for item in page
+    ]
+    if sort == "id":
+        rows.sort(key=lambda row: row[1])
+    assert walked == rows
+    # Some page ends in the middle of a run of equal created_at values,
+    # so the cursor has to break the tie by id.
+    assert sort == "id" or any(
+        before[-1]["created_at"] == after[0]["created_at"]
+        for before, after in zip(pages, pages[1:])
+    )
+
+
+def test_cursor_only_fits_its_sort(tmp_path, mode, path):
+    client, engine, _ = build_client(tmp_path / "test.db", mode)
+    fill(engine)
+    with client:
+        for sort, other in (("id", "created_at"), ("created_at", "id")):
+            cursor = client.get(
+                path, params={"sort": sort, "limit": 2}
+            ).json()["next_cursor"]
+            response = client.get(
+                path, params={"sort": other, "cursor": cursor}
+            )
+            assert response.status_code == 400
+            assert response.json() == {
+                "detail": f"Cursor was issued for sort={sort}"
+            }
+
+
+def b64(value):
+    raw = value if isinstance(value, bytes) else json.dumps(value).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "!!!",
+        "a",
+        b64(b"not json"),
+        b64(b"\xff\xfe"),
+        b64(["id"]),
+        b64(["id", "7"]),
+        b64(["id", 7, 8]),
+        b64(["name", 7]),
+        b64(["created_at", "yesterday", 7]),
+        b64(["created_at", 7]),
+        b64({"sort": "id", "id": 7}),
+    ],
+)
+def test_invalid_cursor(tmp_path, mode, path, cursor):
+    client, _, _ = build_client(tmp_path / "test.db", mode)
+    with client:
+        response = client.get(path, params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+def test_cursor_round_trip():
+    row = models.Task(id=9, created_at=START + timedelta(microseconds=5))
+    assert json.loads(
+        base64.urlsafe_b64decode(encode_cursor("created_at", row) + "==")
+    ) == ["created_at", "2024-01-01T00:00:00.000005", 9]
@@ -0,0 +1,225 @@
+"""Every statement the CRUD classes send must find its rows through an
+index: ``EXPLAIN QUERY PLAN`` may not show a full scan of any table."""
+
+import asyncio
+import re
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.cache import EntityCache
+from app.database import Base
+from app.pagination import PageQuery
+
+TABLES = set(Base.metadata.tables)
+PROJECT_INCLUDES = (frozenset(), frozenset(crud.PROJECT_PATHS))
+TASK_INCLUDES = (frozenset(), frozenset(crud.TASK_PATHS))
+FIELDS = frozenset({"description"})
+
+
+@contextmanager
+def capture(engine):
+    """(statement, parameters) of every statement sent to ``engine``; the
+    first row of an executemany stands for the rest."""
+    sent = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        sent.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield sent
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def table_of(name):
+    """The table behind a plan's SCAN target: ``tasks_1`` is an alias of
+    ``tasks``. CTEs (``tree``) and subqueries (``anon_1``) are not
+    tables."""
+    for candidate in (name, re.sub(r"_\d+$", "", name)):
+        if candidate in TABLES:
+            return candidate
+    return None
+
+
+def full_scans(engine, sent):
+    """Statements in ``sent`` whose plan reads a whole table.
+
+    A page's first query may scan in index order when LIMIT stops it
+    early and nothing has to be sorted first: it reads ``limit`` rows,
+    not the table.
+    """
+    found = []
+    with engine.connect() as conn:
+        for statement, parameters in sent:
+            if statement.split()[0] not in (
+                "SELECT",
+                "WITH",
+                "UPDATE",
+                "DELETE",
+            ):
+                continue
+            plan = [
+                row.detail
+                for row in conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+            ]
+            bounded = " LIMIT " in statement and not any(
+                "TEMP B-TREE" in detail for detail in plan
+            )
+            for detail in plan:
+                # An AUTOMATIC index is built by scanning the table, for
+                # this one statement.
+                match = re.match(
+                    r"SCAN (\w+)|SEARCH (\w+) USING AUTOMATIC", detail
+                )
+                if match is None or table_of(match[1] or match[2]) is None:
+                    continue
+                if bounded and match[1]:
+                    # Only the loop the LIMIT applies to: the outermost.
+                    bounded = False
+                    continue
+                found.append((detail, statement))
+    return found
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def new_task(title, parent_id=None):
+    return schemas.TaskCreate(title=title, description="", parent_id=parent_id)
+
+
+def pages(rows):
+    """A first and a second page for each sort key."""
+    last = rows[0]
+    return [
+        PageQuery(),
+        PageQuery(after=(last.id,)),
+        PageQuery(sort="created_at"),
+        PageQuery(sort="created_at", after=(last.created_at, last.id)),
+    ]
+
+
+def exercise(db, returning):
+    projects = crud.ProjectCRUD(db, returning=returning, cache=EntityCache())
+    tasks = crud.TaskCRUD(db, returning=returning, cache=EntityCache())
+    project = projects.create(
+        schemas.ProjectCreate(name="project", description="")
+    )
+    root = tasks.create(new_task("root"))
+    child = tasks.create(new_task("child", root.id))
+    tasks.assign_to_project(child.id, project.id)
+    bulk = tasks.create_many([new_task("bulk", child.id)] * 3, 2)
+
+    projects.get(project.id)
+    tasks.get(child.id)
+    for include in PROJECT_INCLUDES:
+        projects.load(project.id, include)
+        for page in pages(projects.get_multi(limit=1)):
+            projects.get_multi(page, limit=1, include=include)
+            projects.get_multi(page, limit=1, include=include, fields=FIELDS)
+    for include in TASK_INCLUDES:
+        tasks.load(child.id, include)
+        for page in pages(tasks.get_multi(limit=1)):
+            tasks.get_multi(page, limit=1, include=include)
+            tasks.get_multi(page, limit=1, include=include, fields=FIELDS)
+    tasks.tree(root.id, 5)
+    tasks.count_descendants(root.id, 5)
+
+    projects.update(project.id, schemas.ProjectUpdate(name="renamed"))
+    tasks.update(child.id, schemas.TaskUpdate(status="done"))
+    tasks.update(child.id, schemas.TaskUpdate())
+    rows = [{"id": result.id, "status": "done"} for result in bulk]
+    tasks.update_many([schemas.TaskBulkUpdate(**row) for row in rows], 2)
+    tasks.delete_many([bulk[0].id, 999], 2)
+    tasks.delete(child.id)
+    projects.delete(project.id)
+
+
+async def exercise_async(db, returning):
+    projects = crud.AsyncProjectCRUD(
+        db, returning=returning, cache=EntityCache()
+    )
+    tasks = crud.AsyncTaskCRUD(db, returning=returning, cache=EntityCache())
+    project = await projects.create(
+        schemas.ProjectCreate(name="project", description="")
+    )
+    root = await tasks.create(new_task("root"))
+    child = await tasks.create(new_task("child", root.id))
+    await tasks.assign_to_project(child.id, project.id)
+    bulk = await tasks.create_many([new_task("bulk", child.id)] * 3, 2)
+
+    await projects.get(project.id)
+    await tasks.get(child.id)
+    for include in PROJECT_INCLUDES:
+        await projects.load(project.id, include)
+        for page in pages(await projects.get_multi(limit=1)):
+            await projects.get_multi(page, limit=1, include=include)
+            await projects.get_multi(
+                page, limit=1, include=include, fields=FIELDS
+            )
+    for include in TASK_INCLUDES:
+        await tasks.load(child.id, include)
+        for page in pages(await tasks.get_multi(limit=1)):
+            await tasks.get_multi(page, limit=1, include=include)
+            await tasks.get_multi(
+                page, limit=1, include=include, fields=FIELDS
+            )
+    await tasks.tree(root.id, 5)
+    await tasks.count_descendants(root.id, 5)
+
+    await projects.update(project.id, schemas.ProjectUpdate(name="renamed"))
+    await tasks.update(child.id, schemas.TaskUpdate(status="done"))
+    await tasks.update(child.id, schemas.TaskUpdate())
+    rows = [{"id": result.id, "status": "done"} for result in bulk]
+    await tasks.update_many([schemas.TaskBulkUpdate(**row) for row in rows], 2)
+    await tasks.delete_many([bulk[0].id, 999], 2)
+    await tasks.delete(child.id)
+    await projects.delete(project.id)
+
+
+@pytest.mark.parametrize("returning", [False, True])
+def test_sync_crud_uses_indexes(engine, returning):
+    with Session(engine) as db, capture(engine) as sent:
+        exercise(db, returning)
+    assert len(sent) > 30
+    assert full_scans(engine, sent) == []
+
+
+@pytest.mark.parametrize("returning", [False, True])
+def test_async_crud_uses_indexes(tmp_path, engine, returning):
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
+    )
+    sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def run():
+        async with sessions() as db:
+            await exercise_async(db, returning)
+        await async_engine.dispose()
+
+    with capture(async_engine.sync_engine) as sent:
+        asyncio.run(run())
+    assert len(sent) > 30
+    assert full_scans(engine, sent) == []
+
+
+def test_unindexed_lookups_are_caught(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_tasks_parent_id")
+    with Session(engine) as db, capture(engine) as sent:
+        crud.TaskCRUD(db).tree(1, 5)
+    [(detail, _)] = full_scans(engine, sent)
+    assert "tasks USING AUTOMATIC" in detail
@@ -0,0 +1,118 @@
+"""/tasks/{id}/tree and /tasks/{id}/tree/count walk the sub-task hierarchy
+in one statement, stop at max_depth and survive parent_id cycles."""
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models
+from tests.test_includes import build_client, count_statements
+
+
+@pytest.fixture(params=["sync", "async"])
+def mode(request):
+    return request.param
+
+
+def build_tree(engine):
+    """1 -> (2 -> (4 -> 6), 3 -> 5), and 7 alone."""
+    parents = {2: 1, 3: 1, 4: 2, 5: 3, 6: 4, 7: None}
+    with sessionmaker(bind=engine)() as db:
+        db.add(models.Task(id=1, title="root", description=""))
+        for task_id, parent_id in parents.items():
+            db.add(
+                models.Task(
+                    id=task_id,
+                    title=f"task {task_id}",
+                    description="",
+                    parent_id=parent_id,
+                )
+            )
+        db.commit()
+
+
+def shape(node):
+    """The tree as {id: children}, children None where not expanded."""
+    if node["sub_tasks"] is None:
+        return {node["id"]: None}
+    children = {}
+    for child in node["sub_tasks"]:
+        children.update(shape(child))
+    return {node["id"]: children}
+
+
+@pytest.mark.parametrize(
+    "max_depth,expected",
+    [
+        (crud.MAX_TREE_DEPTH, {1: {2: {4: {6: {}}}, 3: {5: {}}}}),
+        (2, {1: {2: {4: None}, 3: {5: {}}}}),
+        (1, {1: {2: None, 3: None}}),
+        (0, {1: None}),
+    ],
+)
+def test_tree_stops_at_max_depth(tmp_path, mode, max_depth, expected):
+    client, engine, counted = build_client(tmp_path / "test.db", mode)
+    build_tree(engine)
+    with client, count_statements(counted) as statements:
+        response = client.get("/tasks/1/tree", params={"max_depth": max_depth})
+
+    # None: children exist below the limit; []: a leaf.
+    assert shape(response.json()) == expected
+    assert len(statements) == 1
+
+
+def test_leaf_and_missing_task(tmp_path, mode):
+    client, engine, _ = build_client(tmp_path / "test.db", mode)
+    build_tree(engine)
+    with client:
+        assert client.get("/tasks/7/tree").json()["sub_tasks"] == []
+        assert client.get("/tasks/99/tree").status_code == 404
+        assert client.get("/tasks/99/tree/count").status_code == 404
+        too_deep = {"max_depth": crud.MAX_TREE_DEPTH + 1}
+        assert client.get("/tasks/1/tree", params=too_deep).status_code == 422
+
+
+@pytest.mark.parametrize(
+    "task_id,max_depth,expected",
+    [
+        (1, crud.MAX_TREE_DEPTH, (5, 3)),
+        (1, 2, (4, 2)),
+        (1, 0, (0, 0)),
+        (2, crud.MAX_TREE_DEPTH, (2, 2)),
+        (7, crud.MAX_TREE_DEPTH, (0, 0)),
+    ],
+)
+def test_count(tmp_path, mode, task_id, max_depth, expected):
+    client, engine, _ = build_client(tmp_path / "test.db", mode)
+    build_tree(engine)
+    with client:
+        response = client.get(
+            f"/tasks/{task_id}/tree/count", params={"max_depth": max_depth}
+        )
+    descendants, depth = expected
+    assert response.json() == {
+        "task_id": task_id,
+        "descendants": descendants,
+        "depth": depth,
+    }
+
+
+def test_parent_id_cycle(tmp_path, mode):
+    client, engine, _ = build_client(tmp_path / "test.db", mode)
+    build_tree(engine)
+    # 1 -> 2 -> 4 -> 6 -> 1: the walk comes back to the root.
+    with sessionmaker(bind=engine)() as db:
+        db.execute(
+            update(models.Task).where(models.Task.id == 1).values(parent_id=6)
+        )
+        db.commit()
+
+    with client:
+        tree = client.get("/tasks/1/tree", params={"max_depth": 10}).json()
+        count = client.get("/tasks/1/tree/count").json()
+
+    # Every task once, and the walk ends.
+    assert shape(tree) == {1: {2: {4: {6: {}}}, 3: {5: {}}}}
+    assert count["descendants"] == 5
+    # Only the depth bound ends the walk around the cycle.
+    assert count["depth"] == crud.MAX_TREE_DEPTH
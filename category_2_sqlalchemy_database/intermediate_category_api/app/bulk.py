@@ -0,0 +1,43 @@
+import os
+from typing import Annotated, Iterator, List, Sequence, TypeVar
+
+from fastapi import HTTPException, Query, status
+
+# Rows per statement for the bulk endpoints, unless ?batch_size= says
+# otherwise. At most MAX_BATCH_SIZE keeps a multi-row INSERT well under
+# SQLite's 32766 bound parameters.
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "500"))
+MAX_BATCH_SIZE = 1000
+DEFAULT_BATCH_SIZE = min(BULK_BATCH_SIZE, MAX_BATCH_SIZE)
+
+BatchSize = Annotated[
+    int,
+    Query(
+        ge=1,
+        le=MAX_BATCH_SIZE,
+        description=f"Rows per SQL statement (at most {MAX_BATCH_SIZE})",
+    ),
+]
+
+T = TypeVar("T")
+
+
+def batches(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def ids_param(
+    ids: Annotated[
+        List[str],
+        Query(description="Ids to delete, comma-separated or repeated"),
+    ],
+) -> List[int]:
+    """Dependency accepting ``?ids=1,2,3`` as well as ``?ids=1&ids=2``."""
+    try:
+        return [int(i) for value in ids for i in value.split(",") if i]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ids must be integers",
+        )
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# ENTITY_CACHE=off turns the cache off for the whole app. Each entity
+# cache keeps at most ENTITY_CACHE_SIZE rows, each for ENTITY_CACHE_TTL
+# seconds; the TTL bounds how stale a row written by another process
+# (another worker, a script) can be.
+CACHE_ENABLED = os.getenv("ENTITY_CACHE", "on") != "off"
+CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", "10000"))
+CACHE_TTL = float(os.getenv("ENTITY_CACHE_TTL", "30"))
+
+
+class EntityCache:
+    """Read-through cache of immutable rows by id, with LRU and TTL
+    eviction.
+
+    Safe to share between threads. Writers call ``invalidate`` after
+    their commit; a read that started before it will not fill the cache
+    with the row it loaded, which may predate the write.
+    """
+
+    def __init__(
+        self,
+        size: int = CACHE_SIZE,
+        ttl: float = CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.size = size
+        self.ttl = ttl
+        self.clock = clock
+        self.entries: "OrderedDict[Hashable, Tuple[float, Any]]" = (
+            OrderedDict()
+        )
+        self.lock = threading.Lock()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key: Hashable) -> Tuple[Optional[Any], int]:
+        """The cached value for ``key`` (None on a miss), and the version
+        to pass to ``fill`` after loading it."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > self.clock():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value, self.version
+                del self.entries[key]
+            self.misses += 1
+            return None, self.version
+
+    def fill(self, key: Hashable, value: Any, version: int) -> None:
+        """Cache ``value`` unless it is None or something was invalidated
+        since ``lookup`` returned ``version``."""
+        if value is None:
+            return
+        with self.lock:
+            if version != self.version:
+                return
+            self.entries[key] = (self.clock() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def read_through(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        value, version = self.lookup(key)
+        if value is None:
+            value = load()
+            self.fill(key, value, version)
+        return value
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self.lock:
+            self.version += 1
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.version += 1
+            self.entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self.entries),
+            }
+
+
+def entity_cache() -> Optional[EntityCache]:
+    """A new cache, or None if ENTITY_CACHE=off."""
+    return EntityCache() if CACHE_ENABLED else None
+
+
+def invalidate(cache: Optional[EntityCache], *keys: Hashable) -> None:
+    """Drop ``keys`` from ``cache``, if the app has one."""
+    if cache is not None:
+        cache.invalidate(*keys)
@@ -1,31 +1,189 @@
+import os
+from sqlalchemy import (
+    Delete,
+    Executable,
+    Insert,
+    Select,
+    delete,
+    func,
+    insert,
+    select,
+    update,
+)
 from sqlalchemy.orm import Session, joinedload
+from typing import Any, Dict, Iterable, List, Optional
 from app import schemas, models
+from app.bulk import batches
+from app.cache import EntityCache, entity_cache, invalidate
+from app.fields import Fields, columns
+
+# "orm" loads the row, sets its attributes, commits and refreshes it: up
+# to four round trips per write. "returning" sends one INSERT, UPDATE or
+# DELETE ... RETURNING (SQLite 3.35+) and answers from the returned row.
+WRITE_MODES = ("orm", "returning")
+WRITE_MODE = os.getenv("WRITE_MODE", "orm")
+if WRITE_MODE not in WRITE_MODES:
+    raise ValueError(
+        f"Unknown WRITE_MODE {WRITE_MODE!r}; expected one of {WRITE_MODES}"
+    )
+RETURNING_WRITES = WRITE_MODE == "returning"
+
+
+def insert_row(model: Any, values: Dict[str, Any]) -> Insert:
+    table = model.__table__
+    return insert(table).values(**values).returning(*table.c)
+
+
+def select_row(model: Any, id: int) -> Executable:
+    table = model.__table__
+    return select(*table.c).where(table.c.id == id)
+
+
+def update_row(model: Any, id: int, values: Dict[str, Any]) -> Executable:
+    """UPDATE ... RETURNING of one row, or a plain SELECT when there is
+    nothing to set."""
+    table = model.__table__
+    if not values:
+        return select_row(model, id)
+    return (
+        update(table)
+        .where(table.c.id == id)
+        .values(**values)
+        .returning(*table.c)
+    )
+
+
+def delete_row(model: Any, id: int) -> Delete:
+    table = model.__table__
+    return delete(table).where(table.c.id == id).returning(*table.c)
+
+
+def write(db: Session, statement: Executable):
+    """Run ``statement`` and commit, returning its row or None."""
+    row = db.execute(statement).first()
+    db.commit()
+    return row
+
+
+# Rows by id behind get_category() and get_product(), shared by every
+# session of the app. A cached row holds only its own table's columns, so
+# a write invalidates exactly the rows whose columns it changed.
+CATEGORY_CACHE = entity_cache()
+PRODUCT_CACHE = entity_cache()
+
+
+def clear_caches() -> None:
+    for cache in (CATEGORY_CACHE, PRODUCT_CACHE):
+        if cache is not None:
+            cache.clear()
+
+
+def cache_stats() -> Dict[str, Optional[Dict[str, int]]]:
+    """Hit and miss counters per entity; None when the cache is off."""
+    caches = {"categories": CATEGORY_CACHE, "products": PRODUCT_CACHE}
+    return {
+        name: None if cache is None else cache.stats()
+        for name, cache in caches.items()
+    }
+
+
+def bulk_results(
+    ids: Iterable[int], found: Iterable[bool], done: schemas.BulkStatus
+) -> List[schemas.BulkRowResult]:
+    return [
+        schemas.BulkRowResult(
+            row=row,
+            id=row_id,
+            status=done if ok else schemas.BulkStatus.not_found,
+        )
+        for row, (row_id, ok) in enumerate(zip(ids, found))
+    ]
+
+
+def stock_columns() -> List[Any]:
+    """Aggregates over the products of a group, or of the whole table.
+
+    A category without products counts 0 products and 0 stock, and has no
+    prices (NULL).
+    """
+    product = models.Product
+    return [
+        func.count(product.id).label("product_count"),
+        func.coalesce(func.sum(product.quantity), 0).label("total_quantity"),
+        func.coalesce(func.sum(product.quantity * product.price), 0.0).label(
+            "stock_value"
+        ),
+        func.min(product.price).label("min_price"),
+        func.max(product.price).label("max_price"),
+        func.avg(product.price).label("avg_price"),
+    ]
+
+
+def category_stats(after: int, limit: int) -> Select:
+    """One GROUP BY row per category, for up to ``limit + 1`` categories
+    after id ``after``.
+
+    The categories are walked in id order, so the page stops after
+    ``limit + 1`` groups, and each group's products come from the
+    ``category_id`` index: the cost follows the page, not the table.
+    """
+    category, product = models.Category, models.Product
+    return (
+        select(category.id, category.name, *stock_columns())
+        .outerjoin(product, product.category_id == category.id)
+        .where(category.id > after)
+        .group_by(category.id)
+        .order_by(category.id)
+        .limit(limit + 1)
+    )
 
 
 class CategoryCRUD:
     def __init__(
         self,
         db: Session,
+        returning: bool = RETURNING_WRITES,
+        cache: Optional[EntityCache] = CATEGORY_CACHE,
     ):
         self.db = db
+        self.returning = returning
+        self.cache = cache
 
     def create_category(self, category: schemas.CategoryCreate):
+        if self.returning:
+            return write(
+                self.db, insert_row(models.Category, category.model_dump())
+            )
         db_category = models.Category(**category.model_dump())
         self.db.add(db_category)
         self.db.commit()
         self.db.refresh(db_category)
         return db_category
 
-    def get_categories(self, skip: int, limit: int):
-        return (
-            self.db.query(models.Category)
-            .options(joinedload(models.Category.products))
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+    def get_categories(
+        self, skip: int, limit: int, fields: Fields = frozenset()
+    ):
+        """ORM objects, or with ``fields``, plain rows of just those
+        columns."""
+        if fields:
+            statement = select(*columns(models.Category, fields))
+            return self.db.execute(statement.offset(skip).limit(limit)).all()
+        return self.db.query(models.Category).offset(skip).limit(limit).all()
+
+    def get_category_stats(self, after: int, limit: int):
+        return self.db.execute(category_stats(after, limit)).all()
 
     def get_category(self, id: int):
+        """The category, or None: a row read through the cache when the
+        app has one."""
+        if self.cache is None:
+            return self.load_category(id)
+        return self.cache.read_through(
+            id,
+            lambda: self.db.execute(select_row(models.Category, id)).first(),
+        )
+
+    def load_category(self, id: int):
         return (
             self.db.query(models.Category)
             .filter(models.Category.id == id)
@@ -33,65 +191,207 @@ class CategoryCRUD:
         )
 
     def update_category(self, id: int, category: schemas.CategoryUpdate):
-        db_category = self.get_category(id)
+        values = category.model_dump(exclude_unset=True)
+        if self.returning:
+            row = write(self.db, update_row(models.Category, id, values))
+            invalidate(self.cache, id)
+            return row
+        db_category = self.load_category(id)
         if db_category is None:
             return None
-        for key, value in category.model_dump(exclude_unset=True).items():
+        for key, value in values.items():
             setattr(db_category, key, value)
         self.db.commit()
+        invalidate(self.cache, id)
         self.db.refresh(db_category)
         return db_category
 
     def delete_category(self, id: int):
-        db_category = self.get_category(id)
+        if self.returning:
+            # The ORM cascades the delete to the category's products.
+            products = self.db.scalars(
+                delete(models.Product)
+                .where(models.Product.category_id == id)
+                .returning(models.Product.id)
+            ).all()
+            row = write(self.db, delete_row(models.Category, id))
+            invalidate(self.cache, id)
+            invalidate(PRODUCT_CACHE, *products)
+            return row
+        db_category = self.load_category(id)
         if db_category is None:
             return None
+        products = [product.id for product in db_category.products]
         self.db.delete(db_category)
         self.db.commit()
+        invalidate(self.cache, id)
+        invalidate(PRODUCT_CACHE, *products)
         return db_category
 
 
 class ProductCRUD:
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        returning: bool = RETURNING_WRITES,
+        cache: Optional[EntityCache] = PRODUCT_CACHE,
+    ):
         self.db = db
+        self.returning = returning
+        self.cache = cache
 
     def create_product(self, product: schemas.ProductCreate):
+        if self.returning:
+            return write(
+                self.db, insert_row(models.Product, product.model_dump())
+            )
         db_product = models.Product(**product.model_dump())
         self.db.add(db_product)
         self.db.commit()
         self.db.refresh(db_product)
         return db_product
 
-    def get_products(self, skip: int, limit: int):
+    def get_products(
+        self, after: int, limit: int, fields: Fields = frozenset()
+    ):
+        """ORM objects, or with ``fields``, plain rows of just those
+        columns and the id the cursor needs."""
+        # Seek past the previous page on the primary key instead of
+        # OFFSET, which would read and discard every earlier row. One
+        # extra row tells whether another page follows.
+        if fields:
+            statement = select(*columns(models.Product, fields, "id"))
+            return self.db.execute(
+                statement.where(models.Product.id > after)
+                .order_by(models.Product.id)
+                .limit(limit + 1)
+            ).all()
         return (
             self.db.query(models.Product)
             .options(joinedload(models.Product.category))
-            .offset(skip)
-            .limit(limit)
+            .filter(models.Product.id > after)
+            .order_by(models.Product.id)
+            .limit(limit + 1)
             .all()
         )
 
     def get_product(self, id: int):
+        """The product, or None: a row read through the cache when the
+        app has one."""
+        if self.cache is None:
+            return self.load_product(id)
+        return self.cache.read_through(
+            id,
+            lambda: self.db.execute(select_row(models.Product, id)).first(),
+        )
+
+    def load_product(self, id: int):
         return (
             self.db.query(models.Product)
             .filter(models.Product.id == id)
             .one_or_none()
         )
 
+    def get_inventory_summary(self):
+        """``stock_columns`` over every product, in one aggregate query."""
+        return self.db.execute(select(*stock_columns())).one()
+
     def update_product(self, id: int, product: schemas.ProductUpdate):
-        db_product = self.get_product(id)
+        values = product.model_dump(exclude_unset=True)
+        if self.returning:
+            row = write(self.db, update_row(models.Product, id, values))
+            invalidate(self.cache, id)
+            return row
+        db_product = self.load_product(id)
         if db_product is None:
             return None
-        for key, value in product.model_dump(exclude_unset=True).items():
+        for key, value in values.items():
             setattr(db_product, key, value)
         self.db.commit()
+        invalidate(self.cache, id)
         self.db.refresh(db_product)
         return db_product
 
     def delete_product(self, id: int):
-        db_product = self.get_product(id)
+        if self.returning:
+            row = write(self.db, delete_row(models.Product, id))
+            invalidate(self.cache, id)
+            return row
+        db_product = self.load_product(id)
         if db_product is None:
             return None
         self.db.delete(db_product)
         self.db.commit()
+        invalidate(self.cache, id)
         return db_product
+
+    def create_products(
+        self, products: List[schemas.ProductCreate], batch_size: int
+    ) -> List[schemas.BulkRowResult]:
+        """Insert ``products`` with one INSERT per batch, all in one
+        transaction."""
+        # SQLite numbers the rows of one INSERT in ascending order, so sorting
+        # the returned ids lines them up with the batch. Asking SQLAlchemy to
+        # do it (sort_by_parameter_order) costs one INSERT per row here.
+        statement = insert(models.Product).returning(models.Product.id)
+        ids: List[int] = []
+        for batch in batches(products, batch_size):
+            rows = [product.model_dump() for product in batch]
+            ids.extend(sorted(self.db.scalars(statement, rows)))
+        self.db.commit()
+        return bulk_results(ids, [True] * len(ids), schemas.BulkStatus.created)
+
+    def update_products(
+        self, products: List[schemas.ProductBulkUpdate], batch_size: int
+    ) -> List[schemas.BulkRowResult]:
+        """Update ``products`` by id with one executemany UPDATE per batch
+        (per set of changed columns), all in one transaction."""
+        found: List[bool] = []
+        for batch in batches(products, batch_size):
+            # The ORM's bulk UPDATE by primary key raises on a missing
+            # row, so find out first which ids exist.
+            existing = set(
+                self.db.scalars(
+                    select(models.Product.id).where(
+                        models.Product.id.in_([p.id for p in batch])
+                    )
+                )
+            )
+            rows = [
+                product.model_dump(exclude_unset=True)
+                for product in batch
+                if product.id in existing
+            ]
+            # A row with only its id has nothing to set.
+            rows = [row for row in rows if len(row) > 1]
+            if rows:
+                self.db.execute(update(models.Product), rows)
+            found.extend(product.id in existing for product in batch)
+        self.db.commit()
+        invalidate(self.cache, *(product.id for product in products))
+        return bulk_results(
+            [product.id for product in products],
+            found,
+            schemas.BulkStatus.updated,
+        )
+
+    def delete_products(
+        self, ids: List[int], batch_size: int
+    ) -> List[schemas.BulkRowResult]:
+        """Delete ``ids`` with one ``DELETE ... WHERE id IN`` per batch,
+        all in one transaction."""
+        deleted = set()
+        for batch in batches(ids, batch_size):
+            deleted.update(
+                self.db.scalars(
+                    delete(models.Product)
+                    .where(models.Product.id.in_(batch))
+                    .returning(models.Product.id)
+                    .execution_options(synchronize_session=False)
+                )
+            )
+        self.db.commit()
+        invalidate(self.cache, *deleted)
+        return bulk_results(
+            ids, [id in deleted for id in ids], schemas.BulkStatus.deleted
+        )
@@ -1,10 +1,10 @@
-from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from app.sqlite_engine import create_sqlite_engine
 
 DATABASE_URL = "sqlite:///./database.db"
 
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_sqlite_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
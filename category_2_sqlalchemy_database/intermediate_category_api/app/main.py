@@ -1,6 +1,6 @@
 from fastapi import FastAPI
-from app import models, database
-from app.routers import products, categories
+from app import crud, models, database
+from app.routers import products, categories, inventory
 
 models.Base.metadata.create_all(bind=database.engine)
 
@@ -9,3 +9,11 @@ app = FastAPI()
 
 app.include_router(products.router)
 app.include_router(categories.router)
+app.include_router(inventory.router)
+
+
+@app.get("/cache")
+def read_cache_stats():
+    """Hits, misses, evictions and size of the entity caches (null for
+    each when ENTITY_CACHE=off)."""
+    return crud.cache_stats()
@@ -32,7 +32,7 @@ class Product(Base):
         DateTime, server_default=func.now()
     )
     category_id: Mapped[Optional[int]] = mapped_column(
-        Integer, ForeignKey("categories.id"), nullable=True
+        Integer, ForeignKey("categories.id"), nullable=True, index=True
     )
 
     category: Mapped[Optional[Category]] = relationship(
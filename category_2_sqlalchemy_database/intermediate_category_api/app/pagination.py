@@ -0,0 +1,69 @@
+import base64
+from typing import Annotated, Any, Callable, List, Optional
+
+from fastapi import HTTPException, Query, status
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 1000
+
+PageSize = Annotated[
+    int,
+    Query(
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description=f"Items per page (at most {MAX_PAGE_SIZE})",
+    ),
+]
+
+
+# A cursor names the kind of row it points at, so a product cursor is
+# rejected by a category list and the other way round.
+def encode_cursor(row_id: int, kind: str = "product") -> str:
+    raw = f"{kind}:{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str = "product") -> int:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    # binascii.Error and UnicodeDecodeError are both ValueErrors.
+    raw = base64.urlsafe_b64decode(padded.encode()).decode()
+    prefix, _, value = raw.partition(":")
+    if prefix != kind or not value.isdigit():
+        raise ValueError("Invalid cursor")
+    return int(value)
+
+
+def cursor_dependency(kind: str) -> Callable[..., int]:
+    def cursor_param(
+        cursor: Annotated[
+            Optional[str],
+            Query(description="Opaque next_cursor from the previous page"),
+        ] = None,
+    ) -> int:
+        """Dependency turning the ``cursor`` query param into the id of
+        the last row of the previous page."""
+        if cursor is None:
+            return 0
+        try:
+            return decode_cursor(cursor, kind)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+    return cursor_param
+
+
+cursor_param = cursor_dependency("product")
+category_cursor_param = cursor_dependency("category")
+
+
+def to_page(rows: List[Any], limit: int, kind: str = "product") -> dict:
+    """Page of the first ``limit`` of ``rows``, which were fetched with one
+    extra row to tell whether another page follows."""
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(items[-1].id, kind)
+    return {"items": items, "next_cursor": next_cursor}
@@ -1,11 +1,24 @@
 from fastapi import APIRouter, status, Depends, HTTPException
-from typing import List
+from typing import Annotated, List
 from sqlalchemy.orm import Session
-from app.schemas import CategoryCreate, CategoryResponse, CategoryUpdate
+from app.schemas import (
+    CategoryCreate,
+    CategoryResponse,
+    CategoryStatsPage,
+    CategoryUpdate,
+)
 from app.deps import get_db
+from app.fields import Fields, fields_param, json_response, projection
+from app.pagination import (
+    DEFAULT_PAGE_SIZE,
+    PageSize,
+    category_cursor_param,
+    to_page,
+)
 from app.crud import CategoryCRUD
 
 router = APIRouter(prefix="/categories", tags=["Categories"])
+category_fields = fields_param(*CategoryResponse.model_fields)
 
 
 @router.post(
@@ -20,10 +33,29 @@ def create_category(category: CategoryCreate, db: Session = Depends(get_db)):
     "/", response_model=List[CategoryResponse], status_code=status.HTTP_200_OK
 )
 def get_categories(
-    skip: int = 0, limit: int = 10, db: Session = Depends(get_db)
+    fields: Annotated[Fields, Depends(category_fields)],
+    skip: int = 0,
+    limit: int = 10,
+    db: Session = Depends(get_db),
+):
+    db_categories = CategoryCRUD(db).get_categories(skip, limit, fields)
+    item = projection(CategoryResponse, fields)
+    return json_response(List[item], db_categories)
+
+
+# Declared before /{id} so "stats" is not read as a category id.
+@router.get(
+    "/stats", response_model=CategoryStatsPage, status_code=status.HTTP_200_OK
+)
+def get_category_stats(
+    after: Annotated[int, Depends(category_cursor_param)],
+    limit: PageSize = DEFAULT_PAGE_SIZE,
+    db: Session = Depends(get_db),
 ):
-    db_categories = CategoryCRUD(db).get_categories(skip, limit)
-    return db_categories
+    """Product count, units and value in stock, and price statistics of
+    each category, computed with GROUP BY in the database."""
+    rows = CategoryCRUD(db).get_category_stats(after, limit)
+    return to_page(rows, limit, "category")
 
 
 @router.get(
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from app.schemas import InventorySummary
+from app.deps import get_db
+from app.crud import ProductCRUD
+
+router = APIRouter(prefix="/inventory", tags=["Inventory"])
+
+
+@router.get(
+    "/summary",
+    response_model=InventorySummary,
+    status_code=status.HTTP_200_OK,
+)
+def get_inventory_summary(db: Session = Depends(get_db)):
+    """Product count, units and value in stock, and price statistics over
+    all products, computed in one aggregate query."""
+    return ProductCRUD(db).get_inventory_summary()
@@ -1,12 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
-from app.schemas import ProductCreate, ProductUpdate, ProductResponse
+from typing import Annotated, List
+from app.schemas import (
+    BulkResult,
+    ProductBulkUpdate,
+    ProductCreate,
+    ProductPage,
+    ProductUpdate,
+    ProductResponse,
+)
+from app.bulk import DEFAULT_BATCH_SIZE, BatchSize, ids_param
+from app.fields import (
+    Fields,
+    fields_param,
+    json_response,
+    page_of,
+    projection,
+)
 from app.deps import get_db
+from app.pagination import DEFAULT_PAGE_SIZE, PageSize, cursor_param, to_page
 from app.crud import ProductCRUD
 
-
 router = APIRouter(prefix="/products", tags=["Products"])
+product_fields = fields_param(*ProductResponse.model_fields)
 
 
 @router.post(
@@ -21,14 +38,73 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)):
 
 @router.get(
     "/",
-    response_model=List[ProductResponse],
+    response_model=ProductPage,
     status_code=status.HTTP_200_OK,
 )
 def get_products(
-    skip: int = 0, limit: int = 10, db: Session = Depends(get_db)
+    after: Annotated[int, Depends(cursor_param)],
+    fields: Annotated[Fields, Depends(product_fields)],
+    limit: PageSize = DEFAULT_PAGE_SIZE,
+    db: Session = Depends(get_db),
+):
+    db_products = ProductCRUD(db).get_products(after, limit, fields)
+    item = projection(ProductResponse, fields)
+    return json_response(page_of(item), to_page(db_products, limit))
+
+
+# Declared before /{id} so "bulk" is not read as a product id.
+@router.post(
+    "/bulk",
+    response_model=BulkResult,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_products(
+    products: List[ProductCreate],
+    batch_size: BatchSize = DEFAULT_BATCH_SIZE,
+    db: Session = Depends(get_db),
+):
+    try:
+        results = ProductCRUD(db).create_products(products, batch_size)
+    except IntegrityError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch rolled back: {exc.orig}",
+        )
+    return BulkResult.from_rows(results)
+
+
+@router.patch(
+    "/bulk",
+    response_model=BulkResult,
+    status_code=status.HTTP_200_OK,
+)
+def update_products(
+    products: List[ProductBulkUpdate],
+    batch_size: BatchSize = DEFAULT_BATCH_SIZE,
+    db: Session = Depends(get_db),
+):
+    try:
+        results = ProductCRUD(db).update_products(products, batch_size)
+    except IntegrityError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch rolled back: {exc.orig}",
+        )
+    return BulkResult.from_rows(results)
+
+
+@router.delete(
+    "/bulk",
+    response_model=BulkResult,
+    status_code=status.HTTP_200_OK,
+)
+def delete_products(
+    ids: Annotated[List[int], Depends(ids_param)],
+    batch_size: BatchSize = DEFAULT_BATCH_SIZE,
+    db: Session = Depends(get_db),
 ):
-    db_products = ProductCRUD(db).get_products(skip, limit)
-    return db_products
+    results = ProductCRUD(db).delete_products(ids, batch_size)
+    return BulkResult.from_rows(results)
 
 
 @router.get(
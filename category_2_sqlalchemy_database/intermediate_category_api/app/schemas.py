@@ -1,5 +1,6 @@
+from enum import Enum
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 
 
 class CategoryBase(BaseModel):
@@ -48,3 +49,74 @@ class ProductResponse(ProductBase):
 
     class Config:
         orm_mode = True
+
+
+class ProductPage(BaseModel):
+    items: List[ProductResponse]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as ?cursor= to fetch the next page"
+    )
+
+
+# ---------------------------
+# Aggregates
+# ---------------------------
+class StockStats(BaseModel):
+    product_count: int
+    total_quantity: int = Field(..., description="Units in stock")
+    stock_value: float = Field(..., description="Sum of quantity x price")
+    min_price: Optional[float] = Field(None, description="Null if empty")
+    max_price: Optional[float] = None
+    avg_price: Optional[float] = None
+
+    class Config:
+        orm_mode = True
+
+
+class CategoryStats(StockStats):
+    id: int
+    name: str
+
+
+class CategoryStatsPage(BaseModel):
+    items: List[CategoryStats]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as ?cursor= to fetch the next page"
+    )
+
+
+class InventorySummary(StockStats):
+    pass
+
+
+# ---------------------------
+# Bulk writes
+# ---------------------------
+class ProductBulkUpdate(ProductUpdate):
+    id: int
+
+
+class BulkStatus(str, Enum):
+    created = "created"
+    updated = "updated"
+    deleted = "deleted"
+    not_found = "not_found"
+
+
+class BulkRowResult(BaseModel):
+    row: int = Field(..., description="Zero-based position in the batch")
+    id: int
+    status: BulkStatus
+
+
+class BulkResult(BaseModel):
+    succeeded: int = Field(..., description="Rows written")
+    failed: int = Field(..., description="Rows whose id was not found")
+    results: List[BulkRowResult]
+
+    @classmethod
+    def from_rows(cls, results: List[BulkRowResult]) -> "BulkResult":
+        failed = sum(r.status is BulkStatus.not_found for r in results)
+        return cls(
+            succeeded=len(results) - failed, failed=failed, results=results
+        )
@@ -0,0 +1,204 @@
+"""Category and inventory statistics in Python against GROUP BY in SQLite.
+
+Run from the project directory:
+
+    python -m benchmarks.bench_aggregates
+    python -m benchmarks.bench_aggregates --categories 1000 --products 100000
+
+A fresh SQLite file is filled with ``--categories`` categories and
+``--products`` products spread evenly over them. Each line times one
+operation both ways:
+
+- list page: ``GET /categories/`` before (``joinedload`` of every
+  product of the page's categories) and after (categories only)
+- stats page / all stats: the statistics of one page of categories, or of
+  every category, worked out in Python from the categories'
+  ``joinedload``-ed products, against ``CategoryCRUD.get_category_stats``
+- inventory summary: every product's price and quantity streamed into
+  Python, against ``ProductCRUD.get_inventory_summary``
+"""
+
+import argparse
+import math
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+
+from app import crud, models
+from app.database import Base
+from app.pagination import MAX_PAGE_SIZE
+from app.sqlite_engine import create_sqlite_engine
+
+
+def fill(session: Session, categories: int, products: int) -> None:
+    conn = session.connection()
+    conn.exec_driver_sql(
+        "INSERT INTO categories (name, description) VALUES (?, '')",
+        [(f"category {i}",) for i in range(categories)],
+    )
+    conn.exec_driver_sql(
+        'INSERT INTO "Products" (name, description, price, quantity, '
+        "category_id) VALUES ('product', '', ?, ?, ?)",
+        [
+            (1 + i % 97 / 4, i % 13, 1 + i % categories)
+            for i in range(products)
+        ],
+    )
+    session.commit()
+
+
+def in_python(prices: List[float], quantities: List[int]) -> Dict[str, Any]:
+    return {
+        "product_count": len(prices),
+        "total_quantity": sum(quantities),
+        "stock_value": sum(p * q for p, q in zip(prices, quantities)),
+        "min_price": min(prices, default=None),
+        "max_price": max(prices, default=None),
+        "avg_price": statistics.fmean(prices) if prices else None,
+    }
+
+
+def loaded_page(session: Session, after: int, limit: int) -> list:
+    """What GET /categories/ loaded before: the categories and, joined,
+    every one of their products."""
+    return (
+        session.query(models.Category)
+        .options(joinedload(models.Category.products))
+        .filter(models.Category.id > after)
+        .order_by(models.Category.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def stats_in_python(session: Session, after: int, limit: int) -> list:
+    stats = []
+    for category in loaded_page(session, after, limit):
+        products = category.products
+        stats.append(
+            in_python(
+                [product.price for product in products],
+                [product.quantity for product in products],
+            )
+        )
+    session.expunge_all()
+    return stats
+
+
+def all_pages(page: Callable[[int, int], list]) -> int:
+    """Walk ``page(after, limit)`` over every category; the row count."""
+    after, rows = 0, 0
+    while True:
+        items = page(after, MAX_PAGE_SIZE)
+        rows += len(items)
+        if len(items) < MAX_PAGE_SIZE:
+            return rows
+        after += MAX_PAGE_SIZE
+
+
+def timed(operation: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        operation()
+    return (time.perf_counter() - start) / repeat
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--categories", type=int, default=10_000)
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_sqlite_engine(
+            f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        )
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            fill(session, args.categories, args.products)
+            categories = crud.CategoryCRUD(session)
+            products = crud.ProductCRUD(session)
+
+            def sql_stats(after: int, limit: int) -> list:
+                # The endpoint fetches limit + 1 to find the next page.
+                return categories.get_category_stats(after, limit - 1)
+
+            def list_before() -> None:
+                loaded_page(session, 0, args.limit)
+                session.expunge_all()
+
+            def list_after() -> None:
+                categories.get_categories(0, args.limit)
+                session.expunge_all()
+
+            def summary_in_python() -> Dict[str, Any]:
+                rows = session.execute(
+                    select(models.Product.price, models.Product.quantity)
+                )
+                prices, quantities = zip(*rows)
+                return in_python(list(prices), list(quantities))
+
+            page = args.limit
+            lines = [
+                (f"list page ({page})", list_before, list_after, args.repeat),
+                (
+                    f"stats page ({page})",
+                    lambda: stats_in_python(session, 0, page),
+                    lambda: sql_stats(0, page),
+                    args.repeat,
+                ),
+                (
+                    "all stats",
+                    lambda: all_pages(
+                        lambda after, limit: stats_in_python(
+                            session, after, limit
+                        )
+                    ),
+                    lambda: all_pages(sql_stats),
+                    1,
+                ),
+                (
+                    "inventory summary",
+                    summary_in_python,
+                    products.get_inventory_summary,
+                    1,
+                ),
+            ]
+
+            expected = stats_in_python(session, 0, page)
+            answered = [dict(row._mapping) for row in sql_stats(0, page)]
+            for row in answered:
+                del row["id"], row["name"]
+            assert len(answered) == len(expected) == page
+            for row, stats in zip(answered, expected):
+                assert all(
+                    math.isclose(row[key], value)
+                    for key, value in stats.items()
+                ), (row, stats)
+            summary = products.get_inventory_summary()._mapping
+            total = summary_in_python()
+            assert all(math.isclose(summary[k], v) for k, v in total.items())
+
+            print(
+                f"{'':>20} | {'python ms':>10} | {'sql ms':>10} | "
+                f"{'speedup':>7}"
+            )
+            for name, before, after, repeat in lines:
+                old = timed(before, repeat)
+                new = timed(after, repeat)
+                print(
+                    f"{name:>20} | {old * 1e3:>10.1f} | {new * 1e3:>10.1f}"
+                    f" | {old / new:>6.1f}x"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main_cli()
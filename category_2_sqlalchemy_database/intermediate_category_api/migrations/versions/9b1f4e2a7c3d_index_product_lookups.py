@@ -0,0 +1,38 @@
+"""index product lookups
+
+Revision ID: 9b1f4e2a7c3d
+Revises: 4cc24d83547c
+Create Date: 2026-10-18 18:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1f4e2a7c3d'
+down_revision: Union[str, Sequence[str], None] = '4cc24d83547c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # if_not_exists: the app's create_all() already builds the index for
+    # a database it creates from scratch.
+    op.create_index(
+        op.f('ix_Products_category_id'),
+        'Products',
+        ['category_id'],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f('ix_Products_category_id'), table_name='Products', if_exists=True
+    )
@@ -0,0 +1,10 @@
+import pytest
+
+from app import crud
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    """Every test has its own database, so rows an earlier test cached
+    under the same ids must go."""
+    crud.clear_caches()
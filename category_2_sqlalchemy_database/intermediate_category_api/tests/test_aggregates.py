@@ -0,0 +1,99 @@
+"""/categories/stats and /inventory/summary aggregate in SQL and agree with
+the same numbers worked out in Python."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base
+from app.deps import get_db
+from app.pagination import encode_cursor
+from app.routers import categories, inventory
+
+# (price, quantity) of the products of each category; the last one has
+# none.
+STOCK = [
+    [(1.5, 4), (2.5, 0), (10.0, 1)],
+    [(3.0, 7)],
+    [],
+]
+
+
+@pytest.fixture
+def client(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    sessions = sessionmaker(bind=engine)
+    with sessions() as db:
+        for i, products in enumerate(STOCK):
+            category = models.Category(name=f"category {i}", description="")
+            category.products = [
+                models.Product(
+                    name="product",
+                    description="",
+                    price=price,
+                    quantity=quantity,
+                )
+                for price, quantity in products
+            ]
+            db.add(category)
+        db.commit()
+
+    def get_test_db():
+        with sessions() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(categories.router)
+    app.include_router(inventory.router)
+    app.dependency_overrides[get_db] = get_test_db
+    with TestClient(app) as client:
+        yield client
+    engine.dispose()
+
+
+def expected(products):
+    prices = [price for price, _ in products]
+    return {
+        "product_count": len(products),
+        "total_quantity": sum(quantity for _, quantity in products),
+        "stock_value": sum(price * quantity for price, quantity in products),
+        "min_price": min(prices, default=None),
+        "max_price": max(prices, default=None),
+        "avg_price": sum(prices) / len(prices) if prices else None,
+    }
+
+
+def test_category_stats_pages(client):
+    first = client.get("/categories/stats", params={"limit": 2}).json()
+    cursor = first["next_cursor"]
+    second = client.get(
+        "/categories/stats", params={"limit": 2, "cursor": cursor}
+    ).json()
+
+    items = first["items"] + second["items"]
+    assert second["next_cursor"] is None
+    assert [item["name"] for item in items] == [
+        "category 0",
+        "category 1",
+        "category 2",
+    ]
+    for item, products in zip(items, STOCK):
+        del item["id"], item["name"]
+        assert item == pytest.approx(expected(products))
+
+
+def test_category_stats_rejects_product_cursors(client):
+    response = client.get(
+        "/categories/stats", params={"cursor": encode_cursor(1, "product")}
+    )
+    assert response.status_code == 400
+
+
+def test_inventory_summary(client):
+    summary = client.get("/inventory/summary").json()
+    everything = [product for products in STOCK for product in products]
+    assert summary == pytest.approx(expected(everything))
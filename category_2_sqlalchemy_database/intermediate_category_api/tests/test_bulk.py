@@ -0,0 +1,150 @@
+"""Product bulk endpoints write each batch with one statement, in one
+transaction, and report every row."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base
+from app.deps import get_db
+from app.routers import products
+
+
+@pytest.fixture
+def api(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    sessions = sessionmaker(bind=engine)
+    with sessions() as db:
+        db.add(models.Category(name="category", description=""))
+        db.commit()
+
+    def get_test_db():
+        with sessions() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(products.router)
+    app.dependency_overrides[get_db] = get_test_db
+    sent = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: sent.append(statement),
+    )
+    with TestClient(app) as client:
+        yield client, sent
+    engine.dispose()
+
+
+def product(i):
+    return dict(
+        name=f"product {i}",
+        description="",
+        price=1.5,
+        quantity=i,
+        category_id=1,
+    )
+
+
+def writes(statements, verb):
+    return [s for s in statements if s.lstrip().startswith(verb)]
+
+
+def listed(client):
+    return client.get("/products/").json()["items"]
+
+
+def test_create_runs_one_insert_per_batch(api):
+    client, sent = api
+    rows = [product(i) for i in range(5)]
+    response = client.post(
+        "/products/bulk", params={"batch_size": 2}, json=rows
+    )
+
+    assert response.status_code == 201
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (5, 0)
+    assert len(writes(sent, "INSERT")) == 3
+    names = {p["id"]: p["name"] for p in listed(client)}
+    assert [names[r["id"]] for r in body["results"]] == [
+        r["name"] for r in rows
+    ]
+    assert [r["row"] for r in body["results"]] == list(range(5))
+
+
+def test_invalid_row_writes_nothing(api):
+    client, sent = api
+    response = client.post(
+        "/products/bulk", json=[product(0), {"name": "no price"}]
+    )
+
+    assert response.status_code == 422
+    assert writes(sent, "INSERT") == []
+    assert listed(client) == []
+
+
+def test_update_in_small_batches_reports_missing_ids(api):
+    client, sent = api
+    client.post("/products/bulk", json=[product(i) for i in range(3)])
+    sent.clear()
+    response = client.patch(
+        "/products/bulk",
+        params={"batch_size": 2},
+        json=[
+            {"id": 1, "price": 9.0},
+            {"id": 9, "price": 9.0},
+            {"id": 3, "quantity": 30},
+            {"id": 2},
+        ],
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (3, 1)
+    assert [r["status"] for r in body["results"]] == [
+        "updated",
+        "not_found",
+        "updated",
+        "updated",
+    ]
+    # One UPDATE for each batch with something to set: id 2 sends no
+    # columns, so the second batch only updates id 3.
+    assert len(writes(sent, "UPDATE")) == 2
+    assert [(p["id"], p["price"], p["quantity"]) for p in listed(client)] == [
+        (1, 9.0, 0),
+        (2, 1.5, 1),
+        (3, 1.5, 30),
+    ]
+
+
+def test_delete_in_small_batches_reports_missing_ids(api):
+    client, sent = api
+    client.post("/products/bulk", json=[product(i) for i in range(3)])
+    sent.clear()
+    response = client.delete(
+        "/products/bulk", params={"ids": "1,9,3", "batch_size": 2}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    assert [(r["id"], r["status"]) for r in body["results"]] == [
+        (1, "deleted"),
+        (9, "not_found"),
+        (3, "deleted"),
+    ]
+    assert len(writes(sent, "DELETE")) == 2
+    assert [p["id"] for p in listed(client)] == [2]
+
+
+@pytest.mark.parametrize("batch_size", [0, 1001])
+def test_batch_size_is_bounded(api, batch_size):
+    client, _ = api
+    response = client.delete(
+        "/products/bulk", params={"ids": "1", "batch_size": batch_size}
+    )
+    assert response.status_code == 422
@@ -0,0 +1,171 @@
+"""Repeated GET /{id} is served from the entity caches, every write drops
+the rows it changed, and ENTITY_CACHE=off reads from the database."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import crud, schemas
+from app.database import Base
+from app.deps import get_db
+from app.routers import categories, products
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+cached = pytest.mark.skipif(
+    crud.PRODUCT_CACHE is None, reason="ENTITY_CACHE=off"
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def selects(engine):
+    """Every SELECT sent to ``engine``."""
+    sent = []
+
+    def record(conn, cursor, statement, *args):
+        if statement.lstrip().startswith("SELECT"):
+            sent.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield sent
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def client(engine):
+    sessions = sessionmaker(bind=engine)
+
+    def get_test_db():
+        with sessions() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(categories.router)
+    app.include_router(products.router)
+    app.dependency_overrides[get_db] = get_test_db
+    with TestClient(app) as client:
+        yield client
+
+
+def product(i, category_id=1):
+    return dict(
+        name=f"product {i}",
+        description="",
+        price=1.5,
+        quantity=i,
+        category_id=category_id,
+    )
+
+
+@cached
+@pytest.mark.parametrize("returning", [False, True])
+def test_deleting_a_category_drops_its_products(engine, selects, returning):
+    with Session(engine) as db:
+        categories = crud.CategoryCRUD(db, returning=returning)
+        products = crud.ProductCRUD(db, returning=returning)
+        for name in ("kept", "deleted"):
+            new = schemas.CategoryCreate(name=name, description="")
+            categories.create_category(new)
+        for i, category_id in enumerate((1, 2, 2)):
+            new = schemas.ProductCreate(**product(i, category_id))
+            products.create_product(new)
+        for id in (1, 2, 3):
+            products.get_product(id)
+        categories.get_category(2)
+        selects.clear()
+        assert products.get_product(2).name == "product 1"
+        assert selects == []
+
+        assert categories.delete_category(2) is not None
+        db.expire_all()
+        selects.clear()
+        assert categories.get_category(2) is None
+        assert products.get_product(2) is None
+        assert products.get_product(3) is None
+        # Only the deleted rows are read again.
+        assert len(selects) == 3
+        assert products.get_product(1).name == "product 0"
+        assert len(selects) == 3
+
+
+@cached
+def test_bulk_writes_drop_the_rows_they_change(client, selects):
+    client.post("/categories/", json={"name": "category", "description": ""})
+    client.post("/products/bulk", json=[product(i) for i in range(3)])
+    for id in (1, 2, 3):
+        client.get(f"/products/{id}")
+    selects.clear()
+    assert client.get("/products/2").json()["price"] == 1.5
+    assert selects == []
+
+    client.patch(
+        "/products/bulk",
+        json=[{"id": 2, "price": 9.0}, {"id": 9, "price": 9.0}],
+    )
+    assert client.get("/products/2").json()["price"] == 9.0
+    client.delete("/products/bulk", params={"ids": "1,9"})
+    assert client.get("/products/1").status_code == 404
+    selects.clear()
+    assert client.get("/products/3").json()["price"] == 1.5
+    assert selects == []
+
+
+def test_cache_can_be_turned_off(engine, selects):
+    with Session(engine) as db:
+        categories = crud.CategoryCRUD(db, cache=None)
+        products = crud.ProductCRUD(db, cache=None)
+        categories.create_category(
+            schemas.CategoryCreate(name="category", description="")
+        )
+        products.create_product(schemas.ProductCreate(**product(0)))
+        selects.clear()
+        categories.get_category(1)
+        products.get_product(1)
+        products.get_product(1)
+    assert len(selects) == 3
+
+
+def test_environment_turns_the_caches_off(tmp_path):
+    # The caches are created on import, so read ENTITY_CACHE in a fresh
+    # interpreter; app.main creates its database in the working directory.
+    script = (
+        "import json\n"
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import app\n"
+        "client = TestClient(app)\n"
+        "client.post('/categories/', json={'name': 'c', 'description': ''})\n"
+        "client.post('/products/', json=%r)\n"
+        "client.get('/products/1')\n"
+        "client.patch('/products/bulk', json=[{'id': 1, 'price': 9.0}])\n"
+        "print(json.dumps([\n"
+        "    client.get('/products/1').json()['price'],\n"
+        "    client.get('/cache').json(),\n"
+        "]))\n"
+    ) % product(0)
+    env = dict(os.environ, ENTITY_CACHE="off", PYTHONPATH=APP_DIR)
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", script],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert json.loads(output) == [
+        9.0,
+        {"categories": None, "products": None},
+    ]
@@ -0,0 +1,90 @@
+"""?fields= on the category and product lists reads and returns only the
+columns asked for."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base
+from app.deps import get_db
+from app.routers import categories, products
+
+
+@pytest.fixture
+def api(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    sessions = sessionmaker(bind=engine)
+    with sessions() as db:
+        category = models.Category(name="category", description="long")
+        category.products = [
+            models.Product(
+                name=f"product {i}", description="long", price=1, quantity=i
+            )
+            for i in range(3)
+        ]
+        db.add(category)
+        db.commit()
+
+    def get_test_db():
+        with sessions() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(categories.router)
+    app.include_router(products.router)
+    app.dependency_overrides[get_db] = get_test_db
+    sent = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: sent.append(statement),
+    )
+    with TestClient(app) as client:
+        yield client, sent
+    engine.dispose()
+
+
+def test_product_fields_page_by_cursor(api):
+    client, sent = api
+    params = {"fields": "name,quantity", "limit": 2}
+    first = client.get("/products/", params=params).json()
+    params["cursor"] = first["next_cursor"]
+    second = client.get("/products/", params=params).json()
+
+    items = first["items"] + second["items"]
+    assert items == [{"name": f"product {i}", "quantity": i} for i in range(3)]
+    assert second["next_cursor"] is None
+    assert all("description" not in s.split("FROM")[0] for s in sent)
+
+
+def test_category_fields(api):
+    client, sent = api
+    response = client.get("/categories/", params={"fields": "id"})
+    assert response.json() == [{"id": 1}]
+    assert "description" not in sent[-1]
+
+
+def test_full_lists_are_unchanged(api):
+    client, _ = api
+    [product] = client.get("/products/", params={"limit": 1}).json()["items"]
+    [category] = client.get("/categories/").json()
+    assert set(product) == {
+        "id",
+        "name",
+        "description",
+        "price",
+        "quantity",
+        "category_id",
+    }
+    assert set(category) == {"id", "name", "description"}
+
+
+def test_unknown_field(api):
+    client, _ = api
+    response = client.get("/products/", params={"fields": "name,cost"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: cost"
@@ -0,0 +1,151 @@
+"""Every statement the CRUD classes send must find its rows through an
+index: ``EXPLAIN QUERY PLAN`` may not show a full scan of any table."""
+
+import re
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.cache import EntityCache
+from app.database import Base
+
+TABLES = set(Base.metadata.tables)
+
+
+@contextmanager
+def capture(engine):
+    """(statement, parameters) of every statement sent to ``engine``; the
+    first row of an executemany stands for the rest."""
+    sent = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        sent.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield sent
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def table_of(name):
+    """The table behind a plan's SCAN target: ``categories_1`` is an alias
+    of ``categories``; subqueries (``anon_1``) are not tables."""
+    for candidate in (name, re.sub(r"_\d+$", "", name)):
+        if candidate in TABLES:
+            return candidate
+    return None
+
+
+def full_scans(engine, sent):
+    """Statements in ``sent`` whose plan reads a whole table.
+
+    A page's query may scan in index order when LIMIT stops it early and
+    nothing has to be sorted first: it reads one page of rows, not the
+    table.
+    """
+    found = []
+    with engine.connect() as conn:
+        for statement, parameters in sent:
+            if statement.split()[0] not in ("SELECT", "UPDATE", "DELETE"):
+                continue
+            plan = [
+                row.detail
+                for row in conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+            ]
+            bounded = " LIMIT " in statement and not any(
+                "TEMP B-TREE" in detail for detail in plan
+            )
+            for detail in plan:
+                # An AUTOMATIC index is built by scanning the table, for
+                # this one statement.
+                match = re.match(
+                    r"SCAN (\w+)|SEARCH (\w+) USING AUTOMATIC", detail
+                )
+                if match is None or table_of(match[1] or match[2]) is None:
+                    continue
+                if bounded and match[1]:
+                    # Only the loop the LIMIT applies to: the outermost.
+                    bounded = False
+                    continue
+                found.append((detail, statement))
+    return found
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def new_product(category_id):
+    return schemas.ProductCreate(
+        name="product",
+        description="",
+        price=1.5,
+        quantity=3,
+        category_id=category_id,
+    )
+
+
+def exercise(db, returning):
+    categories = crud.CategoryCRUD(
+        db, returning=returning, cache=EntityCache()
+    )
+    products = crud.ProductCRUD(db, returning=returning, cache=EntityCache())
+    category = categories.create_category(
+        schemas.CategoryCreate(name="category", description="")
+    )
+    product = products.create_product(new_product(category.id))
+    bulk = products.create_products([new_product(category.id)] * 3, 2)
+
+    categories.get_categories(0, 10)
+    categories.get_categories(1, 10)
+    categories.get_categories(0, 10, frozenset({"name"}))
+    categories.get_category_stats(0, 10)
+    categories.get_category_stats(category.id, 10)
+    categories.get_category(category.id)
+    categories.load_category(category.id)
+    products.get_products(0, 2)
+    products.get_products(product.id, 2)
+    products.get_products(product.id, 2, frozenset({"name"}))
+    products.get_product(product.id)
+    products.load_product(product.id)
+    # get_inventory_summary() is left out: it aggregates every product,
+    # so it reads the whole table by design.
+
+    categories.update_category(
+        category.id, schemas.CategoryUpdate(name="renamed")
+    )
+    products.update_product(product.id, schemas.ProductUpdate(price=2.5))
+    changes = [
+        schemas.ProductBulkUpdate(id=result.id, quantity=0) for result in bulk
+    ]
+    products.update_products(changes, 2)
+    products.delete_products([bulk[0].id, 999], 2)
+    products.delete_product(product.id)
+    categories.delete_category(category.id)
+
+
+@pytest.mark.parametrize("returning", [False, True])
+def test_crud_uses_indexes(engine, returning):
+    with Session(engine) as db, capture(engine) as sent:
+        exercise(db, returning)
+    assert len(sent) > 15
+    assert full_scans(engine, sent) == []
+
+
+def test_unindexed_lookups_are_caught(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql('DROP INDEX "ix_Products_category_id"')
+    with Session(engine) as db, capture(engine) as sent:
+        crud.CategoryCRUD(db, returning=True).delete_category(1)
+    [(detail, _)] = full_scans(engine, sent)
+    assert detail.startswith("SCAN Products")
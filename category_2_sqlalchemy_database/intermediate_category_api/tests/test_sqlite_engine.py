@@ -0,0 +1,41 @@
+"""Every engine profile's PRAGMAs are in force on the connections its
+engine hands out."""
+
+import pytest
+from sqlalchemy import text
+
+from app.sqlite_engine import PROFILES, create_sqlite_engine, get_profile
+
+# What PRAGMA reads back for the values the profiles set.
+READ_BACK = {"WAL": "wal", "NORMAL": 1, "FULL": 2, "MEMORY": 2}
+
+
+def pragmas(connection, names):
+    return {
+        name: connection.execute(text(f"PRAGMA {name}")).scalar()
+        for name in names
+    }
+
+
+@pytest.mark.parametrize("name", sorted(PROFILES))
+def test_profile_pragmas_are_applied(tmp_path, name):
+    settings = PROFILES[name]
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'test.db'}", name)
+    with engine.connect() as connection:
+        applied = pragmas(connection, settings.pragmas)
+    engine.dispose()
+
+    assert applied == {
+        key: READ_BACK.get(value, value)
+        for key, value in settings.pragmas.items()
+    }
+    assert applied["journal_mode"] == "wal"
+    assert applied["busy_timeout"] >= 5_000
+
+
+def test_profile_from_environment(monkeypatch):
+    monkeypatch.setenv("DB_PROFILE", "durable")
+    assert get_profile() is PROFILES["durable"]
+    monkeypatch.setenv("DB_PROFILE", "fast")
+    with pytest.raises(ValueError, match="Unknown DB_PROFILE 'fast'"):
+        get_profile()
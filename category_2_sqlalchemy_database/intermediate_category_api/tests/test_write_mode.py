@@ -0,0 +1,81 @@
+"""The "returning" write mode sends one statement per category or product
+write, and answers like the "orm" mode."""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.database import Base
+
+CATEGORY = schemas.CategoryCreate(name="category", description="")
+PRODUCT = dict(name="product", description="", price=1.5, quantity=3)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def verbs(engine):
+    """First word of every statement sent to ``engine``."""
+    sent = []
+
+    def record(conn, cursor, statement, *args):
+        sent.append(statement.split()[0])
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield sent
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_returning_writes_are_single_statements(engine, verbs):
+    with Session(engine) as db:
+        categories = crud.CategoryCRUD(db, returning=True)
+        products = crud.ProductCRUD(db, returning=True)
+        category = categories.create_category(CATEGORY)
+        new = schemas.ProductCreate(category_id=category.id, **PRODUCT)
+        product = products.create_product(new)
+        change = schemas.ProductUpdate(price=2.5)
+        updated = products.update_product(product.id, change)
+        assert products.delete_product(product.id).id == product.id
+        assert products.delete_product(product.id) is None
+        assert products.update_product(product.id, change) is None
+        assert categories.delete_category(category.id) is not None
+
+    # Deleting the category deletes its products first, as the ORM's
+    # cascade would.
+    assert verbs == [
+        "INSERT",
+        "INSERT",
+        "UPDATE",
+        "DELETE",
+        "DELETE",
+        "UPDATE",
+        "DELETE",
+        "DELETE",
+    ]
+    assert updated.price == 2.5
+
+
+def test_modes_answer_alike(engine):
+    answers = []
+    for returning in (False, True):
+        with Session(engine) as db:
+            categories = crud.CategoryCRUD(db, returning=returning)
+            products = crud.ProductCRUD(db, returning=returning)
+            category = categories.create_category(CATEGORY)
+            new = schemas.ProductCreate(category_id=category.id, **PRODUCT)
+            product = products.create_product(new)
+            answers.append(
+                schemas.ProductResponse.model_validate(
+                    product, from_attributes=True
+                ).model_dump(exclude={"id", "category_id"})
+            )
+            categories.delete_category(category.id)
+            assert products.get_product(product.id) is None
+    assert answers[0] == answers[1]
@@ -1,5 +1,9 @@
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.orm import Session, joinedload
+from typing import Iterable, List
 from simple_product_api import models, schemas
+from simple_product_api.bulk import batches
+from simple_product_api.fields import Fields, columns
 
 
 def create_category(db: Session, category: schemas.CategoryCreate):
@@ -10,7 +14,13 @@ def create_category(db: Session, category: schemas.CategoryCreate):
     return db_category
 
 
-def get_categories(db: Session, skip: int = 0, limit: int = 10):
+def get_categories(
+    db: Session, skip: int = 0, limit: int = 10, fields: Fields = frozenset()
+):
+    """ORM objects, or with ``fields``, plain rows of just those columns."""
+    if fields:
+        statement = select(*columns(models.Category, fields))
+        return db.execute(statement.offset(skip).limit(limit)).all()
     return db.query(models.Category).offset(skip).limit(limit).all()
 
 
@@ -52,8 +62,28 @@ def create_product(db: Session, product: schemas.ProductCreate):
     return db_product
 
 
-def get_products(db: Session, skip: int = 0, limit: int = 10):
-    return db.query(models.Product).offset(skip).limit(limit).all()
+def get_products(
+    db: Session, after: int = 0, limit: int = 10, fields: Fields = frozenset()
+):
+    """ORM objects, or with ``fields``, plain rows of just those columns
+    and the id the cursor needs."""
+    # Seek past the previous page on the primary key instead of OFFSET,
+    # which would read and discard every earlier row. One extra row tells
+    # whether another page follows.
+    if fields:
+        statement = select(*columns(models.Product, fields, "id"))
+        return db.execute(
+            statement.where(models.Product.id > after)
+            .order_by(models.Product.id)
+            .limit(limit + 1)
+        ).all()
+    return (
+        db.query(models.Product)
+        .filter(models.Product.id > after)
+        .order_by(models.Product.id)
+        .limit(limit + 1)
+        .all()
+    )
 
 
 def get_product(db: Session, product_id: int):
@@ -85,3 +115,88 @@ def delete_product(db: Session, product_id: int):
     db.delete(db_product)
     db.commit()
     return db_product
+
+
+def bulk_results(
+    ids: Iterable[int], found: Iterable[bool], done: schemas.BulkStatus
+) -> List[schemas.BulkRowResult]:
+    return [
+        schemas.BulkRowResult(
+            row=row,
+            id=row_id,
+            status=done if ok else schemas.BulkStatus.not_found,
+        )
+        for row, (row_id, ok) in enumerate(zip(ids, found))
+    ]
+
+
+def create_products(
+    db: Session, products: List[schemas.ProductCreate], batch_size: int
+):
+    """Insert ``products`` with one INSERT per batch, all in one
+    transaction."""
+    # SQLite numbers the rows of one INSERT in ascending order, so sorting
+    # the returned ids lines them up with the batch. Asking SQLAlchemy to
+    # do it (sort_by_parameter_order) costs one INSERT per row here.
+    statement = insert(models.Product).returning(models.Product.id)
+    ids: List[int] = []
+    for batch in batches(products, batch_size):
+        rows = [product.model_dump() for product in batch]
+        ids.extend(sorted(db.scalars(statement, rows)))
+    db.commit()
+    return bulk_results(ids, [True] * len(ids), schemas.BulkStatus.created)
+
+
+def update_products(
+    db: Session, products: List[schemas.ProductBulkUpdate], batch_size: int
+):
+    """Update ``products`` by id with one executemany UPDATE per batch
+    (per set of changed columns), all in one transaction."""
+    found: List[bool] = []
+    for batch in batches(products, batch_size):
+        # The ORM's bulk UPDATE by primary key raises on a missing row, so
+        # find out first which ids exist.
+        existing = set(
+            db.scalars(
+                select(models.Product.id).where(
+                    models.Product.id.in_([p.id for p in batch])
+                )
+            )
+        )
+        rows = [
+            product.model_dump(exclude_unset=True)
+            for product in batch
+            if product.id in existing
+        ]
+        # A row with only its id has nothing to set.
+        rows = [row for row in rows if len(row) > 1]
+        if rows:
+            db.execute(update(models.Product), rows)
+        found.extend(product.id in existing for product in batch)
+    db.commit()
+    return bulk_results(
+        [product.id for product in products],
+        found,
+        schemas.BulkStatus.updated,
+    )
+
+
+def delete_products(db: Session, product_ids: List[int], batch_size: int):
+    """Delete ``product_ids`` with one ``DELETE ... WHERE id IN`` per
+    batch, all in one transaction."""
+    deleted = set()
+    for batch in batches(product_ids, batch_size):
+        deleted.update(
+            db.scalars(
+                delete(models.Product)
+                .where(models.Product.id.in_(batch))
+                .returning(models.Product.id)
+                .execution_options(synchronize_session=False)
+            )
+        )
+    db.commit()
+    return bulk_results(
+        product_ids,
+        [product_id in deleted for product_id in product_ids],
+        schemas.BulkStatus.deleted,
+    )
@@ -0,0 +1,96 @@
+from functools import lru_cache
+from typing import Annotated, Any, Callable, FrozenSet, List, Optional, Type
+
+from fastapi import HTTPException, Query, Response, status
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+# Field names a list route returns; empty for all of them.
+Fields = FrozenSet[str]
+
+
+def fields_param(*allowed: str) -> Callable[..., Fields]:
+    """Build a dependency parsing ``?fields=a,b`` into a set of names from
+    ``allowed``, rejecting any other name with 400."""
+
+    def dependency(
+        fields: Annotated[
+            Optional[str],
+            Query(
+                description="Comma-separated fields to return, all if "
+                "omitted: " + ", ".join(allowed)
+            ),
+        ] = None,
+    ) -> Fields:
+        if not fields:
+            return frozenset()
+        names = frozenset(
+            name.strip() for name in fields.split(",") if name.strip()
+        )
+        unknown = names.difference(allowed)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+        return names
+
+    return dependency
+
+
+@lru_cache
+def projection(model: Type[BaseModel], fields: Fields) -> Type[BaseModel]:
+    """``model`` cut down to ``fields``, or ``model`` itself when
+    ``fields`` is empty."""
+    if not fields:
+        return model
+    kept = {
+        name: (info.annotation, info)
+        for name, info in model.model_fields.items()
+        if name in fields
+    }
+    return create_model(
+        f"{model.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **kept,
+    )
+
+
+@lru_cache
+def page_of(item: Type[BaseModel]) -> Type[BaseModel]:
+    """The ``{"items": [...], "next_cursor": ...}`` page of ``item``."""
+    return create_model(
+        f"{item.__name__}Page",
+        items=(List[item], ...),
+        next_cursor=(Optional[str], None),
+    )
+
+
+def columns(model: Any, fields: Fields, *required: str) -> List[Any]:
+    """The mapped attributes of ``model`` named in ``fields`` or
+    ``required`` (what the query itself needs: the id, the sort key), in
+    table order."""
+    names = fields.union(required)
+    return [
+        getattr(model, column.key)
+        for column in model.__table__.columns
+        if column.key in names
+    ]
+
+
+@lru_cache
+def adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def json_response(schema: Any, value: Any) -> Response:
+    """``value`` (ORM objects or rows) validated and serialized as
+    ``schema``, a type built for the requested fields.
+
+    Returned as a ready Response: FastAPI would otherwise validate it
+    again against the route's ``response_model``, which documents every
+    field and would reject a projection.
+    """
+    checked = adapter(schema).validate_python(value, from_attributes=True)
+    return Response(
+        adapter(schema).dump_json(checked), media_type="application/json"
+    )
@@ -0,0 +1,56 @@
+import base64
+from typing import Annotated, Any, List, Optional
+
+from fastapi import HTTPException, Query, status
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 1000
+
+PageSize = Annotated[
+    int,
+    Query(
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description=f"Products per page (at most {MAX_PAGE_SIZE})",
+    ),
+]
+
+
+def encode_cursor(product_id: int) -> str:
+    raw = f"product:{product_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    # binascii.Error and UnicodeDecodeError are both ValueErrors.
+    raw = base64.urlsafe_b64decode(padded.encode()).decode()
+    prefix, _, value = raw.partition(":")
+    if prefix != "product" or not value.isdigit():
+        raise ValueError("Invalid cursor")
+    return int(value)
+
+
+def cursor_param(
+    cursor: Annotated[
+        Optional[str],
+        Query(description="Opaque next_cursor from the previous page"),
+    ] = None,
+) -> int:
+    """Dependency turning the ``cursor`` query param into a product id."""
+    if cursor is None:
+        return 0
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def to_page(rows: List[Any], limit: int) -> dict:
+    """Page of the first ``limit`` of ``rows``, which were fetched with one
+    extra row to tell whether another page follows."""
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1].id) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
@@ -1,10 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Annotated, List
 from simple_product_api import schemas, crud, database
-
+from simple_product_api.fields import (
+    Fields,
+    fields_param,
+    json_response,
+    projection,
+)
 
 router = APIRouter(prefix="/cetegories", tags=["Categories"])
+category_fields = fields_param(*schemas.Category.model_fields)
 
 
 def get_db():
@@ -24,9 +30,14 @@ def create_category(
 
 @router.get("/", response_model=List[schemas.Category])
 def read_categories(
-    skip: int = 0, limit: int = 10, db: Session = Depends(get_db)
+    fields: Annotated[Fields, Depends(category_fields)],
+    skip: int = 0,
+    limit: int = 10,
+    db: Session = Depends(get_db),
 ):
-    return crud.get_categories(db, skip, limit)
+    categories = crud.get_categories(db, skip, limit, fields)
+    item = projection(schemas.Category, fields)
+    return json_response(List[item], categories)
 
 
 @router.get("/{category_id}", response_model=schemas.Category)
@@ -1,9 +1,32 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
-from simple_product_api import schemas, crud, database
+from typing import Annotated, List
+from simple_product_api import schemas, crud, database, models
+from simple_product_api.bulk import DEFAULT_BATCH_SIZE, BatchSize, ids_param
+from simple_product_api.fields import (
+    Fields,
+    fields_param,
+    json_response,
+    page_of,
+    projection,
+)
+from simple_product_api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    PageSize,
+    cursor_param,
+    to_page,
+)
 
 router = APIRouter(prefix="/products", tags=["Products"])
+# Columns only: the nested category is not a column to select.
+product_fields = fields_param(
+    *(
+        name
+        for name in schemas.Product.model_fields
+        if name in models.Product.__table__.columns
+    )
+)
 
 
 def get_db():
@@ -21,11 +44,63 @@ def create_product(
     return crud.create_product(db, product)
 
 
-@router.get("/", response_model=List[schemas.Product])
+@router.get("/", response_model=schemas.ProductPage)
 def read_products(
-    skip: int = 0, limit: int = 10, db: Session = Depends(get_db)
+    after: Annotated[int, Depends(cursor_param)],
+    fields: Annotated[Fields, Depends(product_fields)],
+    limit: PageSize = DEFAULT_PAGE_SIZE,
+    db: Session = Depends(get_db),
+):
+    products = crud.get_products(db, after=after, limit=limit, fields=fields)
+    item = projection(schemas.Product, fields)
+    return json_response(page_of(item), to_page(products, limit))
+
+
+# Declared before /{product_id} so "bulk" is not read as a product id.
+@router.post(
+    "/bulk",
+    response_model=schemas.BulkResult,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_products(
+    products: List[schemas.ProductCreate],
+    batch_size: BatchSize = DEFAULT_BATCH_SIZE,
+    db: Session = Depends(get_db),
+):
+    try:
+        results = crud.create_products(db, products, batch_size)
+    except IntegrityError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch rolled back: {exc.orig}",
+        )
+    return schemas.BulkResult.from_rows(results)
+
+
+@router.patch("/bulk", response_model=schemas.BulkResult)
+def update_products(
+    products: List[schemas.ProductBulkUpdate],
+    batch_size: BatchSize = DEFAULT_BATCH_SIZE,
+    db: Session = Depends(get_db),
+):
+    try:
+        results = crud.update_products(db, products, batch_size)
+    except IntegrityError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch rolled back: {exc.orig}",
+        )
+    return schemas.BulkResult.from_rows(results)
+
+
+@router.delete("/bulk", response_model=schemas.BulkResult)
+def delete_products(
+    ids: Annotated[List[int], Depends(ids_param)],
+    batch_size: BatchSize = DEFAULT_BATCH_SIZE,
+    db: Session = Depends(get_db),
 ):
-    return crud.get_products(db, skip=skip, limit=limit)
+    results = crud.delete_products(db, ids, batch_size)
+    return schemas.BulkResult.from_rows(results)
 
 
 @router.get("/{product_id}", response_model=schemas.Product)
@@ -1,5 +1,6 @@
+from enum import Enum
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -51,3 +52,43 @@ class Product(ProductBase):
 
     class Config:
         orm_mode = True
+
+
+class ProductPage(BaseModel):
+    items: List[Product]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as ?cursor= to fetch the next page"
+    )
+
+
+# ---------------------------
+# Bulk writes
+# ---------------------------
+class ProductBulkUpdate(ProductUpdate):
+    id: int
+
+
+class BulkStatus(str, Enum):
+    created = "created"
+    updated = "updated"
+    deleted = "deleted"
+    not_found = "not_found"
+
+
+class BulkRowResult(BaseModel):
+    row: int = Field(..., description="Zero-based position in the batch")
+    id: int
+    status: BulkStatus
+
+
+class BulkResult(BaseModel):
+    succeeded: int = Field(..., description="Rows written")
+    failed: int = Field(..., description="Rows whose id was not found")
+    results: List[BulkRowResult]
+
+    @classmethod
+    def from_rows(cls, results: List[BulkRowResult]) -> "BulkResult":
+        failed = sum(r.status is BulkStatus.not_found for r in results)
+        return cls(
+            succeeded=len(results) - failed, failed=failed, results=results
+        )